@@ -1,4 +1,4 @@
-from .enums import ButtonType, Labelling, Validation
+from .enums import ButtonType, Labelling, Validation, Submit
 from .validators import RegExp
 from .sources import get_fields_source
 from .fields import *
@@ -0,0 +1,761 @@
+import abc
+from functools import partial
+from collections import OrderedDict
+
+from qtpy.QtCore import Qt, QObject, QTimer, Signal
+
+from .enums import Submit
+from .fields import SelectField, PagedSelectField
+
+__author__ = 'Juan Manuel Bermúdez Cabrera'
+
+
+def field_data(field):
+    """Obtains the value of a field the way it should be stored.
+
+    This is the field's value except for :class:`~campos.fields.SelectField`
+    instances, in which case the value of the selected option is returned
+    instead of the ``(text, value)`` tuple.
+
+    :param field: field to read the value from
+    :type field: :class:`~campos.core.Field`
+
+    :return: field's value ready to be stored
+    """
+    value = field.value
+    if isinstance(field, SelectField):
+        return value[1]
+    return value
+
+
+class _Mixed(object):
+    def __repr__(self):
+        return 'MIXED'
+
+    def __reduce__(self):
+        return 'MIXED'
+
+
+#: Stands for the value of an attribute which differs between objects, see
+#: :func:`common_values`.
+MIXED = _Mixed()
+
+
+def common_values(objects, names):
+    """Finds the values shared by several objects, reading them in a single
+    pass. Once two objects differ in an attribute, that attribute isn't read
+    from the remaining objects.
+
+    :param objects: objects to inspect
+    :type objects: iterable
+
+    :param names: names of the attributes to compare, those missing in some
+                  object are ignored
+    :type names: iterable of :class:`str`
+
+    :return: a dict like d[name] = value, where value is :data:`MIXED` if
+             objects have different values
+    :rtype: :class:`~collections.OrderedDict`
+    """
+    values = OrderedDict()
+    pending = list(names)
+    first = True
+
+    for obj in objects:
+        for name in tuple(pending):
+            try:
+                value = read_value(obj, name)
+            except AttributeError:
+                pending.remove(name)
+                values.pop(name, None)
+                continue
+
+            if first:
+                values[name] = value
+            elif value != values[name]:
+                values[name] = MIXED
+                pending.remove(name)
+        first = False
+    return values
+
+
+def set_field_data(field, value):
+    """Shows a stored value in a field, this is the inverse of
+    :func:`field_data`. Options of :class:`~campos.fields.SelectField`
+    instances are found by their value and ``None`` shows field's default.
+
+    :param field: field to show the value in
+    :type field: :class:`~campos.core.Field`
+
+    :param value: a value as it's stored
+
+    :raises ValueError: if a select field has no option with the value
+    """
+    if value is None:
+        field.value = field.default
+    elif isinstance(field, PagedSelectField):
+        field.value = value
+    elif isinstance(field, SelectField):
+        for text, option in field.choices:
+            if option == value:
+                field.value = text, option
+                return
+        raise ValueError('No choice with value {}'.format(value))
+    else:
+        field.value = value
+
+
+def changed_data(form):
+    """Obtains the values of the fields of an edition form that changed
+    since the object was loaded, ready to be stored. See
+    :func:`~campos.forms.EditionForm.changed`.
+
+    :param form: form to read values from
+    :type form: :class:`~campos.forms.EditionForm`
+
+    :return: a dict like d[field_name] = value
+    :rtype: :class:`~collections.OrderedDict`
+    """
+    return OrderedDict((f.name, field_data(f)) for f in form.changed())
+
+
+def store_changes(form, obj):
+    """Writes to an object only the values of the fields of an edition form
+    that changed since the object was loaded. If a list or tuple of objects
+    is given values are written to each one of them, useful when several
+    objects are edited at once.
+
+    Attributes are set one by one, so SQLAlchemy instances include only
+    those columns in the UPDATE emitted when they are flushed. Row bindings
+    are supported too. To update a row without loading an instance use
+    :func:`~campos.sources.sqlalchemy.update_row`, or
+    :func:`~campos.sources.sqlalchemy.update_rows` for several rows::
+
+        def save():
+            store_changes(form, user)
+            session.commit()
+
+    :param form: form to read values from
+    :type form: :class:`~campos.forms.EditionForm`
+
+    :param obj: object to write to, usually the one being edited
+
+    :return: the values written, a dict like d[field_name] = value
+    :rtype: :class:`~collections.OrderedDict`
+    """
+    changes = changed_data(form)
+    objects = obj if isinstance(obj, (list, tuple)) else (obj,)
+    for o in objects:
+        for name, value in changes.items():
+            if isinstance(o, RowBinding):
+                o.set(name, value)
+            else:
+                setattr(o, name, value)
+    return changes
+
+
+class RowBinding(metaclass=abc.ABCMeta):
+    """Base class for bindings exposing a row of a tabular data store as an
+    object.
+
+    Values of the current row are available as attributes, so a binding can
+    be passed to :func:`~campos.forms.EditionForm.edit` just like any other
+    object, values are read straight from the data store. Form values can be
+    written back in place using :func:`store`::
+
+        binding = RecordBinding(array, row=0)
+        form.edit(binding)
+
+        # later, in the save callback
+        binding.store(form)
+
+        # move to other row, no objects are created for it
+        binding.row = 1
+        form.edit(binding)
+
+    Subclasses must implement :func:`get`, :func:`set`, :func:`__len__` and
+    :func:`__contains__`.
+
+    :param row: index of the current row, defaults to 0
+    :type row: :class:`int`
+    """
+
+    def __init__(self, row=0):
+        self._row = None
+        self.row = row
+
+    @property
+    def row(self):
+        """Index of the current row.
+
+        :type: :class:`int`
+
+        :raises IndexError: if the index is out of range
+        """
+        return self._row
+
+    @row.setter
+    def row(self, value):
+        if not 0 <= value < len(self):
+            raise IndexError('Row {} out of range'.format(value))
+        self._row = value
+
+    @abc.abstractmethod
+    def __len__(self):
+        """Number of rows in the data store"""
+        pass
+
+    @abc.abstractmethod
+    def __contains__(self, name):
+        """Checks if the data store has a column with the given name"""
+        pass
+
+    @abc.abstractmethod
+    def get(self, name):
+        """Reads a value of the current row.
+
+        :param name: name of the column to read
+        :type name: :class:`str`
+
+        :return: column's value in the current row, as a python object
+
+        :raises KeyError: if there is no column with the given name
+        """
+        pass
+
+    @abc.abstractmethod
+    def set(self, name, value):
+        """Writes a value in the current row.
+
+        :param name: name of the column to write
+        :type name: :class:`str`
+
+        :param value: new value
+
+        :raises KeyError: if there is no column with the given name
+        """
+        pass
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            return self.get(name)
+        except KeyError:
+            raise AttributeError('No column named {}'.format(name))
+
+    def store(self, form, changed_only=False):
+        """Writes the values of form's fields in the current row, fields
+        without a matching column are ignored.
+
+        :param form: form to read values from
+        :type form: :class:`~campos.forms.Form`
+
+        :param changed_only: write only the values changed since the row was
+                             loaded, `form` must be an
+                             :class:`~campos.forms.EditionForm`. Defaults to
+                             False
+        :type changed_only: :class:`bool`
+        """
+        fields = form.changed() if changed_only else form.fields
+        for field in fields:
+            if field.name in self:
+                self.set(field.name, field_data(field))
+
+
+def read_value(obj, name):
+    """Reads an attribute of an object. Values of row bindings are read using
+    :func:`RowBinding.get`, so columns named like attributes of the binding
+    itself(``row`` or ``get`` for instance) are found too.
+
+    :param obj: an object or a :class:`RowBinding`
+
+    :param name: name of the attribute or column
+    :type name: :class:`str`
+
+    :raises AttributeError: if there is no such attribute or column
+    """
+    if isinstance(obj, RowBinding):
+        if name not in obj:
+            raise AttributeError('No column named {}'.format(name))
+        return obj.get(name)
+    return getattr(obj, name)
+
+
+class FieldMapper(QObject):
+    """Maps fields to the columns of a Qt item model, showing one row at a
+    time, like ``QDataWidgetMapper`` does for Qt widgets.
+
+    The model is the only place where values are kept, fields show the values
+    of the current row and changes are written back to the model, so a form
+    and a table view can share a model without copying data::
+
+        model = RecordModel(people, fields=grid_fields)
+        view.setModel(model)
+
+        mapper = FieldMapper(model, form)
+        view.selectionModel().currentRowChanged.connect(
+            lambda current, previous: mapper.seek(current.row()))
+
+    Fields are mapped to the column whose header text is their name or text
+    unless a column is given, see :func:`add_mapping`. Values are read and
+    written using ``Qt.EditRole``, with :func:`set_field_data` and
+    :func:`field_data`. When the model changes, fields of the current row are
+    updated.
+
+    With ``submit='auto'`` values are written as soon as a valid change is
+    done, with ``submit='manual'`` they are written by :func:`submit` and
+    discarded by :func:`revert`.
+
+    :param model: model holding the data
+    :type model: ``QAbstractItemModel``
+
+    :param fields: a form or the fields to map
+    :type fields: :class:`~campos.forms.Form` or iterable of
+                  :class:`~campos.core.Field`
+
+    :param submit: when values are written, see :class:`~campos.enums.Submit`
+    :type submit: :class:`str` or :class:`~campos.enums.Submit`
+
+    :param parent: parent object
+    :type parent: ``QObject``
+    """
+
+    #: Emitted with the index of the new current row.
+    moved = Signal(int)
+
+    def __init__(self, model, fields=(), submit='default', parent=None):
+        super(FieldMapper, self).__init__(parent)
+        self.model = model
+        self.submit_policy = Submit.get_member(submit)
+
+        self._columns = OrderedDict()  # field --> column
+        self._slots = {}  # field --> slot connected to its change signal
+        self._row = -1
+        self._loading = False
+        self._writing = None  # field whose value is being written
+
+        model.dataChanged.connect(self._data_changed)
+        model.modelReset.connect(self.revert)
+        model.rowsRemoved.connect(self._rows_removed)
+
+        for field in getattr(fields, 'fields', fields):
+            self.add_mapping(field)
+
+    @property
+    def row(self):
+        """Index of the current row, -1 if no row is shown.
+
+        :type: :class:`int`
+        """
+        return self._row
+
+    def add_mapping(self, field, column=None):
+        """Maps a field to a column, the field shows the column's value in the
+        current row.
+
+        :param field: field to map
+        :type field: :class:`~campos.core.Field`
+
+        :param column: index of the column, by default the column whose header
+                       is field's name or text
+        :type column: :class:`int`
+
+        :raises ValueError: if no column was found for the field
+        """
+        if column is None:
+            column = self._find_column(field)
+
+        self.remove_mapping(field)
+        self._columns[field] = column
+        self._slots[field] = partial(self._field_changed, field)
+        field.change_signal.connect(self._slots[field])
+
+        if self._row >= 0:
+            self._load(field)
+
+    def remove_mapping(self, field):
+        """Stops mapping a field, nothing happens if it isn't mapped.
+
+        :param field: a mapped field
+        :type field: :class:`~campos.core.Field`
+        """
+        if self._columns.pop(field, None) is not None:
+            field.change_signal.disconnect(self._slots.pop(field))
+
+    def column(self, field):
+        """Obtains the column a field is mapped to.
+
+        :param field: a mapped field
+        :type field: :class:`~campos.core.Field`
+
+        :rtype: :class:`int`
+        """
+        return self._columns[field]
+
+    def seek(self, row):
+        """Shows a row in the fields, with manual submission unsubmitted
+        changes are lost.
+
+        :param row: index of the row
+        :type row: :class:`int`
+
+        :raises IndexError: if the index is out of range
+        """
+        if not 0 <= row < self.model.rowCount():
+            raise IndexError('Row {} out of range'.format(row))
+        self._row = row
+        self.revert()
+        self.moved.emit(row)
+
+    def first(self):
+        """Shows the first row."""
+        self.seek(0)
+
+    def previous(self):
+        """Shows the previous row, nothing happens on the first one."""
+        if self._row > 0:
+            self.seek(self._row - 1)
+
+    def next(self):
+        """Shows the next row, nothing happens on the last one."""
+        if self._row + 1 < self.model.rowCount():
+            self.seek(self._row + 1)
+
+    def last(self):
+        """Shows the last row."""
+        self.seek(self.model.rowCount() - 1)
+
+    def submit(self):
+        """Writes the values of the fields into the current row, invalid
+        values aren't written.
+
+        :return: True if every value was written
+        :rtype: :class:`bool`
+        """
+        if self._row < 0:
+            return False
+
+        done = True
+        for field in self._columns:
+            done = self._store(field) and done
+        return done
+
+    def revert(self):
+        """Shows the values of the current row again, discarding changes not
+        written to the model.
+        """
+        if self._row >= self.model.rowCount():
+            self._row = self.model.rowCount() - 1
+        if self._row >= 0:
+            for field in self._columns:
+                self._load(field)
+
+    def _find_column(self, field):
+        for column in range(self.model.columnCount()):
+            header = self.model.headerData(column, Qt.Horizontal,
+                                           Qt.DisplayRole)
+            if header in (field.name, field.text):
+                return column
+        raise ValueError('No column found for field {}'.format(field.name))
+
+    def _load(self, field):
+        index = self.model.index(self._row, self._columns[field])
+        self._loading = True
+        try:
+            set_field_data(field, self.model.data(index, Qt.EditRole))
+        finally:
+            self._loading = False
+
+    def _store(self, field):
+        field.validate()
+        if not field.valid:
+            return False
+
+        index = self.model.index(self._row, self._columns[field])
+        self._writing = field
+        try:
+            return self.model.setData(index, field_data(field), Qt.EditRole)
+        finally:
+            self._writing = None
+
+    def _field_changed(self, field, *args):
+        if not self._loading and self._row >= 0 and \
+                self.submit_policy == Submit.AUTO:
+            self._store(field)
+
+    def _data_changed(self, top_left, bottom_right, *args):
+        if not top_left.row() <= self._row <= bottom_right.row():
+            return
+
+        for field, column in self._columns.items():
+            # the field being written already shows the value
+            if field is not self._writing and \
+                    top_left.column() <= column <= bottom_right.column():
+                self._load(field)
+
+    def _rows_removed(self, parent, first, last):
+        if parent.isValid() or self._row < first:
+            return
+        if self._row > last:
+            self._row -= last - first + 1
+        else:
+            self._row = min(first, self.model.rowCount() - 1)
+        self.revert()
+        self.moved.emit(self._row)
+
+
+def bind(form, obj, names=None, delay=50):
+    """Links the fields of a form to the attributes of an object, in both
+    directions, see :class:`ObjectBinding`::
+
+        binding = bind(form, user)
+
+        # later
+        binding.unbind()
+
+    :param form: a form or its fields
+    :type form: :class:`~campos.forms.Form` or iterable of
+                :class:`~campos.core.Field`
+
+    :param obj: the object to link
+
+    :param names: names of the fields to link, by default all fields whose
+                  name is an attribute of the object
+    :type names: iterable of :class:`str`
+
+    :param delay: minimum time between transfers, in milliseconds
+    :type delay: :class:`int`
+
+    :rtype: :class:`ObjectBinding`
+    """
+    return ObjectBinding(form, obj, names=names, delay=delay)
+
+
+class ObjectBinding(QObject):
+    """Keeps fields and attributes of an object in sync, without save
+    callbacks.
+
+    Changes done in the fields are pushed to the object and changes done in
+    the object are pulled into the fields. Transfers are throttled: changes
+    are collected and only the changed names are transferred, at most once
+    every `delay` milliseconds. Invalid field values aren't pushed.
+
+    Supported objects and how their changes are noticed:
+
+    * SQLAlchemy instances: attribute ``set`` events and instance ``refresh``
+      events, so values loaded from the database are pulled too.
+    * :class:`~campos.models.FormModel`: its subscription mechanism.
+    * :class:`RowBinding` and other objects: changes aren't noticed, call
+      :func:`pull` after changing them.
+
+    Call :func:`unbind` to stop linking, listeners are removed then.
+
+    :param form: a form or its fields
+    :type form: :class:`~campos.forms.Form` or iterable of
+                :class:`~campos.core.Field`
+
+    :param obj: the object to link
+
+    :param names: names of the fields to link, by default all fields whose
+                  name is an attribute of the object
+    :type names: iterable of :class:`str`
+
+    :param delay: minimum time between transfers, in milliseconds
+    :type delay: :class:`int`
+
+    :param parent: parent object
+    :type parent: ``QObject``
+    """
+
+    #: Emitted with the values pushed to the object, a dict like
+    #: d[attribute_name] = value.
+    pushed = Signal(object)
+
+    def __init__(self, form, obj, names=None, delay=50, parent=None):
+        from .models import FormModel
+
+        super(ObjectBinding, self).__init__(parent)
+        self.object = obj
+        self._model = obj if isinstance(obj, FormModel) else None
+
+        fields = getattr(form, 'fields', form)
+        if names is None:
+            self.fields = OrderedDict((f.name, f) for f in fields
+                                      if self._has(f.name))
+        else:
+            named = {f.name: f for f in fields}
+            self.fields = OrderedDict((n, named[n]) for n in names)
+
+        self._outgoing = OrderedDict()  # names changed in fields
+        self._incoming = OrderedDict()  # names changed in the object
+        self._syncing = False
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay)
+        self._timer.timeout.connect(self.flush)
+
+        self._slots = {}
+        for name, field in self.fields.items():
+            self._slots[name] = partial(self._field_changed, name)
+            field.change_signal.connect(self._slots[name])
+
+        # bound methods are created on every access, the model identifies
+        # the subscriber by identity when skipping the origin of a change
+        self._subscriber = self._model_changed
+
+        self._listeners = []  # (target, event name, callback)
+        if self._model is not None:
+            self._model.subscribe(self._subscriber)
+        else:
+            self._listen()
+
+        self.pull()
+
+    def pull(self, names=None):
+        """Shows object's values in the fields right away.
+
+        :param names: names of the attributes to pull, all by default
+        :type names: iterable of :class:`str`
+        """
+        names = self.fields if names is None else names
+        self._syncing = True
+        try:
+            for name in names:
+                if name in self.fields:
+                    set_field_data(self.fields[name], self._read(name))
+                    self._incoming.pop(name, None)
+        finally:
+            self._syncing = False
+
+    def push(self, names=None):
+        """Writes fields' values to the object right away, invalid values
+        aren't written.
+
+        :param names: names of the fields to push, all by default
+        :type names: iterable of :class:`str`
+
+        :return: the values written, a dict like d[attribute_name] = value
+        :rtype: :class:`~collections.OrderedDict`
+        """
+        names = self.fields if names is None else names
+
+        values = OrderedDict()
+        for name in names:
+            field = self.fields[name]
+            self._outgoing.pop(name, None)
+            field.validate()
+            if field.valid:
+                values[name] = field_data(field)
+
+        self._syncing = True
+        try:
+            for name, value in values.items():
+                self._write(name, value)
+        finally:
+            self._syncing = False
+
+        if values:
+            self.pushed.emit(values)
+        return values
+
+    def flush(self):
+        """Transfers pending changes right away, those done in fields take
+        precedence.
+        """
+        self._timer.stop()
+        outgoing = list(self._outgoing)
+        if outgoing:
+            self.push(outgoing)
+        incoming = [n for n in self._incoming if n not in outgoing]
+        self._incoming.clear()
+        if incoming:
+            self.pull(incoming)
+
+    def unbind(self):
+        """Stops linking fields and object, pending changes are transferred
+        first.
+        """
+        self.flush()
+
+        for name, slot in self._slots.items():
+            self.fields[name].change_signal.disconnect(slot)
+        self._slots.clear()
+
+        if self._model is not None:
+            self._model.unsubscribe(self._subscriber)
+        else:
+            from sqlalchemy import event
+
+            for target, event_name, callback in self._listeners:
+                event.remove(target, event_name, callback)
+        self._listeners.clear()
+
+    def _has(self, name):
+        if self._model is not None:
+            return name in self._model
+        if isinstance(self.object, RowBinding):
+            return name in self.object
+        return hasattr(self.object, name)
+
+    def _read(self, name):
+        if self._model is not None:
+            return self._model[name]
+        if isinstance(self.object, RowBinding):
+            return self.object.get(name)
+        return getattr(self.object, name)
+
+    def _write(self, name, value):
+        if self._model is not None:
+            self._model.set(name, value, origin=self._subscriber)
+        elif isinstance(self.object, RowBinding):
+            self.object.set(name, value)
+        else:
+            setattr(self.object, name, value)
+
+    def _listen(self):
+        try:
+            from sqlalchemy import event, inspect
+        except ImportError:
+            return
+
+        if inspect(self.object, raiseerr=False) is None:
+            return  # not a SQLAlchemy instance
+
+        cls = type(self.object)
+        for name in self.fields:
+            attribute = getattr(cls, name, None)
+            if attribute is not None:
+                self._listeners.append((attribute, 'set', self._attribute_set))
+        self._listeners.append((cls, 'refresh', self._refreshed))
+
+        # the same callables are kept so they can be removed later
+        for target, event_name, callback in self._listeners:
+            event.listen(target, event_name, callback)
+
+    def _schedule(self):
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def _field_changed(self, name, *args):
+        if not self._syncing:
+            self._outgoing[name] = True
+            self._schedule()
+
+    def _incoming_change(self, name):
+        if not self._syncing and name in self.fields:
+            self._incoming[name] = True
+            self._schedule()
+
+    def _model_changed(self, name, value):
+        self._incoming_change(name)
+
+    def _attribute_set(self, target, value, old, initiator):
+        if target is self.object:
+            self._incoming_change(initiator.key)
+
+    def _refreshed(self, target, context, attributes):
+        if target is self.object:
+            for name in attributes or self.fields:
+                self._incoming_change(name)
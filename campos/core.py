@@ -63,6 +63,11 @@ class Field(Qt.QWidget):
     :param message: text to show if field is invalid, if set, this message has
                     priority over validators' messages
     :type message: :class:`str`
+
+    :param lazy: if True, edition forms postpone loading this field's value
+                 until the field is shown or focused, useful for large values,
+                 see :func:`~campos.forms.EditionForm.edit`. Defaults to False
+    :type lazy: :class:`bool`
     """
 
     _FIELDS_COUNT = 0
@@ -70,10 +75,13 @@ class Field(Qt.QWidget):
 
     def __init__(self, *args, name='', text='', description='', default=None,
                  on_change=None, labelling='current', validation='current',
-                 validators=(), required=False, message=None):
+                 validators=(), required=False, message=None, lazy=False):
         super(Field, self).__init__(*args)
         Field._FIELDS_COUNT += 1
 
+        self.lazy = lazy
+        self._mixed = False
+
         self.default = default
         try:
             self.value = self.default
@@ -251,6 +259,33 @@ class Field(Qt.QWidget):
         """
         raise NotImplementedError
 
+    @property
+    def mixed(self):
+        """Whether the field stands for several different values, this
+        happens when several objects are edited at once and they don't share
+        the value of this field, see :func:`~campos.forms.EditionForm.edit`.
+        Mixed fields show an indicator instead of a value.
+
+        :type: :class:`bool`
+        """
+        return self._mixed
+
+    @mixed.setter
+    def mixed(self, value):
+        value = bool(value)
+        if value != self._mixed:
+            self._mixed = value
+            self._show_mixed(value)
+
+    def _show_mixed(self, mixed):
+        """Shows or hides the indicator of mixed values, subclasses can
+        implement this, nothing is shown by default.
+
+        :param mixed: whether the field is mixed or not
+        :type mixed: :class:`bool`
+        """
+        pass
+
     @property
     def change_signal(self):
         """Returns a valid Qt signal which is fired whenever the field's
@@ -306,6 +341,7 @@ class BaseField(Field):
         self.error_label = Qt.QLabel('')
         self.error_label.setStyleSheet('color: rgb(255, 0, 0);')
         self.field_layout = None
+        self._placeholder = ''
 
         super(BaseField, self).__init__(*args, **kwargs)
 
@@ -399,6 +435,23 @@ class BaseField(Field):
             self.setLayout(layout)
             self._labelling = new
 
+    #: Text shown by mixed fields, see :attr:`~Field.mixed`.
+    MIXED_TEXT = 'Mixed values'
+
+    def _show_mixed(self, mixed):
+        font = self.label.font()
+        font.setItalic(mixed)
+        self.label.setFont(font)
+        self.label.setToolTip(self.MIXED_TEXT if mixed else '')
+
+        component = self.main_component
+        if hasattr(component, 'setPlaceholderText'):
+            if mixed:
+                self._placeholder = component.placeholderText()
+                component.setPlaceholderText(self.MIXED_TEXT)
+            else:
+                component.setPlaceholderText(self._placeholder)
+
     def validate(self):
         super(BaseField, self).validate()
 
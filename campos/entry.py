@@ -0,0 +1,167 @@
+import time
+import threading
+from collections import deque
+
+from qtpy.QtCore import QObject, Signal
+
+__author__ = 'Juan Manuel Bermúdez Cabrera'
+
+
+class BatchWriter(QObject):
+    """Stores records in background, grouping them in batches.
+
+    Records are queued using :func:`put` and written by a worker thread
+    when `batch_size` of them are waiting or when the oldest one has waited
+    for `interval` milliseconds, whatever happens first. Each batch is
+    stored with a single call to `write`.
+
+    If a batch fails its records are written again one by one, so only the
+    records causing errors fail. Failures are reported through
+    :attr:`failed` along with the ticket returned by :func:`put`::
+
+        writer = BatchWriter(lambda rows: insert_rows(engine, table, rows))
+        writer.failed.connect(show_error)
+
+    Signals are delivered to the thread which created the writer, usually
+    the GUI thread.
+
+    :param write: callable storing a list of records, it's called in the
+                  worker thread and must raise an exception if records
+                  can't be stored
+    :type write: callable
+
+    :param batch_size: maximum amount of records written at once, defaults
+                       to 100
+    :type batch_size: :class:`int`
+
+    :param interval: maximum amount of milliseconds a record waits before
+                     being written, defaults to 500
+    :type interval: :class:`int`
+    """
+
+    #: Emitted with the amount of records stored after each write.
+    written = Signal(int)
+
+    #: Emitted with the ticket, the record and the exception of each record
+    #: that couldn't be stored.
+    failed = Signal(int, object, object)
+
+    def __init__(self, write, batch_size=100, interval=500):
+        super(BatchWriter, self).__init__()
+        self.write = write
+        self.batch_size = max(batch_size, 1)
+        self.interval = interval
+
+        self._queue = deque()  # (ticket, record, time)
+        self._condition = threading.Condition()
+        self._tickets = 0
+        self._writing = 0  # records being written
+        self._flushing = False
+        self._closing = False
+
+        self._thread = threading.Thread(target=self._run, name='campos-writer',
+                                        daemon=True)
+        self._thread.start()
+
+    def __len__(self):
+        """Amount of records waiting to be written"""
+        with self._condition:
+            return len(self._queue) + self._writing
+
+    def put(self, record):
+        """Queues a record to be written.
+
+        :param record: the record, usually a dict like d[field_name] = value,
+                       see :func:`~campos.forms.Form.snapshot`
+
+        :return: a ticket identifying the record in :attr:`failed` signal
+        :rtype: :class:`int`
+
+        :raises RuntimeError: if the writer is closed
+        """
+        with self._condition:
+            if self._closing:
+                raise RuntimeError('The writer is closed')
+            self._tickets += 1
+            self._queue.append((self._tickets, record, time.monotonic()))
+            self._condition.notify_all()
+            return self._tickets
+
+    def flush(self, timeout=None):
+        """Writes queued records right away, waiting until they are stored.
+
+        :param timeout: maximum amount of seconds to wait
+        :type timeout: :class:`float`
+
+        :return: True if all records were written, even if some failed
+        :rtype: :class:`bool`
+        """
+        with self._condition:
+            self._flushing = True
+            self._condition.notify_all()
+            done = self._condition.wait_for(
+                lambda: not self._queue and not self._writing, timeout)
+            self._flushing = False
+            return done
+
+    def close(self, timeout=None):
+        """Writes queued records and stops the worker thread, no more records
+        can be queued.
+
+        :param timeout: maximum amount of seconds to wait
+        :type timeout: :class:`float`
+        """
+        with self._condition:
+            self._closing = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
+
+    def _next_batch(self):
+        with self._condition:
+            while not self._queue:
+                if self._closing:
+                    return None
+                self._condition.wait()
+
+            deadline = self._queue[0][2] + self.interval / 1000
+            while len(self._queue) < self.batch_size and \
+                    not (self._flushing or self._closing):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+
+            batch = []
+            while self._queue and len(batch) < self.batch_size:
+                batch.append(self._queue.popleft())
+            self._writing = len(batch)
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+
+            try:
+                self._write(batch)
+            finally:
+                with self._condition:
+                    self._writing = 0
+                    self._condition.notify_all()
+
+    def _write(self, batch):
+        try:
+            self.write([record for _, record, _ in batch])
+        except Exception as e:
+            if len(batch) == 1:
+                ticket, record, _ = batch[0]
+                self.failed.emit(ticket, record, e)
+                return
+        else:
+            self.written.emit(len(batch))
+            return
+
+        # find out which records are wrong
+        for item in batch:
+            self._write([item])
@@ -164,6 +164,22 @@ class Validation(HasDefault, HasCurrent, BaseEnum):
         return cls.INSTANT
 
 
+class Submit(HasDefault, BaseEnum):
+    """Moments when a :class:`~campos.bindings.FieldMapper` writes values to
+    its model, the default is 'auto'
+    """
+
+    #: Values are written using :func:`~campos.bindings.FieldMapper.submit`.
+    MANUAL = 0
+
+    #: Values are written as soon as a field changes.
+    AUTO = 1
+
+    @classmethod
+    def default(cls):
+        return cls.AUTO
+
+
 class ButtonType(BaseEnum):
     """Available button types, this enum's members are shortcuts to Qt's
     StandardButtons enum
@@ -1,9 +1,11 @@
 import os
+import mmap
 import operator
+import mimetypes
 from datetime import date, time, datetime
 
 import qtpy.QtWidgets as Qt
-from qtpy.QtCore import QDate, QTime, QDateTime
+from qtpy.QtCore import QDate, QTime, QDateTime, QEvent, Signal
 
 from .core import BaseField
 from .utils import first_of_type, callable
@@ -703,9 +705,11 @@ class SelectField(BaseField):
     def value(self):
         """The selected option.
 
-        .. note:: To change the current selection you can pass only the new
-                  option's text or a tuple like
-                  ``(option's text, option's value)``.
+        .. note:: To change the current selection you can pass the new
+                  option's text, a tuple like
+                  ``(option's text, option's value)`` or only the option's
+                  value. Strings are looked up as texts first and then as
+                  values.
 
         :return: a :class:`tuple` like ``(option's text, option's value)``
         :rtype: :class:`tuple`
@@ -716,19 +720,32 @@ class SelectField(BaseField):
 
     @value.setter
     def value(self, new):
-        if isinstance(new, str):
-            text = new
+        if isinstance(new, tuple):
+            index = self.main_component.findText(new[0])
+        elif isinstance(new, str):
+            index = self.main_component.findText(new)
+            if index < 0:
+                index = self._find_value(new)
         else:
-            text, _ = new
-
-        index = self.main_component.findText(text)
+            index = self._find_value(new)
 
         if index < 0 and self.choices:
-            raise ValueError('No choice with text {}'.format(text))
+            raise ValueError('No choice matching {}'.format(new))
         self.main_component.setCurrentIndex(index)
 
+    def _find_value(self, value):
+        # itemData may convert values, compare with the original choices
+        for i, (_, option) in enumerate(self.choices):
+            if option == value:
+                return i
+        return -1
+
     def has_data(self):
-        return self.main_component.currentIndex() >= 0
+        # the blank option and options without value mean no selection
+        index = self.main_component.currentIndex()
+        if index < 0 or (self._blank_present and index == 0):
+            return False
+        return self.main_component.itemData(index) is not None
 
     def add_choice(self, text, value):
         """Adds a new choice to the options list.
@@ -793,6 +810,320 @@ class SelectField(BaseField):
         return getter
 
 
+class PagedSelectField(SelectField):
+    """Select field whose options are fetched in pages when they are needed.
+
+    The first page is fetched when the options list is shown by first time
+    and following pages as the list is scrolled down, so very large sets of
+    options are never loaded at once.
+
+    Unlike :class:`SelectField`, values assigned to this field are option
+    values, or ``(text, value)`` tuples, since not every option's text is
+    known in advance. When a value whose option hasn't been fetched yet is
+    assigned, `lookup` is used to obtain its text.
+
+    :param fetch: callable invoked like ``fetch(offset, limit)`` which must
+                  return an iterable with at most `limit` options starting at
+                  `offset` , options follow the same rules of
+                  :class:`SelectField` choices.
+    :type fetch: callable
+
+    :param lookup: callable invoked with an option's value which must return
+                   the option's text.
+    :type lookup: callable
+
+    :param page_size: amount of options to fetch at once, defaults to 100
+    :type page_size: :class:`int`
+
+    :param blank: whether to show or not an option meaning no selection, its
+                  value is ``None``.
+    :type blank: :class:`bool`
+
+    :param blank_text: text to show in the meaningless option
+    :type blank_text: :class:`str`
+    """
+
+    #: Fetch next page when the list is scrolled within this amount of items
+    #: from its end.
+    FETCH_THRESHOLD = 5
+
+    def __init__(self, *args, fetch=None, lookup=None, page_size=100,
+                 blank=False, blank_text='', **kwargs):
+        if not callable(fetch):
+            raise ValueError('Expecting callable, got {}'.format(fetch))
+
+        self._fetch = fetch
+        self._lookup = lookup
+        self.page_size = page_size
+
+        self._keys = set()
+        self._fetched = 0
+        self._exhausted = False
+
+        kwargs.setdefault('default', '')
+        super(PagedSelectField, self).__init__(*args, **kwargs)
+
+        self._blank_present = blank
+        self._blank_text = blank_text
+        if blank:
+            self.add_choice(blank_text, None)
+
+        view = self.main_component.view()
+        view.installEventFilter(self)
+        view.verticalScrollBar().valueChanged.connect(self._scrolled)
+
+    @property
+    def value(self):
+        """The selected option.
+
+        .. note:: To change the current selection you can pass only the new
+                  option's value or a tuple like
+                  ``(option's text, option's value)``.
+
+        :return: a :class:`tuple` like ``(option's text, option's value)``
+        :rtype: :class:`tuple`
+        """
+        component = self.main_component
+        index = component.currentIndex()
+        return component.currentText(), component.itemData(index)
+
+    @value.setter
+    def value(self, new):
+        if isinstance(new, tuple):
+            text, key = new
+        else:
+            text, key = None, new
+
+        component = self.main_component
+        if key is None or key == '':
+            component.setCurrentIndex(0 if self._blank_present else -1)
+            return
+
+        index = component.findData(key) if key in self._keys else -1
+        if index < 0:
+            if text is None:
+                if not callable(self._lookup):
+                    raise ValueError('No choice with value {}'.format(key))
+                text = self._lookup(key)
+            self.add_choice(text, key)
+            index = component.count() - 1
+        component.setCurrentIndex(index)
+
+    def add_choice(self, text, value):
+        self._keys.add(value)
+        super(PagedSelectField, self).add_choice(text, value)
+
+    def clear(self):
+        """Removes all options except the blank one if present, options will
+        be fetched again from the beginning
+        """
+        self.main_component.clear()
+        self.choices.clear()
+        self._keys.clear()
+        self._fetched = 0
+        self._exhausted = False
+
+        if self._blank_present:
+            self.add_choice(self._blank_text, None)
+
+    def fetch_more(self):
+        """Fetches the next page of options, if there is one.
+
+        :return: True if new options were fetched
+        :rtype: :class:`bool`
+        """
+        if self._exhausted:
+            return False
+
+        page = list(self._fetch(self._fetched, self.page_size))
+        self._fetched += len(page)
+        self._exhausted = len(page) < self.page_size
+
+        for ch in page:
+            value = self._value_getter(ch)
+            if value not in self._keys:  # may have been looked up before
+                self.add_choice(self._text_getter(ch), value)
+        return len(page) > 0
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Show and self._fetched == 0:
+            self.fetch_more()
+        return super(PagedSelectField, self).eventFilter(obj, event)
+
+    def _scrolled(self, position):
+        scroll = self.main_component.view().verticalScrollBar()
+        if position >= scroll.maximum() - self.FETCH_THRESHOLD:
+            self.fetch_more()
+
+
+class MultiSelectField(BaseField):
+    """Field to select any amount of options among several ones, they are
+    shown in a list where several items can be selected at once.
+
+    The value of this field is a :class:`list` with the values of the
+    selected options, in the order they are shown. `choices`, `get_text` and
+    `get_value` follow the same rules of :class:`SelectField`.
+
+    If `fetch` is given options are fetched in pages like in
+    :class:`PagedSelectField`, the first page when the list is shown and the
+    following ones as it's scrolled down.
+
+    :param choices: options to show
+    :type choices: iterable or callable
+
+    :param get_text: used to obtain option's text, see :class:`SelectField`
+    :type get_text: callable or :class:`str`
+
+    :param get_value: used to obtain option's value, see :class:`SelectField`
+    :type get_value: callable or :class:`str`
+
+    :param fetch: callable invoked like ``fetch(offset, limit)`` which must
+                  return an iterable with at most `limit` options starting at
+                  `offset`
+    :type fetch: callable
+
+    :param lookup: callable invoked with an option's value which must return
+                   the option's text, used when values whose options haven't
+                   been fetched yet are assigned
+    :type lookup: callable
+
+    :param page_size: amount of options to fetch at once, defaults to 100
+    :type page_size: :class:`int`
+    """
+
+    #: Fetch next page when the list is scrolled within this amount of items
+    #: from its end.
+    FETCH_THRESHOLD = 5
+
+    def __init__(self, *args, choices=(), get_text=None, get_value=None,
+                 fetch=None, lookup=None, page_size=100, **kwargs):
+        self._list = Qt.QListWidget()
+        self._list.setSelectionMode(Qt.QAbstractItemView.MultiSelection)
+
+        self._text_getter = SelectField._create_text_getter(get_text)
+        self._value_getter = SelectField._create_value_getter(get_value)
+
+        self._fetch = fetch
+        self._lookup = lookup
+        self.page_size = page_size
+        self._fetched = 0
+        self._exhausted = fetch is None
+
+        self.choices = []
+        for ch in choices() if callable(choices) else choices:
+            self.add_choice(self._text_getter(ch), self._value_getter(ch))
+
+        kwargs.setdefault('default', ())
+        super(MultiSelectField, self).__init__(*args, **kwargs)
+
+        if fetch is not None:
+            self._list.installEventFilter(self)
+            self._list.verticalScrollBar().valueChanged.connect(self._scrolled)
+
+    @property
+    def main_component(self):
+        return self._list
+
+    @property
+    def change_signal(self):
+        return self.main_component.itemSelectionChanged
+
+    @property
+    def value(self):
+        """Values of the selected options.
+
+        .. note:: To change the selection pass an iterable with the values of
+                  the options to select, the rest are unselected.
+
+        :rtype: :class:`list`
+        """
+        component = self.main_component
+        return [value for i, (_, value) in enumerate(self.choices)
+                if component.item(i).isSelected()]
+
+    @value.setter
+    def value(self, new):
+        indexes = set()
+        for value in new or ():
+            index = self._find_value(value)
+            if index < 0:
+                if not callable(self._lookup):
+                    raise ValueError('No choice matching {}'.format(value))
+                self.add_choice(self._lookup(value), value)
+                index = len(self.choices) - 1
+            indexes.add(index)
+
+        # a single change is notified
+        component = self.main_component
+        blocked = component.blockSignals(True)
+        try:
+            for i in range(component.count()):
+                component.item(i).setSelected(i in indexes)
+        finally:
+            component.blockSignals(blocked)
+        if not blocked:
+            component.itemSelectionChanged.emit()
+
+    def _find_value(self, value):
+        for i, (_, option) in enumerate(self.choices):
+            if option == value:
+                return i
+        return -1
+
+    def has_data(self):
+        return len(self.main_component.selectedItems()) > 0
+
+    def add_choice(self, text, value):
+        """Adds a new choice to the options list.
+
+        :param text: text of the new option
+        :type text: :class:`str`
+
+        :param value: value of the new option
+        :type value: any
+        """
+        self.choices.append((text, value))
+        self.main_component.addItem(text)
+
+    def clear(self):
+        """Removes all options, if they are fetched they will be fetched again
+        from the beginning
+        """
+        self.main_component.clear()
+        self.choices.clear()
+        self._fetched = 0
+        self._exhausted = self._fetch is None
+
+    def fetch_more(self):
+        """Fetches the next page of options, if there is one.
+
+        :return: True if new options were fetched
+        :rtype: :class:`bool`
+        """
+        if self._exhausted:
+            return False
+
+        page = list(self._fetch(self._fetched, self.page_size))
+        self._fetched += len(page)
+        self._exhausted = len(page) < self.page_size
+
+        for ch in page:
+            value = self._value_getter(ch)
+            if self._find_value(value) < 0:  # may have been looked up before
+                self.add_choice(self._text_getter(ch), value)
+        return len(page) > 0
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Show and self._fetched == 0:
+            self.fetch_more()
+        return super(MultiSelectField, self).eventFilter(obj, event)
+
+    def _scrolled(self, position):
+        scroll = self.main_component.verticalScrollBar()
+        if position >= scroll.maximum() - self.FETCH_THRESHOLD:
+            self.fetch_more()
+
+
 class FileField(BaseField):
     """Field to input file(s).
 
@@ -1037,3 +1368,169 @@ class DirField(BaseField):
     @button_text.setter
     def button_text(self, value):
         self._browse.setText(value)
+
+
+class BinaryField(BaseField):
+    """Field to input binary data, like attachments.
+
+    The value of this field is a bytes-like object(:class:`bytes`,
+    :class:`memoryview`, :class:`mmap.mmap`, etc) or ``None``. The field
+    shows the size and the type of the data and allows to import it from a
+    file or to export it to a file.
+
+    Imported files are memory mapped instead of read, so even huge files
+    are not copied in memory, the mapping can be passed to SQLAlchemy or
+    to a database driver as is. Exported data is written in chunks of
+    ``CHUNK_SIZE`` bytes.
+
+    .. note:: forms load and store the value as a whole, with SQLAlchemy use
+              :func:`~campos.sources.sqlalchemy.write_blob` and
+              :func:`~campos.sources.sqlalchemy.read_blob` to transfer large
+              values in chunks.
+
+    :param import_text: text to show in the import button
+    :type import_text: :class:`str`
+
+    :param export_text: text to show in the export button
+    :type export_text: :class:`str`
+    """
+
+    #: Amount of bytes written at once when exporting data.
+    CHUNK_SIZE = 1024 * 1024
+
+    #: Known file signatures used to guess the type of data, tuples like
+    #: (signature, mime type)
+    SIGNATURES = ((b'\x89PNG\r\n\x1a\n', 'image/png'),
+                  (b'\xff\xd8\xff', 'image/jpeg'),
+                  (b'GIF8', 'image/gif'),
+                  (b'%PDF', 'application/pdf'),
+                  (b'PK\x03\x04', 'application/zip'),
+                  (b'\x1f\x8b', 'application/gzip'))
+
+    _changed = Signal()
+
+    def __init__(self, *args, import_text='Import', export_text='Export',
+                 **kwargs):
+        self._data = None
+        self.filename = None
+        self._mime_type = None
+
+        self._info = Qt.QLabel('')
+        self._import = Qt.QPushButton(import_text)
+        self._export = Qt.QPushButton(export_text)
+
+        self._layout = Qt.QHBoxLayout()
+        self._layout.addWidget(self._info, stretch=1)
+        self._layout.addWidget(self._import)
+        self._layout.addWidget(self._export)
+
+        super(BinaryField, self).__init__(*args, **kwargs)
+
+        self._import.clicked.connect(self._choose_import)
+        self._export.clicked.connect(self._choose_export)
+
+    @property
+    def main_component(self):
+        return self._layout
+
+    @property
+    def change_signal(self):
+        return self._changed
+
+    @property
+    def value(self):
+        return self._data
+
+    @value.setter
+    def value(self, value):
+        self._data = value
+        self._mime_type = None
+        self.filename = None
+        self._update_info()
+        self._changed.emit()
+
+    def has_data(self):
+        return self._data is not None and len(self._data) > 0
+
+    @property
+    def size(self):
+        """Size in bytes of the current data.
+
+        :type: :class:`int`
+        """
+        return 0 if self._data is None else len(self._data)
+
+    @property
+    def mime_type(self):
+        """Type of the current data, guessed from the name of the imported
+        file or from the first bytes of the data. ``None`` if there is no data.
+
+        :type: :class:`str`
+        """
+        if self._mime_type is None and self.has_data():
+            self._mime_type = 'application/octet-stream'
+            head = bytes(memoryview(self._data)[:16])
+            for signature, mime_type in self.SIGNATURES:
+                if head.startswith(signature):
+                    self._mime_type = mime_type
+                    break
+        return self._mime_type
+
+    def import_file(self, path):
+        """Uses the content of a file as the value of this field, the file is
+        memory mapped so it isn't read in advance.
+
+        :param path: path of the file to import
+        :type path: :class:`str`
+        """
+        with open(path, 'rb') as file:
+            if os.fstat(file.fileno()).st_size > 0:
+                data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                data = b''  # empty files can't be mapped
+
+        self.value = data
+        self.filename = path
+        self._mime_type = mimetypes.guess_type(path)[0]
+        self._update_info()
+
+    def export_file(self, path):
+        """Writes the value of this field to a file in chunks of
+        ``CHUNK_SIZE`` bytes.
+
+        :param path: path of the file to write
+        :type path: :class:`str`
+        """
+        view = memoryview(b'' if self._data is None else self._data)
+        with open(path, 'wb') as file:
+            for start in range(0, len(view), self.CHUNK_SIZE):
+                file.write(view[start:start + self.CHUNK_SIZE])
+
+    def _update_info(self):
+        if self.has_data():
+            size = float(self.size)
+            for unit in ('bytes', 'KB', 'MB', 'GB'):
+                if size < 1024:
+                    break
+                size /= 1024
+            size = '{:.0f} {}'.format(size, unit) if unit == 'bytes' else \
+                '{:.1f} {}'.format(size, unit)
+
+            info = '{}, {}'.format(size, self.mime_type)
+            if self.filename:
+                info = '{} ({})'.format(os.path.basename(self.filename), info)
+        else:
+            info = 'No data'
+
+        self._info.setText(info)
+        self._export.setEnabled(self.has_data())
+
+    def _choose_import(self):
+        path, _ = Qt.QFileDialog.getOpenFileName(self, 'Import')
+        if path:
+            self.import_file(path)
+
+    def _choose_export(self):
+        path, _ = Qt.QFileDialog.getSaveFileName(self, 'Export')
+        if path:
+            self.export_file(path)
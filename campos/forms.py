@@ -1,12 +1,22 @@
+import logging
+import functools
+import threading
 import contextlib
+from collections import OrderedDict
 
+from qtpy.QtCore import QObject, QEvent, QTimer, Signal
 from qtpy.QtWidgets import (QDialog, QVBoxLayout, QDialogButtonBox, QMessageBox,
-                            QGroupBox, QGridLayout, QHBoxLayout)
+                            QGroupBox, QGridLayout, QHBoxLayout, QWidget,
+                            QPushButton)
 
 from . import sources
+from .bindings import (field_data, set_field_data, read_value, common_values,
+                       MIXED)
 from .enums import Validation, ButtonType
 from .utils import callable
 
+_LOG = logging.getLogger(__name__)
+
 __author__ = 'Juan Manuel Bermúdez Cabrera'
 
 
@@ -90,6 +100,14 @@ class Form(QDialog):
     REJECTION_ROLES = (QDialogButtonBox.RejectRole, QDialogButtonBox.NoRole,
                        QDialogButtonBox.DestructiveRole)
 
+    #: Minimum time between two passes applying values posted with
+    #: :func:`post_value`, in milliseconds, about a frame at 60Hz.
+    FEED_INTERVAL = 16
+
+    # emitted, from any thread, when the first value waiting to be applied is
+    # posted
+    _posted = Signal()
+
     def __init__(self, options=('ok', 'cancel'), fields=(),
                  validation='current', **kwargs):
         super(Form, self).__init__()
@@ -121,6 +139,18 @@ class Form(QDialog):
         self.validation = validation
         self.valid = True
 
+        self._batch_depth = 0
+        self._validation_pending = False
+
+        self._feed = {}  # field name --> latest posted value
+        self._feed_names = set()  # names of the fields, read by any thread
+        self._feed_lock = threading.Lock()
+        self._feed_timer = QTimer(self)
+        self._feed_timer.setSingleShot(True)
+        self._feed_timer.setInterval(self.FEED_INTERVAL)
+        self._feed_timer.timeout.connect(self.apply_posted)
+        self._posted.connect(self._schedule_feed)
+
         for f in fields:
             self.add_field(f)
 
@@ -165,6 +195,8 @@ class Form(QDialog):
         """
         self.members_layout.addWidget(field)
         self.fields.append(field)
+        with self._feed_lock:
+            self._feed_names.add(field.name)
 
         field.validation = 'manual'
         if self.validation == Validation.INSTANT:
@@ -187,6 +219,8 @@ class Form(QDialog):
 
         self.members_layout.removeWidget(field)
         self.fields.remove(field)
+        with self._feed_lock:
+            self._feed_names = {f.name for f in self.fields}
         return field
 
     def add_button(self, btn, on_click=None):
@@ -315,6 +349,9 @@ class Form(QDialog):
                     Used only when form validation is set to 'manual'
         :type msg: :class:`str`
         """
+        if self._batch_depth:
+            self._validation_pending = True
+            return
 
         self.valid = True
         for field in self.fields:
@@ -332,6 +369,104 @@ class Form(QDialog):
             else:
                 self._enable_acceptance_btns(False)
 
+    def snapshot(self):
+        """Takes the current values of all fields, ready to be stored, see
+        :func:`~campos.bindings.field_data`.
+
+        :return: a dict like d[field_name] = value
+        :rtype: :class:`~collections.OrderedDict`
+        """
+        return OrderedDict((f.name, field_data(f)) for f in self.fields)
+
+    @contextlib.contextmanager
+    def batch(self):
+        """Context manager to change several fields at once. Form validation
+        is deferred until the block ends, so with 'instant' validation the
+        form is validated once instead of once per changed field::
+
+            with form.batch():
+                form.field('name').value = 'Rajesh'
+                form.field('last_name').value = 'Koothrappali'
+
+        Blocks can be nested, validation runs when the outermost one ends.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._validation_pending:
+                self._validation_pending = False
+                self.validate()
+
+    def post_value(self, name, value):
+        """Posts a new value for a field, it can be called from any thread.
+
+        Values aren't shown right away, they are applied in the GUI thread at
+        most once every :attr:`FEED_INTERVAL` milliseconds and only the latest
+        value posted for each field is kept, so fields can be fed at high
+        rates, by instruments for instance::
+
+            def read(instrument):
+                while True:
+                    form.post_value('voltage', instrument.read())
+
+            threading.Thread(target=read, args=(instrument,)).start()
+
+        Values are shown using :func:`~campos.bindings.set_field_data` inside a
+        :func:`batch`. Disabled fields are taken as display only, their change
+        signals are blocked so they aren't validated.
+
+        :param name: name of the field
+        :type name: :class:`str`
+
+        :param value: new value, as it's stored
+
+        :raises ValueError: if the form has no field with the given name, in
+                            the calling thread
+        """
+        with self._feed_lock:
+            if name not in self._feed_names:
+                msg = 'No field named {}'.format(name)
+                raise ValueError(msg)
+            first = not self._feed
+            self._feed[name] = value
+        if first:
+            self._posted.emit()
+
+    def apply_posted(self):
+        """Shows right away the values posted with :func:`post_value` which
+        are still waiting, it must be called from the GUI thread. Values of
+        fields removed after they were posted are discarded.
+        """
+        self._feed_timer.stop()
+        with self._feed_lock:
+            values, self._feed = self._feed, {}
+
+        with self.batch():
+            for name, value in values.items():
+                try:
+                    field = self.field(name)
+                except ValueError:
+                    _LOG.warning('Discarding value posted for missing field '
+                                 '%s', name)
+                    continue
+
+                if field.isEnabled():
+                    set_field_data(field, value)
+                    continue
+
+                component = field.main_component
+                blocked = component.blockSignals(True)
+                try:
+                    set_field_data(field, value)
+                finally:
+                    component.blockSignals(blocked)
+
+    def _schedule_feed(self):
+        if not self._feed_timer.isActive():
+            self._feed_timer.start()
+
     def group(self, title, fieldnames, layout='vertical'):
         """Groups fields in a common area under a title using chosen layout.
 
@@ -396,11 +531,61 @@ class CreationForm(Form):
         # reset fields' data every time form closes
         self.finished.connect(self.reset)
 
+        self.writer = None
+
     def reset(self):
         """Restores all fields in the form to their default values"""
         for field in self.fields:
             field.value = field.default
 
+    def keep_open(self, writer, button='save'):
+        """Enables rapid entry mode, clicking `button` submits the current
+        values without closing the form, see :func:`submit`. Values are
+        stored in background by `writer`::
+
+            writer = table_writer(engine, person_table, batch_size=50)
+            writer.failed.connect(show_error)
+
+            # the auto incremented key is generated by the database
+            source_kw = {'bind': engine, 'exclude': ['id']}
+            form = CreationForm.from_source(person_table, source_kw=source_kw)
+            form.keep_open(writer)
+
+        :param writer: writer storing submitted values
+        :type writer: :class:`~campos.entry.BatchWriter`
+
+        :param button: button submitting values, defaults to save button
+        :type button: :class:`str`, :class:`~campos.enums.ButtonType` or
+                      ``QPushButton``
+        """
+        self.writer = writer
+        if not isinstance(button, QPushButton):
+            button = self.button(button)
+        button.clicked.connect(self.submit)
+
+    def submit(self):
+        """Validates the form and, if it's valid, queues a snapshot of its
+        values in :attr:`writer` and resets all fields at once, leaving the
+        form ready for the next record. See :func:`keep_open`.
+
+        :return: the ticket of the queued values or ``None`` if the form is
+                 invalid, see :func:`~campos.entry.BatchWriter.put`
+        :rtype: :class:`int`
+        """
+        self.validate()
+        if not self.valid:
+            return None
+
+        ticket = self.writer.put(self.snapshot())
+        with self.batch():
+            self.reset()
+
+        for field in self.fields:
+            if field.isEnabled():
+                field.setFocus()
+                break
+        return ticket
+
     @staticmethod
     def from_source(obj, source_kw={}, form_kw={}):
         source = sources.get_fields_source(obj, **source_kw)
@@ -455,6 +640,10 @@ class EditionForm(Form):
         super(EditionForm, self).__init__(**kwargs)
 
         self._real_defaults = {}
+        self._lazy_loaders = []
+        self._loaded = {}
+        self._touched = None  # names of changed fields when editing many
+        self._touch_slots = []
 
         # reset fields to their real defaults every time form closes
         self.finished.connect(self._restore_real_defaults)
@@ -466,6 +655,12 @@ class EditionForm(Form):
         for field in self.fields:
             field.value = field.default
 
+        if self.bulk:
+            # nothing has been changed by the user
+            self._touched.clear()
+            for field in self.fields:
+                field.mixed = field.name not in self._loaded
+
     @staticmethod
     def from_source(obj, source_kw={}, form_kw={}):
         source = sources.get_fields_source(obj, **source_kw)
@@ -490,6 +685,25 @@ class EditionForm(Form):
         disable keyword and provide the names of the fields. Field names must
         match object attributes in order to load values correctly.
 
+        Attributes needed by the form are loaded at once before filling the
+        fields if that's cheaper than reading them one by one, see
+        :func:`~campos.sources.prefetch`.
+
+        Lazy fields(see :class:`~campos.core.Field`) show a placeholder and
+        their attribute isn't read until the field is painted on screen or
+        focused by first time, so deferred SQLAlchemy columns are fetched only
+        if they're actually viewed.
+
+        Missing values(attributes set to ``None``) are replaced by field's real
+        default value. This method can be called several times in a row, to
+        move through a collection of objects for instance, the form is
+        validated only once per call, see :func:`batch` and
+        :class:`~campos.navigation.Navigator`.
+
+        Several objects can be edited at once passing a list or tuple of them,
+        see :func:`edit_common`. Values shared by all objects are found in a
+        single pass over them, lazy fields aren't loaded in this case.
+
         :param obj: object used to fill form fields, only those attributes which
                     match field names will be used.
         :type obj: any
@@ -497,28 +711,235 @@ class EditionForm(Form):
         :param disabled: names of the fields to be disabled in edition mode.
         :type disabled: iterable of :class:`str`
         """
-        self._real_defaults.clear()
+        if isinstance(obj, (list, tuple)):
+            names = [field.name for field in self.fields if not field.lazy]
+            return self.edit_common(common_values(obj, names), disabled)
+
+        eager = [field.name for field in self.fields if not field.lazy]
+        sources.prefetch(obj, eager)
+        self._cancel_lazy_loaders()
+        self._end_bulk()
+        self._loaded.clear()
+
+        with self.batch():
+            self._fill(obj, disabled)
+        return self
+
+    def edit_common(self, values, disabled=()):
+        """Puts the form in edition mode for several objects at once.
+
+        Fields show the values shared by all the objects, fields whose
+        objects have different values, or whose value is unknown, are marked
+        as :attr:`~campos.core.Field.mixed` and show their default value.
+        Only fields changed by the user are reported by :func:`changed`, so
+        saving can apply them to every object using a single statement::
+
+            form.edit(selected_users)
+
+            def save():
+                keys = [user.id for user in selected_users]
+                update_rows(engine, users_table, keys, changed_data(form))
+
+        Values can be obtained using :func:`~campos.bindings.common_values`
+        or, for database rows, using
+        :func:`~campos.sources.sqlalchemy.common_values` which computes them
+        with a single query.
 
+        :param values: a dict like d[field_name] = value, where value is
+                       :data:`~campos.bindings.MIXED` for fields with
+                       different values
+        :type values: :class:`dict`
+
+        :param disabled: names of the fields to be disabled in edition mode.
+        :type disabled: iterable of :class:`str`
+        """
+        self._cancel_lazy_loaders()
+        self._end_bulk()
+        self._loaded.clear()
+
+        with self.batch():
+            for field in self.fields:
+                field.setEnabled(True)
+                self._real_defaults.setdefault(field.name, field.default)
+
+                value = values.get(field.name, MIXED)
+                if value is MIXED or value is None:
+                    value = self._real_defaults[field.name]
+                else:
+                    self._loaded[field.name] = None  # filled below
+
+                field.default = value
+                field.value = value
+                field.mixed = field.name not in self._loaded
+                if field.name in self._loaded:
+                    self._loaded[field.name] = field_data(field)
+
+                if field.name in disabled:
+                    field.setEnabled(False)
+
+        # from now on, changes are made by the user
+        self._touched = set()
+        for field in self.fields:
+            slot = functools.partial(self._touch, field)
+            field.change_signal.connect(slot)
+            self._touch_slots.append((field, slot))
+        return self
+
+    @property
+    def bulk(self):
+        """Whether several objects are being edited at once, see
+        :func:`edit_common`.
+
+        :type: :class:`bool`
+        """
+        return self._touched is not None
+
+    def _touch(self, field, *args):
+        self._touched.add(field.name)
+        field.mixed = False
+
+    def _end_bulk(self):
+        for field, slot in self._touch_slots:
+            field.change_signal.disconnect(slot)
+            field.mixed = False
+        self._touch_slots.clear()
+        self._touched = None
+
+    def _fill(self, obj, disabled):
         for field in self.fields:
             # enable to remove settings from previous editions
             field.setEnabled(True)
 
-            # save field's real default value
-            self._real_defaults[field.name] = field.default
+            # save field's real default value, only once if there are
+            # consecutive editions
+            self._real_defaults.setdefault(field.name, field.default)
+
+            if field.lazy:
+                field.default = self._real_defaults[field.name]
+                field.value = field.default
+
+                loader = _LazyLoader(self, field, obj, field.name in disabled)
+                self._lazy_loaders.append(loader)
+                continue
 
             # fill default and value properties with object's current values
             with contextlib.suppress(AttributeError):
-                value = getattr(obj, field.name)
+                value = read_value(obj, field.name)
+                if value is None:
+                    value = self._real_defaults[field.name]
+
                 field.default = value
                 field.value = value
+                self._loaded[field.name] = field_data(field)
 
                 # disable if necessary
                 if field.name in disabled:
                     field.setEnabled(False)
-        return self
+
+    def changed(self):
+        """Finds the fields whose values differ from the ones loaded by the
+        last call to :func:`edit`, fields which weren't loaded from the object
+        (lazy fields not viewed yet for instance) are never included. When
+        editing several objects only fields changed by the user are included,
+        see :func:`edit_common`::
+
+            def save():
+                for field in form.changed():
+                    setattr(obj, field.name, field.value)
+
+        See :func:`~campos.bindings.store_changes` too.
+
+        :return: changed fields, in form's order
+        :rtype: :class:`list`
+        """
+        changed = []
+        for field in self.fields:
+            if self.bulk:
+                # fields with mixed values change as soon as they're touched
+                if field.name not in self._touched:
+                    continue
+                if field.name not in self._loaded:
+                    changed.append(field)
+                    continue
+
+            if field.name in self._loaded and \
+                    field_data(field) != self._loaded[field.name]:
+                changed.append(field)
+        return changed
+
+    def _cancel_lazy_loaders(self):
+        for loader in self._lazy_loaders:
+            loader.cancel()
+        self._lazy_loaders.clear()
 
     def _restore_real_defaults(self):
+        self._cancel_lazy_loaders()
+
         for field in self.fields:
             if field.name in self._real_defaults:
                 field.default = self._real_defaults[field.name]
+        self._real_defaults.clear()
+        self._loaded.clear()
+        self._end_bulk()
         self.reset()
+
+
+class _LazyLoader(QObject):
+    """Loads the value of a lazy field the first time the field is painted or
+    focused, a placeholder text is shown meanwhile if the field supports it.
+    """
+
+    PLACEHOLDER = 'Loading...'
+
+    def __init__(self, form, field, obj, disable):
+        super(_LazyLoader, self).__init__(form)
+        self.field = field
+        self.obj = obj
+        self.disable = disable
+
+        component = field.main_component
+        self.widget = component if isinstance(component, QWidget) else field
+
+        self._placeholder = None
+        if hasattr(self.widget, 'setPlaceholderText'):
+            self._placeholder = self.widget.placeholderText()
+            self.widget.setPlaceholderText(self.PLACEHOLDER)
+
+        self.widget.installEventFilter(self)
+
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.FocusIn:
+            self.load()
+        elif event.type() == QEvent.Paint:
+            # avoid loading data while painting
+            QTimer.singleShot(0, self.load)
+        return False
+
+    def load(self):
+        if self.obj is None:
+            return  # already loaded or cancelled
+
+        obj, self.obj = self.obj, None
+        self.cancel()
+
+        with contextlib.suppress(AttributeError):
+            value = read_value(obj, self.field.name)
+            if value is not None:
+                self.field.default = value
+                self.field.value = value
+            self.parent()._loaded[self.field.name] = field_data(self.field)
+
+            if self.disable:
+                self.field.setEnabled(False)
+
+    def cancel(self):
+        self.obj = None
+        if self.widget is None:
+            return
+
+        self.widget.removeEventFilter(self)
+        if self._placeholder is not None:
+            self.widget.setPlaceholderText(self._placeholder)
+
+        self.widget = None
+        self.deleteLater()
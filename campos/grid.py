@@ -0,0 +1,689 @@
+import io
+import csv
+import datetime as dt
+
+from qtpy.QtCore import (Qt, QAbstractTableModel, QModelIndex, QDate, QTime,
+                         QDateTime)
+from qtpy.QtGui import QColor, QKeySequence
+from qtpy.QtWidgets import QApplication, QStyledItemDelegate, QTableView
+
+from . import sources
+from .bindings import field_data, set_field_data
+from .fields import (BoolField, IntField, FloatField, StringField, DateField,
+                     TimeField, DatetimeField, BinaryField, SelectField,
+                     PagedSelectField)
+from .validators import DataRequired
+
+__author__ = 'Juan Manuel Bermúdez Cabrera'
+
+
+def _get(record, name):
+    if isinstance(record, dict):
+        return record.get(name)
+    return getattr(record, name, None)
+
+
+def _int(state):
+    # check states are enums in some bindings and plain ints in others
+    return int(getattr(state, 'value', state))
+
+
+def _set(record, name, value):
+    if isinstance(record, dict):
+        record[name] = value
+    else:
+        setattr(record, name, value)
+
+
+#: Texts accepted as true and false by boolean columns when pasting, compared
+#: ignoring case.
+TRUE_TEXTS = ('1', 'true', 'yes', 'y', 'x', 'on')
+FALSE_TEXTS = ('', '0', 'false', 'no', 'n', 'off')
+
+
+def parse_table(text):
+    """Splits tab separated text, as copied from spreadsheets, into rows of
+    cells. Quoted cells may contain tabs and line breaks.
+
+    :param text: text to split
+    :type text: :class:`str`
+
+    :return: a list of rows, each one a list of strings
+    :rtype: :class:`list`
+    """
+    if text.endswith('\n'):
+        text = text[:-1]
+    if text.endswith('\r'):
+        text = text[:-1]
+    if not text:
+        return []
+    rows = csv.reader(io.StringIO(text, newline=''), delimiter='\t')
+    return [row or [''] for row in rows]  # blank lines are empty cells
+
+
+def _qt_parser(qt_type, to_python):
+    def parse(text, field):
+        value = qt_type.fromString(text, field.format)
+        if not value.isValid():
+            raise ValueError('Expecting format {}'.format(field.format))
+        return to_python(value)
+    return parse
+
+
+def _date(qdate):
+    return dt.date(qdate.year(), qdate.month(), qdate.day())
+
+
+def _time(qtime):
+    return dt.time(qtime.hour(), qtime.minute(), qtime.second(),
+                   qtime.msec() * 1000)
+
+
+def _datetime(qdatetime):
+    return dt.datetime.combine(_date(qdatetime.date()), _time(qdatetime.time()))
+
+
+_TEMPORAL = ((DatetimeField, dt.datetime, _qt_parser(QDateTime, _datetime)),
+             (DateField, dt.date, _qt_parser(QDate, _date)),
+             (TimeField, dt.time, _qt_parser(QTime, _time)))
+
+
+def text_converter(field):
+    """Creates a function converting pasted text to values of a field, it's
+    created once per column so field's type is inspected only once.
+
+    The function receives a string and returns a tuple
+    ``(field value, stored value)``, these differ only for select fields whose
+    value is a tuple ``(option's text, option's value)``. Empty texts are
+    converted to ``None``, except for strings and booleans. A
+    :class:`ValueError` is raised if the text can't be converted.
+
+    Numbers are parsed by python, dates and times are accepted in ISO format
+    or field's format, options of select fields are found by their text and
+    booleans accept :attr:`TRUE_TEXTS` and :attr:`FALSE_TEXTS`.
+
+    :param field: field describing the values
+    :type field: :class:`~campos.core.Field`
+
+    :return: a converter function
+    :rtype: callable
+    """
+    if isinstance(field, BoolField):
+        def convert(text):
+            lowered = text.strip().lower()
+            if lowered in TRUE_TEXTS:
+                return True, True
+            if lowered in FALSE_TEXTS:
+                return False, False
+            raise ValueError('Expecting yes or no')
+        return convert
+
+    if isinstance(field, SelectField):
+        options = {}
+        for text, value in field.choices:
+            options.setdefault(text, value)
+            options.setdefault(str(value), value)
+
+        def convert(text):
+            if text not in options:
+                if not text:
+                    return None, None
+                raise ValueError('Unknown option {}'.format(text))
+            value = options[text]
+            return (text, value), value
+        return convert
+
+    if isinstance(field, BinaryField):
+        def convert(text):
+            raise ValueError("Can't paste into {}".format(field.text))
+        return convert
+
+    if isinstance(field, StringField) or \
+            not isinstance(field, (IntField, DateField, TimeField,
+                                   DatetimeField)):
+        return lambda text: (text, text)
+
+    if isinstance(field, FloatField):
+        parse = float
+    elif isinstance(field, IntField):
+        parse = int
+    else:
+        for cls, python_type, qt_parse in _TEMPORAL:
+            if isinstance(field, cls):
+                break
+
+        def parse(text):
+            try:
+                return python_type.fromisoformat(text)
+            except ValueError:
+                return qt_parse(text, field)
+
+    def convert(text):
+        text = text.strip()
+        if not text:
+            return None, None
+        try:
+            value = parse(text)
+        except ValueError:
+            raise ValueError('Invalid value {}'.format(text))
+        return value, value
+    return convert
+
+
+class _Cell(object):
+    """Stands for a field while validating pasted values, validators read
+    :attr:`value` and other attributes are taken from the field.
+
+    Values are kept as they are stored, like :func:`~campos.bindings.field_data`
+    returns them, so select cells hold option's value instead of the
+    ``(text, value)`` tuple.
+    """
+
+    __slots__ = ('field', 'value')
+
+    def __init__(self, field):
+        self.field = field
+        self.value = None
+
+    def __getattr__(self, name):
+        return getattr(self.field, name)
+
+    def has_data(self):
+        if self.value in (None, ''):
+            return False
+
+        # the blank option means no selection, like in the field
+        field = self.field
+        if isinstance(field, SelectField) and field._blank_present:
+            return self.value != field.choices[0][1]
+        return True
+
+    def validate(self):
+        pass  # asynchronous answers arrive after pasted cells were checked
+
+    def error(self):
+        if not self.has_data():
+            if not self.field.required:
+                return None
+            # stored values of blank options aren't empty for DataRequired
+            required = [v for v in self.field.validators
+                        if isinstance(v, DataRequired)]
+            return self.field.message or required[0].message
+        for validator in self.field.validators:
+            try:
+                validator(self)
+            except ValueError as e:
+                return self.field.message or str(e)
+        return None
+
+
+class RecordModel(QAbstractTableModel):
+    """Table model showing a list of records, one per row, with a column for
+    each field.
+
+    Fields describe the columns, their name is the attribute read from each
+    record(or key if records are dicts) and their text is used as header.
+    Values are formatted according to field's type, the options of select
+    fields show their text and boolean fields are shown as check boxes.
+    No widget is created per row or cell, use :class:`FieldDelegate` to edit
+    the values.
+
+    Cells rejected by validation keep an error message, shown as tooltip on
+    a highlighted background, see :func:`set_error`.
+
+    :param records: records to show, the list is used as is, notify the model
+                    if it's modified from outside, ``beginInsertRows`` for
+                    instance
+    :type records: :class:`list`
+
+    :param fields: fields describing the columns
+    :type fields: iterable of :class:`~campos.core.Field`
+
+    :param parent: parent object
+    :type parent: ``QObject``
+    """
+
+    #: Background of cells with errors.
+    ERROR_COLOR = QColor(255, 200, 200)
+
+    def __init__(self, records, fields, parent=None):
+        super(RecordModel, self).__init__(parent)
+        self.records = records
+        self.fields = list(fields)
+        self._errors = {}  # (row, column) --> message
+        self._texts = {}  # column --> {value: text} for select fields
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.records)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.fields)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.fields[section].text
+        return section + 1
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        field = self.fields[index.column()]
+        if isinstance(field, BoolField):
+            return flags | Qt.ItemIsUserCheckable
+        if not isinstance(field, BinaryField):
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        row, column = index.row(), index.column()
+        field = self.fields[column]
+
+        if role == Qt.DisplayRole:
+            if isinstance(field, BoolField):
+                return None
+            return self.display(column, self.value(row, column))
+
+        if role == Qt.EditRole:
+            return self.value(row, column)
+
+        if role == Qt.CheckStateRole and isinstance(field, BoolField):
+            checked = self.value(row, column)
+            return Qt.Checked if checked else Qt.Unchecked
+
+        if role == Qt.ToolTipRole:
+            return self._errors.get((row, column))
+
+        if role == Qt.BackgroundRole and (row, column) in self._errors:
+            return self.ERROR_COLOR
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid():
+            return False
+
+        if role == Qt.CheckStateRole:
+            value = _int(value) == _int(Qt.Checked)
+        elif role != Qt.EditRole:
+            return False
+
+        row, column = index.row(), index.column()
+        try:
+            self.store(row, column, value)
+        except ValueError as e:
+            self.set_error(index, str(e))
+            return False
+
+        self._errors.pop((row, column), None)
+        self.dataChanged.emit(index, index)
+        return True
+
+    def store(self, row, column, value):
+        """Writes the value of a cell, called by ``setData()``. Subclasses
+        storing values elsewhere can override it.
+
+        :param row: index of the record
+        :type row: :class:`int`
+
+        :param column: index of the field
+        :type column: :class:`int`
+
+        :param value: new value
+
+        :raises ValueError: if the value can't be stored, the cell is marked
+                            with the error
+        """
+        _set(self.records[row], self.fields[column].name, value)
+
+    def store_column(self, column, values):
+        """Writes several values of a column at once, called when pasting. By
+        default each value is written using :func:`store`.
+
+        :param column: index of the field
+        :type column: :class:`int`
+
+        :param values: tuples ``(row, value)``
+        :type values: :class:`list`
+
+        :return: dict like d[row] = error message for values not stored
+        :rtype: :class:`dict`
+        """
+        errors = {}
+        for row, value in values:
+            try:
+                self.store(row, column, value)
+            except ValueError as e:
+                errors[row] = str(e)
+        return errors
+
+    def paste(self, index, rows):
+        """Pastes a block of cells starting at an index, as copied from a
+        spreadsheet. Cells outside the model are ignored.
+
+        The block is processed column by column: texts are converted using
+        :func:`text_converter` and checked with column field's validators,
+        without touching the field widget. Valid values are stored using
+        :func:`store_column` and invalid ones are left unchanged and marked
+        with the error. ``dataChanged`` is emitted once for the whole block.
+
+        :param index: index of the top left cell
+        :type index: ``QModelIndex``
+
+        :param rows: tab separated text or rows of texts, see
+                     :func:`parse_table`
+        :type rows: :class:`str` or :class:`list`
+
+        :return: dict like d[(row, column)] = error message for rejected cells
+        :rtype: :class:`dict`
+        """
+        if isinstance(rows, str):
+            rows = parse_table(rows)
+
+        top, left = index.row(), index.column()
+        height = min(len(rows), self.rowCount() - top)
+        width = min(max((len(r) for r in rows), default=0),
+                    self.columnCount() - left)
+        if height <= 0 or width <= 0:
+            return {}
+
+        errors = {}
+        for column in range(left, left + width):
+            flags = self.flags(self.index(top, column))
+            if not flags & (Qt.ItemIsEditable | Qt.ItemIsUserCheckable):
+                continue
+
+            field = self.fields[column]
+            convert, cell = text_converter(field), _Cell(field)
+
+            values = []
+            for row in range(top, top + height):
+                cells = rows[row - top]
+                if column - left >= len(cells):
+                    continue  # short rows leave cells unchanged
+
+                try:
+                    _, value = convert(cells[column - left])
+                    cell.value = value
+                    message = cell.error()
+                except ValueError as e:
+                    message = str(e)
+
+                if message is None:
+                    values.append((row, value))
+                else:
+                    errors[row, column] = message
+
+            failed = self.store_column(column, values) if values else {}
+            for row, _ in values:
+                if row in failed:
+                    errors[row, column] = failed[row]
+                else:
+                    self._errors.pop((row, column), None)
+
+        self._errors.update(errors)
+        self.dataChanged.emit(self.index(top, left),
+                              self.index(top + height - 1, left + width - 1))
+        return errors
+
+    def value(self, row, column):
+        """Reads the value of a cell.
+
+        :param row: index of the record
+        :type row: :class:`int`
+
+        :param column: index of the field
+        :type column: :class:`int`
+        """
+        return _get(self.records[row], self.fields[column].name)
+
+    def display(self, column, value):
+        """Formats a value of a column to be shown.
+
+        :param column: index of the field
+        :type column: :class:`int`
+
+        :param value: a value of the column
+
+        :rtype: :class:`str`
+        """
+        if value is None:
+            return ''
+
+        field = self.fields[column]
+        if isinstance(field, SelectField):
+            texts = self._texts.setdefault(column, {})
+            if value not in texts:
+                texts.update((v, t) for t, v in field.choices)
+            if value not in texts and isinstance(field, PagedSelectField) \
+                    and callable(field._lookup):
+                texts[value] = field._lookup(value)
+            return texts.get(value, str(value))
+
+        if isinstance(value, (dt.date, dt.time)):
+            return value.isoformat(sep=' ') if isinstance(value, dt.datetime) \
+                else value.isoformat()
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return '{} bytes'.format(len(value))
+        return str(value)
+
+    def record(self, row):
+        """Obtains the record shown in a row.
+
+        :param row: index of the row
+        :type row: :class:`int`
+        """
+        return self.records[row]
+
+    def column(self, name):
+        """Finds the column of a field.
+
+        :param name: name of the field
+        :type name: :class:`str`
+
+        :rtype: :class:`int`
+
+        :raises ValueError: if no field has the given name
+        """
+        for i, field in enumerate(self.fields):
+            if field.name == name:
+                return i
+        raise ValueError('No field named {}'.format(name))
+
+    def error(self, index):
+        """Obtains the error message of a cell.
+
+        :param index: index of the cell
+        :type index: ``QModelIndex``
+
+        :return: the message or ``None`` if the cell has no error
+        :rtype: :class:`str`
+        """
+        return self._errors.get((index.row(), index.column()))
+
+    def set_error(self, index, message):
+        """Marks a cell as invalid, the mark is removed when a new value is set.
+
+        :param index: index of the cell
+        :type index: ``QModelIndex``
+
+        :param message: error message, ``None`` removes the mark
+        :type message: :class:`str`
+        """
+        key = index.row(), index.column()
+        if message is None:
+            self._errors.pop(key, None)
+        else:
+            self._errors[key] = message
+        self.dataChanged.emit(index, index)
+
+
+def _error_message(field):
+    label = getattr(field, 'error_label', None)
+    if label is not None and label.text():
+        return label.text()
+    if field.errors:
+        return str(field.errors[0])
+    return field.message or 'Invalid value'
+
+
+class FieldDelegate(QStyledItemDelegate):
+    """Edits cells of a :class:`RecordModel` using its fields as editors.
+
+    Only the cell being edited needs an editor, so a single field per column
+    is used and reused for every row, it's never destroyed. Values are
+    validated using field's validators before being stored, invalid values
+    are rejected and their cell is marked with the error, see
+    :func:`RecordModel.set_error`.
+
+    :param fields: a field per column, fields must not be used in forms
+    :type fields: iterable of :class:`~campos.core.Field`
+
+    :param parent: parent object
+    :type parent: ``QObject``
+    """
+
+    def __init__(self, fields, parent=None):
+        super(FieldDelegate, self).__init__(parent)
+        self.fields = list(fields)
+
+    def createEditor(self, parent, option, index):
+        field = self.fields[index.column()]
+        field.setParent(parent)
+
+        # only the main component is shown inside the cell
+        for label in (getattr(field, 'label', None),
+                      getattr(field, 'error_label', None)):
+            if label is not None:
+                label.hide()
+
+        component = getattr(field, 'main_component', None)
+        if component is not None and component is not field and \
+                hasattr(component, 'setFocus'):
+            field.setFocusProxy(component)
+
+        field.setAutoFillBackground(True)
+        field.show()
+        return field
+
+    def destroyEditor(self, editor, index):
+        # editors are reused, they are just hidden
+        editor.hide()
+
+    def setEditorData(self, editor, index):
+        value = index.data(Qt.EditRole)
+        try:
+            set_field_data(editor, value)
+        except (ValueError, TypeError):
+            editor.value = editor.default
+
+    def setModelData(self, editor, model, index):
+        editor.validate()
+        if not editor.valid:
+            model.set_error(index, _error_message(editor))
+            return
+        model.setData(index, field_data(editor), Qt.EditRole)
+
+    def updateEditorGeometry(self, editor, option, index):
+        editor.setGeometry(option.rect)
+
+
+class RecordGrid(QTableView):
+    """Table view to edit a list of records, using a :class:`RecordModel` and
+    a :class:`FieldDelegate`.
+
+    Fields can be given or obtained from a field source, see
+    :func:`from_source`. Large lists are supported since widgets are only
+    created for visible cells being edited::
+
+        grid = RecordGrid.from_source(people)
+        grid.show()
+
+    Other record models can be shown too, a delegate using model's fields is
+    installed by ``setModel()``::
+
+        grid = RecordGrid()
+        grid.setModel(model)
+
+    :param records: records to show, if ``None`` no model is set
+    :type records: :class:`list`
+
+    :param fields: fields describing the columns, they are used as editors so
+                   they must not be used in forms
+    :type fields: iterable of :class:`~campos.core.Field`
+
+    :param parent: parent widget
+    :type parent: ``QWidget``
+    """
+
+    def __init__(self, records=None, fields=(), parent=None):
+        super(RecordGrid, self).__init__(parent)
+        self.setEditTriggers(QTableView.DoubleClicked |
+                             QTableView.EditKeyPressed |
+                             QTableView.AnyKeyPressed)
+
+        if records is not None:
+            self.setModel(RecordModel(records, fields, self))
+
+    def paste(self):
+        """Pastes clipboard's text at the current cell, see
+        :func:`RecordModel.paste`. Called when the paste shortcut is pressed.
+
+        :return: dict like d[(row, column)] = error message for rejected cells
+        :rtype: :class:`dict`
+        """
+        index, model = self.currentIndex(), self.model()
+        if not index.isValid() or not isinstance(model, RecordModel):
+            return {}
+
+        selected = self.selectedIndexes()
+        if selected:
+            top = min(i.row() for i in selected)
+            left = min(i.column() for i in selected)
+            index = model.index(top, left)
+        return model.paste(index, QApplication.clipboard().text())
+
+    def keyPressEvent(self, event):
+        if event.matches(QKeySequence.Paste) and \
+                self.state() != QTableView.EditingState:
+            self.paste()
+            event.accept()
+        else:
+            super(RecordGrid, self).keyPressEvent(event)
+
+    def setModel(self, model):
+        super(RecordGrid, self).setModel(model)
+        if isinstance(model, RecordModel):
+            self.setItemDelegate(FieldDelegate(model.fields, self))
+
+    @staticmethod
+    def from_source(records, obj=None, source_kw={}):
+        """Creates a grid whose columns are the fields extracted from an
+        object.
+
+        :param records: records to show
+        :type records: :class:`list`
+
+        :param obj: object to extract fields from, defaults to the first record
+        :type obj: any
+
+        :param source_kw: keyword arguments to pass to
+                          :class:`~campos.sources.FieldSource` constructor
+        :type source_kw: :class:`dict`
+
+        :rtype: :class:`RecordGrid`
+
+        :raises ValueError: if there are no records and no object is given
+        """
+        if obj is None:
+            if not records:
+                raise ValueError('An object is needed to obtain fields')
+            obj = records[0]
+
+        source = sources.get_fields_source(obj, **source_kw)
+        return RecordGrid(records, source.fields.values())
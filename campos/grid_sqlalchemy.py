@@ -0,0 +1,255 @@
+import contextlib
+
+from qtpy.QtCore import Qt, QModelIndex
+
+from .grid import RecordModel
+from .sources.sqlalchemy import (SQLAlchemySource, update_row, _execute,
+                                 _connection)
+
+__author__ = 'Juan Manuel Bermúdez Cabrera'
+
+
+@contextlib.contextmanager
+def _savepoint(bind):
+    # a failed statement inside a session or connection transaction aborts
+    # it on some databases(PostgreSQL), rolling back to a savepoint keeps it
+    # usable
+    with _connection(bind) as connection:
+        with connection.begin_nested():
+            yield connection
+
+
+class SQLAlchemyTableModel(RecordModel):
+    """Table model showing the rows of a table or query without loading them
+    all, rows are fetched in windows as the view scrolls(``canFetchMore()``
+    and ``fetchMore()``).
+
+    Sorting and filtering are done by the database, ``sort()`` and
+    :func:`set_filter` change the ORDER BY and WHERE clauses of the query and
+    start fetching again from the first row. Row counts are cached for every
+    filter used, call :func:`refresh` if the table is modified elsewhere::
+
+        model = SQLAlchemyTableModel(engine, User)
+        model.set_filter(User.__table__.c.age >= 18)
+
+        grid = RecordGrid()
+        grid.setModel(model)
+        grid.setSortingEnabled(True)
+
+    Columns and their editors are fields created by a
+    :class:`~campos.sources.sqlalchemy.SQLAlchemySource`. Cells are editable
+    when the rows come from a table with a single column primary key, each
+    change is written using :func:`~campos.sources.sqlalchemy.update_row`,
+    rows of arbitrary queries are read-only.
+
+    .. note:: windows are read using OFFSET, a primary key is appended to the
+              ORDER BY clause so pages are stable.
+
+    :param bind: object used to execute queries
+    :type bind: :class:`~sqlalchemy.engine.Engine`,
+                :class:`~sqlalchemy.engine.Connection` or
+                :class:`~sqlalchemy.orm.Session`
+
+    :param selectable: a table, a declarative class or a select statement
+    :type selectable: :class:`~sqlalchemy.schema.Table`, declarative class or
+                      :class:`~sqlalchemy.sql.expression.Select`
+
+    :param fields: fields describing the columns, by default they are created
+                   by a :class:`~campos.sources.sqlalchemy.SQLAlchemySource`
+                   for `selectable`
+    :type fields: iterable of :class:`~campos.core.Field`
+
+    :param window: amount of rows fetched at once, defaults to 200
+    :type window: :class:`int`
+
+    :param source_kw: keyword arguments to pass to
+                      :class:`~campos.sources.sqlalchemy.SQLAlchemySource`
+    :type source_kw: :class:`dict`
+
+    :param parent: parent object
+    :type parent: ``QObject``
+    """
+
+    def __init__(self, bind, selectable, fields=None, window=200,
+                 source_kw=None, parent=None):
+        from sqlalchemy.sql import Select
+
+        selectable = getattr(selectable, '__table__', selectable)
+        if isinstance(selectable, Select):
+            self.table = None
+            self.selectable = selectable.subquery()
+        else:
+            self.table = selectable
+            self.selectable = selectable
+
+        if fields is None:
+            kwargs = dict(source_kw or {})
+            kwargs.setdefault('bind', bind)
+            fields = SQLAlchemySource(self.selectable, **kwargs).fields.values()
+
+        super(SQLAlchemyTableModel, self).__init__([], fields, parent)
+        self.bind = bind
+        self.window = window
+
+        pk = self.table.primary_key.columns.values() if self.table is not None \
+            else []
+        self._key = pk[0].name if len(pk) == 1 else None
+
+        self._where = None
+        self._order = None  # (column name, descending)
+        self._counts = {}  # filter --> amount of rows
+        self._exhausted = False
+
+    @property
+    def editable(self):
+        """Whether cells can be edited, see :class:`SQLAlchemyTableModel`.
+
+        :type: :class:`bool`
+        """
+        return self._key is not None
+
+    @property
+    def total(self):
+        """Amount of rows matching the current filter, including those not
+        fetched yet. It's counted once per filter.
+
+        :type: :class:`int`
+        """
+        key = self._filter_key()
+        if key not in self._counts:
+            from sqlalchemy import select, func
+
+            query = select(func.count()).select_from(self.selectable)
+            if self._where is not None:
+                query = query.where(self._where)
+            self._counts[key] = _execute(self.bind, query)[0][0]
+        return self._counts[key]
+
+    def flags(self, index):
+        flags = super(SQLAlchemyTableModel, self).flags(index)
+        if not self.editable:
+            flags &= ~(Qt.ItemIsEditable | Qt.ItemIsUserCheckable)
+        return flags
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._exhausted:
+            return False
+        return len(self.records) < self.total
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+
+        offset = len(self.records)
+        query = self.statement().offset(offset).limit(self.window)
+        rows = [dict(row._mapping) for row in _execute(self.bind, query)]
+
+        # rows deleted since they were counted
+        self._exhausted = len(rows) < self.window and \
+            offset + len(rows) < self.total
+
+        if rows:
+            self.beginInsertRows(QModelIndex(), offset, offset + len(rows) - 1)
+            self.records.extend(rows)
+            self.endInsertRows()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        if 0 <= column < len(self.fields):
+            self._order = self.fields[column].name, order == Qt.DescendingOrder
+        else:
+            self._order = None
+        self._restart()
+
+    def set_filter(self, condition=None):
+        """Shows only the rows matching a condition, fetching starts again from
+        the first row.
+
+        :param condition: a WHERE clause on the columns of the selectable,
+                          ``None`` shows all the rows
+        :type condition: :class:`~sqlalchemy.sql.expression.ColumnElement`
+        """
+        self._where = condition
+        self._restart()
+
+    def refresh(self):
+        """Forgets fetched rows and cached counts, fetching starts again from
+        the first row.
+        """
+        self._counts.clear()
+        self._restart()
+
+    def statement(self):
+        """Builds the query of the current filter and order, without windows.
+
+        :rtype: :class:`~sqlalchemy.sql.expression.Select`
+        """
+        from sqlalchemy import select
+
+        columns = self.selectable.c
+        query = select(self.selectable)
+        if self._where is not None:
+            query = query.where(self._where)
+
+        order = []
+        if self._order is not None:
+            name, descending = self._order
+            order.append(columns[name].desc() if descending
+                         else columns[name].asc())
+        if self._key is not None:
+            order.append(columns[self._key])
+        return query.order_by(*order)
+
+    def store(self, row, column, value):
+        from sqlalchemy.exc import SQLAlchemyError
+
+        if not self.editable:
+            raise ValueError('Rows of queries are read-only')
+
+        record, name = self.records[row], self.fields[column].name
+        try:
+            with _savepoint(self.bind) as connection:
+                update_row(connection, self.table, record[self._key],
+                           {name: value})
+        except SQLAlchemyError as e:
+            raise ValueError(str(getattr(e, 'orig', None) or e))
+        record[name] = value
+
+    def store_column(self, column, values):
+        from sqlalchemy import update, bindparam
+        from sqlalchemy.exc import SQLAlchemyError
+
+        if not self.editable:
+            return {row: 'Rows of queries are read-only' for row, _ in values}
+
+        # a single statement executed with every value(executemany)
+        name = self.fields[column].name
+        pk = self.table.columns[self._key]
+        query = update(self.table).where(pk == bindparam('b_key'))
+        query = query.values({name: bindparam('b_value')})
+        params = [{'b_key': self.records[row][self._key], 'b_value': value}
+                  for row, value in values]
+        try:
+            with _savepoint(self.bind) as connection:
+                connection.execute(query, params)
+        except SQLAlchemyError:
+            # some value was rejected and the savepoint rolled back, store
+            # them one by one to find it
+            return super(SQLAlchemyTableModel, self).store_column(column,
+                                                                  values)
+
+        for row, value in values:
+            self.records[row][name] = value
+        return {}
+
+    def _filter_key(self):
+        if self._where is None:
+            return None
+        compiled = self._where.compile()
+        return str(compiled), repr(sorted(compiled.params.items()))
+
+    def _restart(self):
+        self.beginResetModel()
+        self.records = []
+        self._errors.clear()
+        self._exhausted = False
+        self.endResetModel()
@@ -0,0 +1,367 @@
+from functools import partial
+from collections import OrderedDict
+
+from .bindings import field_data, set_field_data, RowBinding
+from .validators import DataRequired
+
+__author__ = 'Juan Manuel Bermúdez Cabrera'
+
+
+class FieldState(object):
+    """State of a field without any widget: its value, default value,
+    validation errors and whether it changed since it was loaded.
+
+    Instances are small(``__slots__``) and validators can be called with them
+    just like with fields, they only need ``value`` and :func:`has_data`.
+    Values are kept as they are stored, see
+    :func:`~campos.bindings.field_data`.
+
+    :param name: name of the field
+    :type name: :class:`str`
+
+    :param default: default value
+    :type default: any
+
+    :param validators: validators to check the value with
+    :type validators: :class:`list`
+
+    :param message: message to show instead of validators' ones
+    :type message: :class:`str`
+    """
+
+    __slots__ = ('name', 'value', 'default', 'initial', 'errors', 'validators',
+                 'message')
+
+    def __init__(self, name, default=None, validators=(), message=None):
+        self.name = name
+        self.default = default
+        self.value = default
+        self.initial = default
+        self.errors = []
+        self.validators = list(validators)
+        self.message = message
+
+    def __repr__(self):
+        return 'FieldState({!r}, value={!r})'.format(self.name, self.value)
+
+    @staticmethod
+    def from_field(field):
+        """Creates a state holding field's current value, validators and
+        message.
+
+        :param field: field to copy
+        :type field: :class:`~campos.core.Field`
+
+        :rtype: :class:`FieldState`
+        """
+        state = FieldState(field.name, validators=field.validators,
+                           message=field.message)
+        state.default = state.value = state.initial = field_data(field)
+        return state
+
+    @property
+    def dirty(self):
+        """Whether the value changed since it was loaded, see
+        :func:`FormModel.load`.
+
+        :type: :class:`bool`
+        """
+        return self.value != self.initial
+
+    @property
+    def required(self):
+        """Whether a value must be given.
+
+        :type: :class:`bool`
+        """
+        return any(isinstance(v, DataRequired) for v in self.validators)
+
+    @property
+    def valid(self):
+        """Whether the last validation found no errors.
+
+        :type: :class:`bool`
+        """
+        return not self.errors
+
+    def has_data(self):
+        """Checks if there is a value.
+
+        :rtype: :class:`bool`
+        """
+        return self.value not in (None, '')
+
+    def validate(self):
+        """Validates the value, errors are kept in :attr:`errors` as
+        :class:`ValueError` objects.
+
+        :return: if the value is valid or not
+        :rtype: :class:`bool`
+        """
+        self.errors = []
+        if self.required or self.has_data():
+            for validator in self.validators:
+                try:
+                    validator(self)
+                except ValueError as e:
+                    self.errors.append(ValueError(self.message) if self.message
+                                       else e)
+        return not self.errors
+
+
+class FormModel(object):
+    """Values of a form kept in python objects, independent of widgets.
+
+    Reading, validating and serializing values never touches Qt, forms are
+    views which show the model and update it, several forms can be attached
+    to the same model and they are kept in sync::
+
+        model = FormModel.from_form(form)
+        model.attach(other_form)
+
+        model.load(user)
+        if model.validate():
+            model.store(user, changed_only=True)
+
+    Values can be read and written like in a dict, ``model['name']``. Other
+    objects can follow changes using :func:`subscribe`.
+
+    :param states: states of the fields
+    :type states: iterable of :class:`FieldState`
+    """
+
+    def __init__(self, states=()):
+        self.states = OrderedDict((s.name, s) for s in states)
+        self._listeners = []
+        self._views = {}  # form --> {field name: (field, slot)}
+        self._syncing = False
+
+    def __contains__(self, name):
+        return name in self.states
+
+    def __iter__(self):
+        return iter(self.states)
+
+    def __len__(self):
+        return len(self.states)
+
+    def __getitem__(self, name):
+        return self.states[name].value
+
+    def __setitem__(self, name, value):
+        self.set(name, value)
+
+    @staticmethod
+    def from_form(form, attach=True):
+        """Creates a model with a state for each field of a form.
+
+        :param form: form to copy
+        :type form: :class:`~campos.forms.Form`
+
+        :param attach: whether to attach the form to the model, defaults to
+                       True
+        :type attach: :class:`bool`
+
+        :rtype: :class:`FormModel`
+        """
+        model = FormModel(FieldState.from_field(f) for f in form.fields)
+        if attach:
+            model.attach(form)
+        return model
+
+    def get(self, name, default=None):
+        """Obtains the value of a field.
+
+        :param name: name of the field
+        :type name: :class:`str`
+
+        :param default: value returned if there is no such field
+        """
+        state = self.states.get(name)
+        return default if state is None else state.value
+
+    def set(self, name, value, origin=None):
+        """Changes the value of a field, attached forms and subscribers are
+        notified if the value changes.
+
+        :param name: name of the field
+        :type name: :class:`str`
+
+        :param value: new value, as it's stored
+
+        :param origin: object causing the change, it isn't notified
+
+        :raises KeyError: if there is no such field
+        """
+        state = self.states[name]
+        if state.value == value and type(state.value) is type(value):
+            return
+        state.value = value
+        self._notify(name, value, origin)
+
+    def update(self, values, origin=None):
+        """Changes several values, see :func:`set`.
+
+        :param values: a dict like d[field_name] = value, names without field
+                       are ignored
+        :type values: :class:`dict`
+
+        :param origin: object causing the change, it isn't notified
+        """
+        for name, value in values.items():
+            if name in self.states:
+                self.set(name, value, origin)
+
+    def load(self, obj):
+        """Shows the values of an object, they become the initial values so no
+        field is dirty afterwards.
+
+        :param obj: an object, a dict or a
+                    :class:`~campos.bindings.RowBinding`
+        """
+        for name, state in self.states.items():
+            if isinstance(obj, dict):
+                value = obj.get(name, state.default)
+            elif isinstance(obj, RowBinding):
+                value = obj.get(name) if name in obj else state.default
+            else:
+                value = getattr(obj, name, state.default)
+            state.initial = value
+            self.set(name, value)
+            state.errors = []
+
+    def reset(self):
+        """Restores default values, they become the initial values."""
+        for state in self.states.values():
+            state.initial = state.default
+            self.set(state.name, state.default)
+            state.errors = []
+
+    def data(self, changed_only=False):
+        """Obtains the values of the fields, ready to be stored.
+
+        :param changed_only: whether to include only dirty fields
+        :type changed_only: :class:`bool`
+
+        :return: a dict like d[field_name] = value
+        :rtype: :class:`~collections.OrderedDict`
+        """
+        return OrderedDict((n, s.value) for n, s in self.states.items()
+                           if s.dirty or not changed_only)
+
+    def changed(self):
+        """Obtains the states of dirty fields.
+
+        :rtype: :class:`list` of :class:`FieldState`
+        """
+        return [s for s in self.states.values() if s.dirty]
+
+    def store(self, obj, changed_only=False):
+        """Writes the values into an object, they become the initial values.
+
+        :param obj: an object, a dict or a
+                    :class:`~campos.bindings.RowBinding`
+
+        :param changed_only: whether to write only dirty fields
+        :type changed_only: :class:`bool`
+
+        :return: the values written, a dict like d[field_name] = value
+        :rtype: :class:`~collections.OrderedDict`
+        """
+        values = self.data(changed_only)
+        for name, value in values.items():
+            if isinstance(obj, dict):
+                obj[name] = value
+            elif isinstance(obj, RowBinding):
+                obj.set(name, value)
+            else:
+                setattr(obj, name, value)
+            self.states[name].initial = value
+        return values
+
+    def validate(self):
+        """Validates every field.
+
+        :return: if all values are valid
+        :rtype: :class:`bool`
+        """
+        valid = True
+        for state in self.states.values():
+            valid = state.validate() and valid
+        return valid
+
+    @property
+    def errors(self):
+        """Errors found by the last validation.
+
+        :type: :class:`dict` like d[field_name] = list of errors
+        """
+        return {n: s.errors for n, s in self.states.items() if s.errors}
+
+    def subscribe(self, callback):
+        """Calls a function every time a value changes.
+
+        :param callback: called as ``callback(name, value)``
+        :type callback: callable
+        """
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        """Stops calling a function subscribed with :func:`subscribe`.
+
+        :param callback: a subscribed function
+        :type callback: callable
+        """
+        self._listeners.remove(callback)
+
+    def attach(self, form):
+        """Makes a form a view of this model: fields show model's values and
+        changes made in the form are written to the model. Fields without
+        state are ignored.
+
+        :param form: form to attach
+        :type form: :class:`~campos.forms.Form`
+        """
+        if form in self._views:
+            return
+
+        fields = {}
+        for field in form.fields:
+            if field.name in self.states:
+                slot = partial(self._field_changed, form, field)
+                field.change_signal.connect(slot)
+                fields[field.name] = field, slot
+        self._views[form] = fields
+
+        with form.batch():
+            for name, (field, _) in fields.items():
+                self._show(field, self.states[name].value)
+
+    def detach(self, form):
+        """Stops using a form as view, nothing happens if it isn't attached.
+
+        :param form: an attached form
+        :type form: :class:`~campos.forms.Form`
+        """
+        for field, slot in self._views.pop(form, {}).values():
+            field.change_signal.disconnect(slot)
+
+    def _show(self, field, value):
+        self._syncing = True
+        try:
+            set_field_data(field, value)
+        finally:
+            self._syncing = False
+
+    def _field_changed(self, form, field, *args):
+        if not self._syncing:
+            self.set(field.name, field_data(field), origin=form)
+
+    def _notify(self, name, value, origin):
+        for form, fields in self._views.items():
+            if form is not origin and name in fields:
+                self._show(fields[name][0], value)
+
+        for callback in tuple(self._listeners):
+            if callback is not origin:
+                callback(name, value)
@@ -0,0 +1,341 @@
+import queue
+import threading
+from collections import deque
+
+from qtpy.QtCore import QObject, Signal
+
+__author__ = 'Juan Manuel Bermúdez Cabrera'
+
+_END = object()
+
+
+class Prefetcher(object):
+    """Reads items of an iterable in a worker thread, keeping a few of them
+    ready to be taken.
+
+    The worker blocks when `size` items are waiting, so memory usage doesn't
+    depend on the length of the iterable. Errors raised by the iterable are
+    raised again by :func:`take`.
+
+    :param iterable: items to read, it's iterated in the worker thread only
+    :type iterable: iterable
+
+    :param size: maximum amount of items read in advance
+    :type size: :class:`int`
+    """
+
+    def __init__(self, iterable, size=5):
+        self._queue = queue.Queue(maxsize=max(size, 1))
+        self._stop = threading.Event()
+        self._done = False
+
+        self._thread = threading.Thread(target=self._run, args=(iterable,),
+                                        name='campos-prefetch', daemon=True)
+        self._thread.start()
+
+    def take(self):
+        """Takes the next item, waiting for it if it isn't ready yet.
+
+        :return: the next item
+
+        :raises StopIteration: if there are no more items
+        """
+        if self._done:
+            raise StopIteration
+        item = self._queue.get()
+        if item is _END:
+            self._done = True
+            raise StopIteration
+        if isinstance(item, _Failure):
+            self._done = True
+            raise item.error
+        return item
+
+    def close(self):
+        """Stops reading items and releases the iterable."""
+        self._stop.set()
+        self._done = True
+        while self._thread.is_alive():
+            # unblock the worker if it's waiting for free space
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                pass
+            self._thread.join(0.01)
+
+    def _put(self, item):
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.05)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _run(self, iterable):
+        iterator = iter(iterable)
+        try:
+            for item in iterator:
+                if not self._put(item):
+                    return
+            self._put(_END)
+        except Exception as e:
+            self._put(_Failure(e))
+        finally:
+            # generators release their resources, cursors for instance
+            close = getattr(iterator, 'close', None)
+            if close is not None:
+                close()
+
+
+class _Failure(object):
+    __slots__ = ('error',)
+
+    def __init__(self, error):
+        self.error = error
+
+
+class Navigator(QObject):
+    """Moves an :class:`~campos.forms.EditionForm` through a sequence of
+    records, one at a time, with first, previous, next and last operations.
+
+    Records are read in a worker thread which keeps `prefetch` of them ready,
+    so moving to the next record doesn't wait for them to be loaded. Only the
+    last `history` visited records are kept in memory to move back, so
+    browsing a big table uses constant memory::
+
+        navigator = Navigator.from_select(form, engine, select(person))
+
+        form.add_button('previous', on_click=navigator.previous)
+        form.add_button('next', on_click=navigator.next)
+        navigator.first()
+
+    `records` can be any iterable, or a callable returning a new iterable.
+    If a callable is given it's used to start again when moving before the
+    oldest record in memory, otherwise that's not possible. The iterable is
+    iterated in the worker thread, so it must not share resources with the
+    GUI thread, :func:`from_select` creates a suitable one for SQL queries.
+
+    Fields are filled using :func:`~campos.forms.EditionForm.edit`, which
+    validates the form once per record.
+
+    :param form: form to fill with records
+    :type form: :class:`~campos.forms.EditionForm`
+
+    :param records: records to navigate through or a callable returning them
+    :type records: iterable or callable
+
+    :param prefetch: amount of records read in advance, defaults to 5
+    :type prefetch: :class:`int`
+
+    :param history: amount of visited records kept to move back, defaults to
+                    100
+    :type history: :class:`int`
+
+    :param disabled: names of the fields to disable, see
+                     :func:`~campos.forms.EditionForm.edit`
+    :type disabled: iterable of :class:`str`
+    """
+
+    #: Emitted with the new position after moving to another record.
+    moved = Signal(int)
+
+    def __init__(self, form, records, prefetch=5, history=100, disabled=()):
+        super(Navigator, self).__init__(form)
+        self.form = form
+        self.prefetch = prefetch
+        self.disabled = tuple(disabled)
+
+        self._factory = records if callable(records) else None
+        self._records = None if callable(records) else records
+        self._history = deque(maxlen=max(history, 1))
+        self._index = -1  # current record in history
+        self._start = 0  # position of the oldest record in history
+        self._prefetcher = None
+        self._exhausted = False
+
+        form.destroyed.connect(self.close)
+
+    @staticmethod
+    def from_select(form, bind, statement, batch_size=1000, **kwargs):
+        """Creates a navigator through the rows of a SQLAlchemy query.
+
+        Rows are streamed using a connection owned by the worker thread,
+        `batch_size` rows are fetched at once(``yield_per``), and the query is
+        executed again when starting over. Rows provide columns as attributes
+        so they fill forms like ORM instances, use
+        :func:`~campos.sources.sqlalchemy.update_row` to save changes.
+
+        :param form: form to fill with rows
+        :type form: :class:`~campos.forms.EditionForm`
+
+        :param bind: an engine, or a connection or session whose engine is
+                     used
+        :type bind: :class:`~sqlalchemy.engine.Engine`,
+                    :class:`~sqlalchemy.engine.Connection` or
+                    :class:`~sqlalchemy.orm.Session`
+
+        :param statement: a select statement, include an ORDER BY clause for
+                          a stable order
+        :type statement: :class:`~sqlalchemy.sql.expression.Select`
+
+        :param batch_size: amount of rows fetched at once
+        :type batch_size: :class:`int`
+
+        :param kwargs: keyword arguments to pass to :class:`Navigator`
+
+        :rtype: :class:`Navigator`
+        """
+        from sqlalchemy.orm import Session
+
+        engine = bind.get_bind() if isinstance(bind, Session) else bind.engine
+
+        def rows():
+            with engine.connect() as connection:
+                options = connection.execution_options(yield_per=batch_size)
+                yield from options.execute(statement)
+
+        return Navigator(form, rows, **kwargs)
+
+    @property
+    def position(self):
+        """Position of the current record, -1 before moving to any record.
+
+        :type: :class:`int`
+        """
+        if self._index < 0:
+            return -1
+        return self._start + self._index
+
+    @property
+    def current(self):
+        """The record shown by the form, ``None`` before moving to any record.
+        """
+        if self._index < 0:
+            return None
+        return self._history[self._index]
+
+    def first(self):
+        """Moves to the first record.
+
+        :return: False if there are no records
+        :rtype: :class:`bool`
+        """
+        return self.seek(0)
+
+    def previous(self):
+        """Moves to the previous record. Records older than `history` can only
+        be reached starting over, which requires a callable as `records`.
+
+        :return: False if there is no previous record or it can't be reached
+        :rtype: :class:`bool`
+        """
+        if self._index > 0:
+            return self._show(self._index - 1)
+
+        position = self.position
+        if position <= 0 or self._factory is None:
+            return False
+        return self.seek(position - 1)
+
+    def next(self):
+        """Moves to the next record.
+
+        :return: False if there are no more records
+        :rtype: :class:`bool`
+        """
+        if self._index < len(self._history) - 1:
+            return self._show(self._index + 1)
+
+        if not self._read():
+            return False
+        return self._show(len(self._history) - 1)
+
+    def last(self):
+        """Moves to the last record, every remaining record is read to find
+        it but only the last `history` are kept.
+
+        .. warning:: this call blocks the GUI thread until every remaining
+                     record has been read, which can take long for big
+                     result sets. Records can be any iterable, so there is
+                     no way to jump to the end. To show the last row of a
+                     query, navigate a query with reversed order instead.
+
+        :return: False if there are no records
+        :rtype: :class:`bool`
+        """
+        while self._read():
+            pass
+        if not self._history:
+            return False
+        return self._show(len(self._history) - 1)
+
+    def seek(self, position):
+        """Moves to the record at the given position.
+
+        :param position: position of a record
+        :type position: :class:`int`
+
+        :return: False if there is no record at that position or it can't be
+                 reached
+        :rtype: :class:`bool`
+        """
+        if self._start <= position < self._start + len(self._history):
+            return self._show(position - self._start)
+
+        if position < self._start:
+            if self._factory is None:
+                return False
+            self._restart()
+
+        while self._start + len(self._history) <= position:
+            if not self._read():
+                return False
+        return self._show(position - self._start)
+
+    def close(self):
+        """Stops reading records, releasing the worker thread."""
+        if self._prefetcher is not None:
+            self._prefetcher.close()
+            self._prefetcher = None
+
+    def _restart(self):
+        self.close()
+        self._history.clear()
+        self._index = -1
+        self._start = 0
+        self._exhausted = False
+        if self._factory is not None:
+            self._records = self._factory()
+
+    def _read(self):
+        # appends the next record to history
+        if self._exhausted:
+            return False
+
+        if self._prefetcher is None:
+            if self._records is None:
+                if self._factory is None:
+                    return False
+                self._records = self._factory()
+            self._prefetcher = Prefetcher(self._records, self.prefetch)
+            self._records = None
+
+        try:
+            record = self._prefetcher.take()
+        except StopIteration:
+            self._exhausted = True
+            self.close()
+            return False
+
+        if len(self._history) == self._history.maxlen:
+            self._start += 1
+            self._index -= 1
+        self._history.append(record)
+        return True
+
+    def _show(self, index):
+        self._index = index
+        self.form.edit(self._history[index], disabled=self.disabled)
+        self.moved.emit(self.position)
+        return True
@@ -0,0 +1,234 @@
+import datetime as dt
+from collections import OrderedDict
+
+from qtpy.QtCore import Signal
+
+from .bindings import field_data
+from .enums import ButtonType
+from .fields import (IntField, FloatField, StringField, DateField, TimeField,
+                     DatetimeField, SelectField, MultiSelectField)
+from .forms import Form
+from .grid_sqlalchemy import SQLAlchemyTableModel
+from .sources import (from_bool, from_int, from_float, from_str, from_date,
+                      from_time, from_datetime)
+from .sources.sqlalchemy import from_foreign_key, foreign_key_options
+
+__author__ = 'Juan Manuel Bermúdez Cabrera'
+
+
+# limits of Qt's spin boxes and date edits
+_INT_LIMIT = 2 ** 31 - 1
+_FLOAT_LIMIT = 1e15
+_MIN_DATE = dt.date(1752, 9, 14)
+
+
+class SearchForm(Form):
+    """Query by example form, each field of a
+    :class:`~campos.sources.sqlalchemy.SQLAlchemySource` becomes an optional
+    filter and filled filters are compiled into a WHERE
+    clause, see :func:`where`. Searching is done by the database::
+
+        source = SQLAlchemySource(User, bind=engine)
+        search = SearchForm(source)
+
+        grid = RecordGrid()
+        grid.setModel(search.results)
+
+    Filters according to column's type:
+
+    * Numbers, dates and times: a range given by two fields named like the
+      column plus ``_min`` and ``_max``, both bounds are included. Fields
+      show :attr:`ANY_TEXT` while they hold a value one step below the lowest
+      one which can be searched, meaning the bound is not used. Times have no
+      such value, a bound isn't used while it's midnight for ``_min`` fields
+      or the last time of the day for ``_max`` fields, since they don't limit
+      the search.
+    * Strings: rows starting with the given text, or matching it if it
+      contains ``*`` or ``%`` wildcards(LIKE).
+    * Booleans, enums and foreign keys: a
+      :class:`~campos.fields.MultiSelectField`, rows with any of the selected
+      values(IN). Options of foreign keys are fetched in pages.
+
+    Results are shown by a
+    :class:`~campos.grid_sqlalchemy.SQLAlchemyTableModel` whose filter is
+    changed by :func:`search`, so rows are fetched in windows as they are
+    viewed. Searching is done when the 'apply' button, labeled 'Search', is
+    clicked and 'reset' clears all filters.
+
+    :param source: source whose fields are turned into filters
+    :type source: :class:`~campos.sources.sqlalchemy.SQLAlchemySource`
+
+    :param results: model showing the results, by default one over source's
+                    table is created if the source has a `bind`
+    :type results: :class:`~campos.grid_sqlalchemy.SQLAlchemyTableModel`
+
+    :param names: names of the columns to filter by, all by default
+    :type names: iterable of :class:`str`
+
+    :param kwargs: keyword arguments to pass to :class:`~campos.forms.Form`
+    """
+
+    #: Text shown by range fields while they don't limit the search.
+    ANY_TEXT = 'Any'
+
+    #: Emitted with the WHERE clause of each search, ``None`` if no filter is
+    #: used.
+    searched = Signal(object)
+
+    def __init__(self, source, results=None, names=None,
+                 options=('reset', 'apply'), **kwargs):
+        self.source = source
+        self.table = source.table
+
+        names = source.plans if names is None else names
+        self._unset = {}  # range field name --> value meaning no bound
+        self._filters = OrderedDict()  # column name --> (kind, fields)
+        for name in names:
+            search_filter = self._create_filter(name, source.plans[name])
+            if search_filter is not None:
+                self._filters[name] = search_filter
+
+        fields = [f for _, created in self._filters.values() for f in created]
+        super(SearchForm, self).__init__(options=options, fields=fields,
+                                         **kwargs)
+
+        if results is None and source.bind is not None:
+            results = SQLAlchemyTableModel(source.bind, self.table,
+                                           parent=self)
+        self.results = results
+
+        buttons = [o for o in options if isinstance(o, (str, ButtonType))]
+        buttons = {ButtonType.get_member(o) for o in buttons}
+        if ButtonType.APPLY in buttons:
+            self.button('apply').setText('Search')
+            if 'on_apply' not in kwargs:
+                self.button('apply').clicked.connect(self.search)
+        if ButtonType.RESET in buttons and 'on_reset' not in kwargs:
+            self.button('reset').clicked.connect(self.clear)
+
+    def where(self):
+        """Compiles the filters into a WHERE clause, empty filters are
+        ignored.
+
+        :return: a clause or ``None`` if no filter is used
+        :rtype: :class:`~sqlalchemy.sql.expression.ColumnElement`
+        """
+        from sqlalchemy import and_
+
+        conditions = []
+        for name, (kind, fields) in self._filters.items():
+            column = self.table.columns[name]
+
+            if kind == 'range':
+                low, high = fields
+                if low.value != self._unset[low.name]:
+                    conditions.append(column >= low.value)
+                if high.value != self._unset[high.name]:
+                    conditions.append(column <= high.value)
+
+            elif kind == 'text':
+                text = fields[0].value.strip()
+                if '*' in text or '%' in text:
+                    conditions.append(column.like(text.replace('*', '%')))
+                elif text:
+                    # a prefix can use an index on the column
+                    conditions.append(column.startswith(text, autoescape=True))
+
+            else:
+                values = field_data(fields[0])
+                if values:
+                    conditions.append(column.in_(values))
+
+        return and_(*conditions) if conditions else None
+
+    def search(self):
+        """Shows the rows matching the filters in :attr:`results`.
+
+        :return: the WHERE clause used, see :func:`where`
+        :rtype: :class:`~sqlalchemy.sql.expression.ColumnElement`
+        """
+        where = self.where()
+        if self.results is not None:
+            self.results.set_filter(where)
+        self.searched.emit(where)
+        return where
+
+    def clear(self):
+        """Empties all the filters."""
+        with self.batch():
+            for field in self.fields:
+                field.value = field.default
+
+    def _create_filter(self, name, plan):
+        factory = plan.factory
+        text = plan.args[1] if plan.args else plan.kwargs.get('text', name)
+
+        if factory in (from_int, from_float, from_date, from_time,
+                       from_datetime):
+            fields = [self._range_field(factory, plan, name + suffix, label,
+                                        upper)
+                      for suffix, label, upper in (('_min', text, False),
+                                                   ('_max', 'to', True))]
+            return 'range', fields
+
+        if factory is from_str:
+            return 'text', [StringField(name=name, text=text)]
+
+        if factory is from_bool:
+            choices = (('Yes', True), ('No', False))
+            return 'choice', [MultiSelectField(name=name, text=text,
+                                               choices=choices)]
+
+        if factory is SelectField:
+            choices = plan.kwargs.get('choices', ())
+            return 'choice', [MultiSelectField(name=name, text=text,
+                                               choices=choices)]
+
+        if factory is from_foreign_key:
+            column = plan.args[2]
+            fetch, lookup = foreign_key_options(column, self.source.bind,
+                                                plan.kwargs.get('display'))
+            page_size = plan.kwargs.get('page_size', 100)
+            return 'choice', [MultiSelectField(name=name, text=text,
+                                               fetch=fetch, lookup=lookup,
+                                               page_size=page_size)]
+        return None
+
+    def _range_field(self, factory, plan, name, text, upper):
+        low, high = plan.kwargs.get('min'), plan.kwargs.get('max')
+
+        # the widget's minimum is kept one step below the lowest value which
+        # can be searched, it's the sentinel meaning no bound
+        if factory is from_int:
+            low = -_INT_LIMIT + 1 if low is None else low
+            high = _INT_LIMIT if high is None else high
+            field = IntField(name=name, text=text, min=low - 1, max=high)
+        elif factory is from_float:
+            precision = plan.kwargs.get('precision', 2)
+            sentinel = -_FLOAT_LIMIT if low is None else \
+                round(low - 10 ** -precision, precision)
+            high = _FLOAT_LIMIT if high is None else high
+            field = FloatField(name=name, text=text, precision=precision,
+                               min=sentinel, max=high)
+        elif factory is from_date:
+            field = DateField(name=name, text=text,
+                              min=_MIN_DATE - dt.timedelta(days=1))
+        elif factory is from_datetime:
+            lowest = dt.datetime.combine(_MIN_DATE, dt.time.min)
+            field = DatetimeField(name=name, text=text,
+                                  min=lowest - dt.timedelta(seconds=1))
+        elif upper:
+            # no time is below midnight, but every time is below the last one
+            field = TimeField(name=name, text=text)
+            field.default = field.value = field.max
+            self._unset[name] = field.value
+            return field
+        else:
+            # every time is after midnight, it can't limit the search
+            field = TimeField(name=name, text=text)
+
+        field.main_component.setSpecialValueText(self.ANY_TEXT)
+        field.default = field.min
+        field.value = field.min
+        self._unset[name] = field.value
+        return field
@@ -1,5 +1,6 @@
 import abc
 import re
+import sys
 import inspect
 import datetime as dt
 from collections import OrderedDict
@@ -48,9 +49,11 @@ class FieldSource(metaclass=abc.ABCMeta):
       :attr:`SUPPORTED_TYPES`. Subclasses must implement this check accordingly
       since some objects may contain wrapped python types.
 
-    Fields are created after this filtering process, this is done by calling an
-    utility function designed for each supported python type.
-    See :func:`from_bool`, :func:`from_int`, :func:`from_str`, etc.
+    Fields are created after this filtering process, the first time
+    :attr:`fields` is accessed, this is done by calling an utility function
+    designed for each supported python type.
+    See :func:`from_bool`, :func:`from_int`, :func:`from_str`,
+    :func:`from_bytes`, etc.
     Subclasses must implement :func:`create_fields` for this.
 
     :param obj: object to extract fields from
@@ -78,7 +81,8 @@ class FieldSource(metaclass=abc.ABCMeta):
     """
 
     #: Supported python types.
-    SUPPORTED_TYPES = (int, float, str, bool, dt.date, dt.time, dt.datetime)
+    SUPPORTED_TYPES = (int, float, str, bool, dt.date, dt.time, dt.datetime,
+                       bytes)
 
     def __init__(self, obj, exclude=(), under=False, dunder=False,
                  prettify=True, apply=None):
@@ -113,7 +117,24 @@ class FieldSource(metaclass=abc.ABCMeta):
                 value = text_value[1]
                 attributes[attr] = self._prettify(text), value
 
-        self.fields = self.create_fields(attributes)
+        self.attributes = attributes
+        self._fields = None
+
+    @property
+    def fields(self):
+        """Fields created from the source object, a dict like
+        d[field_name] = field.
+
+        Fields are created the first time this is accessed, so a source can
+        be prepared in a worker thread and its fields created later in the
+        GUI thread. Use :func:`create_fields` to obtain new fields every
+        time.
+
+        :rtype: :class:`dict`
+        """
+        if self._fields is None:
+            self._fields = self.create_fields(self.attributes)
+        return self._fields
 
     def get_members(self):
         """Returns all members of the source object, along with their value.
@@ -173,6 +194,12 @@ class FieldSource(metaclass=abc.ABCMeta):
 def get_fields_source(arg, **source_kw):
     """Tries to find the best :class:`FieldSource` for the given argument.
 
+    JSON Schema documents, given as a :class:`dict` or as the path of a
+    ``.json`` file, are handled by :class:`~jsonschema.JSONSchemaSource` and
+    paths of ``.csv`` files by :class:`~csv.CSVSource`. NumPy structured
+    dtypes and arrays are handled by :class:`~numpy.NumPySource` and pandas
+    DataFrames by :class:`~pandas.PandasSource`. Qt's ``QSqlRecord`` and
+    ``QSqlTableModel`` objects are handled by :class:`~qtsql.QtSqlSource`.
     An :class:`~object.ObjectSource` is always returned when a more adequate
     field source isn't found.
 
@@ -204,12 +231,87 @@ def get_fields_source(arg, **source_kw):
             from .sqlalchemy import SQLAlchemySource
             source = SQLAlchemySource(arg, **source_kw)
 
+    if source is None:
+        try:
+            # same as before, if NumPy isn't present arg isn't a NumPy object
+            import numpy
+        except ImportError:
+            pass
+        else:
+            if isinstance(arg, (numpy.ndarray, numpy.dtype)) and \
+                    getattr(arg, 'dtype', arg).names:
+                from .numpy import NumPySource
+                source = NumPySource(arg, **source_kw)
+
+    # a DataFrame can't exist unless pandas has been imported already, this
+    # avoids importing it when it's not used
+    pandas = sys.modules.get('pandas')
+    if source is None and pandas is not None and \
+            isinstance(arg, pandas.DataFrame):
+        from .pandas import PandasSource
+        source = PandasSource(arg, **source_kw)
+
+    if source is None:
+        try:
+            # QtSql module may not be available
+            from qtpy.QtSql import QSqlRecord, QSqlTableModel
+        except ImportError:
+            pass
+        else:
+            if isinstance(arg, (QSqlRecord, QSqlTableModel)):
+                from .qtsql import QtSqlSource
+                source = QtSqlSource(arg, **source_kw)
+
+    if source is None and _is_json_schema(arg):
+        from .jsonschema import JSONSchemaSource
+        source = JSONSchemaSource(arg, **source_kw)
+
+    if source is None and _is_csv(arg):
+        from .csv import CSVSource
+        source = CSVSource(arg, **source_kw)
+
     if source is None:
         from .object import ObjectSource
         source = ObjectSource(arg, **source_kw)
     return source
 
 
+def _is_json_schema(arg):
+    if isinstance(arg, str):
+        return arg.lower().endswith('.json')
+    return isinstance(arg, dict) and ('properties' in arg or '$schema' in arg)
+
+
+def prefetch(obj, names):
+    """Loads at once the attributes of an object that are about to be read.
+
+    Reading attributes of some objects may be expensive, for instance every
+    expired or deferred attribute of a SQLAlchemy instance emits its own
+    query when it's read. This function loads all the given attributes that
+    aren't loaded yet using a single query. It does nothing for objects that
+    don't need it.
+
+    :param obj: object whose attributes are going to be read
+    :type obj: any
+
+    :param names: names of the attributes to load
+    :type names: iterable of :class:`str`
+    """
+    try:
+        from sqlalchemy import inspect
+    except ImportError:
+        return  # not a SQLAlchemy instance
+
+    state = inspect(obj, raiseerr=False)
+    if state is not None and hasattr(state, 'unloaded'):
+        from .sqlalchemy import load_attributes
+        load_attributes(obj, names)
+
+
+def _is_csv(arg):
+    return isinstance(arg, str) and arg.lower().endswith('.csv')
+
+
 def from_bool(name, text, value, **kwargs):
     """Creates a ``BoolField`` from a boolean value.
 
@@ -433,3 +535,26 @@ def from_datetime(name, text, value, **kwargs):
     if value < val.min and 'min' not in fkwargs:
         fkwargs['min'] = value
     return fields.DatetimeField(**fkwargs)
+
+
+def from_bytes(name, text, value, **kwargs):
+    """Creates a ``BinaryField`` from a bytes object.
+
+    :param name: name for the field
+    :type name: :class:`str`
+
+    :param text: text for the field
+    :type text: :class:`str`
+
+    :param value: a bytes object
+    :type value: :class:`bytes`
+
+    :param kwargs: keyword arguments to pass to field constructor
+
+    :return: a new ``BinaryField`` with the given name and text
+    :rtype: :class:`~campos.fields.BinaryField`
+    """
+    fkwargs = kwargs.copy()
+    fkwargs['name'] = name
+    fkwargs['text'] = text
+    return fields.BinaryField(**fkwargs)
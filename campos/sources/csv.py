@@ -0,0 +1,246 @@
+import re
+import csv
+import datetime as dt
+from itertools import islice
+from collections import OrderedDict
+
+from . import (FieldSource, from_bool, from_int, from_float, from_str,
+               from_date, from_time, from_datetime)
+from ..fields import SelectField
+
+__author__ = 'Juan Manuel Bermúdez Cabrera'
+
+_BOOLEANS = {'true': True, 'false': False, 'yes': True, 'no': False}
+
+
+def _to_bool(text):
+    try:
+        return _BOOLEANS[text.lower()]
+    except KeyError:
+        raise ValueError('Invalid boolean {}'.format(text))
+
+
+#: Candidate types for CSV values, ordered from the most specific to the most
+#: general one, each one is a tuple like (python type, parser)
+PARSERS = ((bool, _to_bool),
+           (int, int),
+           (float, float),
+           (dt.date, dt.date.fromisoformat),
+           (dt.datetime, dt.datetime.fromisoformat),
+           (dt.time, dt.time.fromisoformat))
+
+
+class ColumnSample:
+    """Statistics of a CSV column gathered one value at a time.
+
+    Values are checked only against the candidate types that haven't been
+    discarded yet, so columns recognized as strings are processed at almost no
+    cost. Distinct values are tracked until there are more than `max_choices`
+    of them.
+    """
+
+    __slots__ = ('header', 'count', 'blanks', 'longest', 'candidates',
+                 'bounds', 'distinct', 'max_choices')
+
+    def __init__(self, header, max_choices):
+        self.header = header
+        self.count = 0
+        self.blanks = 0
+        self.longest = ''
+        self.candidates = list(PARSERS)
+        self.bounds = {}  # type --> [min, max]
+        self.distinct = set()
+        self.max_choices = max_choices
+
+    def add(self, text):
+        """Updates the statistics using a new value of the column"""
+        text = text.strip()
+        if not text:
+            self.blanks += 1
+            return
+
+        self.count += 1
+        if len(text) > len(self.longest):
+            self.longest = text
+
+        for candidate in tuple(self.candidates):
+            ptype, parser = candidate
+            try:
+                value = parser(text)
+            except ValueError:
+                self.candidates.remove(candidate)
+                self.bounds.pop(ptype, None)
+                continue
+
+            bounds = self.bounds.get(ptype)
+            if bounds is None:
+                self.bounds[ptype] = [value, value]
+            elif value < bounds[0]:
+                bounds[0] = value
+            elif value > bounds[1]:
+                bounds[1] = value
+
+        if self.distinct is not None and text not in self.distinct:
+            if len(self.distinct) < self.max_choices:
+                self.distinct.add(text)
+            else:
+                self.distinct = None
+
+    @property
+    def type(self):
+        """Most specific python type supporting every value seen so far.
+
+        :type: :class:`type`
+        """
+        return self.candidates[0][0] if self.candidates and self.count else str
+
+    @property
+    def choices(self):
+        """Distinct values of the column as tuples like (text, parsed value),
+        ``None`` if the column has too many distinct values or if they are not
+        repeated enough to be considered a closed set of options.
+
+        :type: :class:`list` or ``None``
+        """
+        if self.distinct is None or self.type is bool:
+            return None
+        if not self.distinct or len(self.distinct) * 2 > self.count:
+            return None
+
+        if self.type is str:
+            return sorted((text, text) for text in self.distinct)
+
+        parser = self.candidates[0][1]
+        choices = ((text, parser(text)) for text in self.distinct)
+        return sorted(choices, key=lambda choice: choice[1])
+
+
+class CSVSource(FieldSource):
+    """Field source for CSV files.
+
+    The source object can be the path of a CSV file or a text file object, the
+    first row must contain column names. Only the first `sample_size` rows are
+    read, row by row, to infer the type of each column, so even huge files can
+    be used as source. Values are tested in the following order
+    :class:`bool` (true, false, yes or no), :class:`int`, :class:`float`,
+    :class:`datetime.date`, :class:`datetime.datetime`, :class:`datetime.time`
+    (all of them in ISO 8601 format) and :class:`str`, the first type
+    supporting every non blank value of the column wins.
+
+    Columns having at most `max_choices` distinct values, repeated several
+    times through the sample, generate a
+    :class:`~campos.fields.SelectField`.
+
+    Column names are turned into valid field names by replacing invalid
+    characters with _ and converting them to lower case.
+
+    :param sample_size: maximum number of rows to read, defaults to 1000
+    :type sample_size: :class:`int`
+
+    :param max_choices: maximum number of distinct values for a column to be
+                        considered a set of choices, defaults to 10
+    :type max_choices: :class:`int`
+
+    :param encoding: file's encoding, used only if a path is given,
+                     defaults to 'utf-8'
+    :type encoding: :class:`str`
+
+    :param dialect: a :mod:`csv` dialect or its name, if it isn't given it's
+                    guessed using :class:`csv.Sniffer`
+    :type dialect: :class:`str` or :class:`csv.Dialect`
+    """
+
+    #: Amount of characters read to guess CSV dialects.
+    SNIFF_SIZE = 64 * 1024
+
+    def __init__(self, obj, sample_size=1000, max_choices=10, encoding='utf-8',
+                 dialect=None, **kwargs):
+        self.sample_size = sample_size
+        self.max_choices = max_choices
+        self.encoding = encoding
+        self.dialect = dialect
+        super(CSVSource, self).__init__(obj, **kwargs)
+
+    def get_members(self):
+        if isinstance(self.object, str):
+            with open(self.object, newline='', encoding=self.encoding) as file:
+                return self._sample(file)
+        return self._sample(self.object)
+
+    def _sample(self, file):
+        dialect = self.dialect
+        if dialect is None:
+            dialect = 'excel'
+            if file.seekable():
+                position = file.tell()
+                with_header = file.read(self.SNIFF_SIZE)
+                file.seek(position)
+                try:
+                    dialect = csv.Sniffer().sniff(with_header)
+                except csv.Error:
+                    pass
+
+        reader = csv.reader(file, dialect)
+        headers = next(reader, [])
+
+        names = set()
+        columns = []
+        for index, header in enumerate(headers):
+            name = self._identifier(header, index, names)
+            names.add(name)
+            columns.append((name, ColumnSample(header, self.max_choices)))
+
+        samples = [sample for _, sample in columns]
+        for row in islice(reader, self.sample_size):
+            for sample, text in zip(samples, row):
+                sample.add(text)
+        return columns
+
+    @staticmethod
+    def _identifier(header, index, used):
+        name = re.sub(r'[^a-z0-9_]+', '_', header.strip(), flags=re.I)
+        name = name.strip('_').lower()
+        if not name or name[0].isdigit():
+            name = 'column{}'.format(index + 1)
+
+        unique, count = name, 1
+        while unique in used:
+            count += 1
+            unique = '{}_{}'.format(name, count)
+        return unique
+
+    def create_fields(self, attributes):
+        fields = OrderedDict()
+        for attr, text_sample in attributes.items():
+            text, sample = text_sample
+            ptype = sample.type
+            low, high = sample.bounds.get(ptype, (None, None))
+
+            choices = sample.choices
+            if choices is not None:
+                field = SelectField(name=attr, text=text, choices=choices,
+                                    blank=sample.blanks > 0)
+
+            elif ptype is bool:
+                field = from_bool(attr, text, low)
+
+            elif ptype in (int, float):
+                creator = from_int if ptype is int else from_float
+                field = creator(attr, text, high)
+                if low < field.min:
+                    field.min = low
+
+            elif ptype is dt.date:
+                field = from_date(attr, text, low)
+
+            elif ptype is dt.datetime:
+                field = from_datetime(attr, text, low)
+
+            elif ptype is dt.time:
+                field = from_time(attr, text, low)
+
+            else:
+                field = from_str(attr, text, sample.longest)
+
+            fields[field.name] = field
+        return fields
@@ -0,0 +1,278 @@
+import os
+import re
+import json
+import datetime as dt
+from collections import OrderedDict
+
+from . import (FieldSource, from_bool, from_int, from_float, from_str,
+               from_date, from_time, from_datetime)
+from ..core import Field
+from ..fields import SelectField
+from ..validators import RegExp, Compare
+
+__author__ = 'Juan Manuel Bermúdez Cabrera'
+
+# absolute path --> (mtime, parsed document)
+_DOCUMENTS = {}
+
+# absolute path --> (dependencies, compiled schema), dependencies is a dict like
+# d[absolute path] = mtime of every document visited while compiling
+_COMPILED = {}
+
+
+def _mtime(path):
+    return os.stat(path).st_mtime_ns
+
+
+def load_document(path):
+    """Loads a JSON document from disk, parsed documents are cached and only
+    read again when the file's modification time changes.
+
+    :param path: path of a JSON file
+    :type path: :class:`str`
+
+    :return: the parsed document, object members keep their order
+    :rtype: :class:`~collections.OrderedDict`
+    """
+    path = os.path.abspath(path)
+    mtime = _mtime(path)
+
+    cached = _DOCUMENTS.get(path)
+    if cached is None or cached[0] != mtime:
+        with open(path, encoding='utf-8') as file:
+            document = json.load(file, object_pairs_hook=OrderedDict)
+        cached = mtime, document
+        _DOCUMENTS[path] = cached
+    return cached[1]
+
+
+class _Resolver:
+    """Resolves JSON references found in a schema.
+
+    Every reference is followed once, results are memoized using the document
+    where the reference was found and the reference itself as key.
+    """
+
+    def __init__(self, document, path=None):
+        self.document = document
+        self.path = path
+        self.dependencies = {}
+        self._memo = {}
+
+        if path is not None:
+            self.dependencies[path] = _mtime(path)
+
+    def resolve(self, schema, base):
+        """Follows ``$ref`` members until a concrete schema is found.
+
+        :return: a tuple like (resolved schema, path of its document)
+        """
+        chain = []
+        while isinstance(schema, dict) and '$ref' in schema:
+            key = base, schema['$ref']
+            if key in self._memo:
+                schema, base = self._memo[key]
+                break
+            if key in chain:
+                raise ValueError('Circular reference {}'.format(key[1]))
+
+            chain.append(key)
+            schema, base = self._lookup(schema['$ref'], base)
+
+        for key in chain:
+            self._memo[key] = schema, base
+        return schema, base
+
+    def _lookup(self, ref, base):
+        location, _, pointer = ref.partition('#')
+
+        if location:
+            if base is not None:
+                location = os.path.join(os.path.dirname(base), location)
+            path = os.path.abspath(location)
+            document = load_document(path)
+            self.dependencies[path] = _mtime(path)
+        else:
+            path = base
+            document = self.document if base == self.path else \
+                load_document(base)
+
+        node = document
+        for token in pointer.split('/')[1:]:
+            token = token.replace('~1', '/').replace('~0', '~')
+            node = node[int(token)] if isinstance(node, list) else node[token]
+        return node, path
+
+
+def _compile(document, path=None):
+    resolver = _Resolver(document, path)
+    root, base = resolver.resolve(document, path)
+
+    properties = OrderedDict()
+    for name, schema in root.get('properties', {}).items():
+        properties[name], _ = resolver.resolve(schema, base)
+
+    required = frozenset(root.get('required', ()))
+    return resolver.dependencies, (properties, required)
+
+
+def compile_schema(schema):
+    """Resolves the references of an object schema and obtains its properties.
+
+    If `schema` is a file path the result is cached until the file, or any
+    other file referenced from it, is modified.
+
+    :param schema: a JSON schema or the path of a file containing it
+    :type schema: :class:`dict` or :class:`str`
+
+    :return: a tuple like (properties, required) where properties is an
+             ordered dict like d[property_name] = resolved_schema and required
+             is a set with the names of the required properties
+    :rtype: :class:`tuple`
+    """
+    if not isinstance(schema, str):
+        return _compile(schema)[1]
+
+    path = os.path.abspath(schema)
+    cached = _COMPILED.get(path)
+
+    if cached is not None:
+        dependencies, compiled = cached
+        try:
+            if all(_mtime(p) == t for p, t in dependencies.items()):
+                return compiled
+        except OSError:
+            pass  # a referenced file was removed, compile again
+
+    cached = _compile(load_document(path), path)
+    _COMPILED[path] = cached
+    return cached[1]
+
+
+class JSONSchemaSource(FieldSource):
+    """Field source for JSON Schema documents.
+
+    The source object can be a :class:`dict` holding an object schema or the
+    path of a file containing it. Fields are created for every property using
+    its ``type``, ``format``, ``enum``, ``minimum``, ``maximum``,
+    ``minLength``, ``maxLength`` and ``pattern`` keywords, properties listed
+    under ``required`` generate required fields. If present, ``title`` and
+    ``description`` keywords are used as field's text and description.
+
+    References(``$ref``) can point to the same document or to other files
+    relative to the referencing one. Compiled schemas are cached per file,
+    so loading the same file again is cheap until it's modified.
+
+    .. note:: properties whose names aren't valid field names are ignored.
+              ``pattern`` keywords are matched anywhere in the value as JSON
+              Schema mandates.
+    """
+
+    def get_members(self):
+        properties, self.required_names = compile_schema(self.object)
+
+        members = []
+        for name, schema in properties.items():
+            if re.fullmatch(Field._ID_PATTERN, name, re.IGNORECASE):
+                members.append((name, schema))
+        return members
+
+    def create_fields(self, attributes):
+        fields = OrderedDict()
+        for attr, text_schema in attributes.items():
+            text, schema = text_schema
+            text = schema.get('title', text)
+
+            kwargs = {}
+            if 'description' in schema:
+                kwargs['description'] = schema['description']
+            if attr in self.required_names:
+                kwargs['required'] = True
+
+            field = self._create_field(attr, text, schema, kwargs)
+            if field is not None:
+                fields[field.name] = field
+        return fields
+
+    @staticmethod
+    def _create_field(attr, text, schema, kwargs):
+        stype = schema.get('type')
+        if isinstance(stype, list):
+            types = [t for t in stype if t != 'null']
+            stype = types[0] if len(types) == 1 else None
+
+        if 'enum' in schema:
+            choices = []
+            for value in schema['enum']:
+                if value is None:
+                    kwargs['blank'] = True
+                else:
+                    choices.append((str(value), value))
+            return SelectField(name=attr, text=text, choices=choices, **kwargs)
+
+        if stype in ('boolean', 'integer', 'number', 'string') and \
+                'default' in schema and 'format' not in schema:
+            kwargs['default'] = schema['default']
+
+        if stype == 'boolean':
+            return from_bool(attr, text, False, **kwargs)
+
+        if stype in ('integer', 'number'):
+            low, high = schema.get('minimum'), schema.get('maximum')
+
+            # exclusive bounds are booleans in draft 4 and numbers afterwards
+            ex_low = schema.get('exclusiveMinimum')
+            if ex_low is True:
+                ex_low = low
+            elif isinstance(ex_low, bool):
+                ex_low = None
+
+            ex_high = schema.get('exclusiveMaximum')
+            if ex_high is True:
+                ex_high = high
+            elif isinstance(ex_high, bool):
+                ex_high = None
+
+            # integers just move the bound, numbers keep the bound in the
+            # widget and reject it with a strict comparison
+            validators = []
+            if ex_low is not None:
+                low = ex_low + 1 if stype == 'integer' else ex_low
+                if stype == 'number':
+                    validators.append(Compare('>', ex_low))
+            if ex_high is not None:
+                high = ex_high - 1 if stype == 'integer' else ex_high
+                if stype == 'number':
+                    validators.append(Compare('<', ex_high))
+            if validators:
+                kwargs['validators'] = validators
+
+            if low is not None:
+                kwargs['min'] = low
+            if high is not None:
+                kwargs['max'] = high
+
+            value = kwargs.get('default', low if low is not None else 0)
+            if stype == 'integer':
+                return from_int(attr, text, value, **kwargs)
+            return from_float(attr, text, value, **kwargs)
+
+        if stype == 'string':
+            fmt = schema.get('format')
+            if fmt == 'date':
+                return from_date(attr, text, dt.date.today(), **kwargs)
+            if fmt == 'time':
+                return from_time(attr, text, dt.time.min, **kwargs)
+            if fmt == 'date-time':
+                return from_datetime(attr, text, dt.datetime.now(), **kwargs)
+
+            if 'minLength' in schema:
+                kwargs['min_length'] = schema['minLength']
+            if 'maxLength' in schema:
+                kwargs['max_length'] = schema['maxLength']
+            if 'pattern' in schema:
+                # JSON Schema patterns aren't implicitly anchored
+                exp = '.*(?:{}).*'.format(schema['pattern'])
+                kwargs['validators'] = [RegExp(exp, flags=re.DOTALL)]
+            return from_str(attr, text, kwargs.get('default', ''), **kwargs)
+        return None
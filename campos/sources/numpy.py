@@ -0,0 +1,213 @@
+import datetime as dt
+from collections import OrderedDict
+
+import numpy as np
+
+from . import (FieldSource, from_bool, from_int, from_float, from_str,
+               from_date, from_datetime)
+from ..bindings import RowBinding
+
+__author__ = 'Juan Manuel Bermúdez Cabrera'
+
+#: Range of values supported by integer fields.
+INT_LIMITS = -2 ** 31, 2 ** 31 - 1
+
+# datetime64 units without time information
+_DATE_UNITS = ('Y', 'M', 'W', 'D')
+
+
+def int_range(dtype):
+    """Range of values admitted by an integer dtype, limited to the range
+    supported by integer fields(see :data:`INT_LIMITS`).
+
+    :param dtype: an integer dtype
+    :type dtype: :class:`numpy.dtype`
+
+    :return: a tuple like (min, max)
+    :rtype: :class:`tuple`
+    """
+    info = np.iinfo(dtype)
+    return max(int(info.min), INT_LIMITS[0]), min(int(info.max), INT_LIMITS[1])
+
+
+def float_range(dtype):
+    """Range of values admitted by a floating point dtype.
+
+    :param dtype: a floating point dtype
+    :type dtype: :class:`numpy.dtype`
+
+    :return: a tuple like (min, max)
+    :rtype: :class:`tuple`
+    """
+    info = np.finfo(dtype)
+    return float(info.min), float(info.max)
+
+
+def is_date(dtype):
+    """Checks if a datetime64 dtype holds dates without time information"""
+    return np.datetime_data(dtype)[0] in _DATE_UNITS
+
+
+def to_python(value, dtype):
+    """Converts a numpy scalar to the python object used by fields.
+
+    :param value: value to convert
+    :param dtype: the dtype the value belongs to
+    :type dtype: :class:`numpy.dtype`
+    """
+    if dtype.kind == 'M':
+        if np.isnat(value):
+            return None
+        unit = 'datetime64[D]' if is_date(dtype) else 'datetime64[us]'
+        return value.astype(unit).item()
+
+    if dtype.kind == 'S':
+        return value.decode(RecordBinding.ENCODING)
+
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def from_python(value, dtype):
+    """Converts a python object to a value suitable to store in an array of
+    the given dtype.
+
+    :param value: value to convert
+    :param dtype: dtype of the array that will store the value
+    :type dtype: :class:`numpy.dtype`
+
+    :raises ValueError: if an encoded string doesn't fit in a fixed width
+                        bytes dtype, numpy would truncate it silently
+    """
+    if dtype.kind == 'M':
+        return np.datetime64('NaT') if value is None else np.datetime64(value)
+
+    if dtype.kind == 'S':
+        encoded = value.encode(RecordBinding.ENCODING)
+        if len(encoded) > dtype.itemsize:
+            msg = '{!r} takes {} bytes, only {} fit'
+            raise ValueError(msg.format(value, len(encoded), dtype.itemsize))
+        return encoded
+    return value
+
+
+class NumPySource(FieldSource):
+    """Field source for NumPy structured dtypes.
+
+    The source object can be a structured :class:`numpy.dtype` or an array
+    having one. A field is created for every scalar member of the dtype:
+
+    * Integers generate an :class:`~campos.fields.IntField` admitting the
+      range of the dtype(limited to :data:`INT_LIMITS`).
+
+    * Floating point members generate a :class:`~campos.fields.FloatField`
+      admitting the range of the dtype.
+
+    * Booleans generate a :class:`~campos.fields.BoolField`.
+
+    * ``datetime64`` members generate a :class:`~campos.fields.DateField` if
+      their unit is a day or larger and a :class:`~campos.fields.DatetimeField`
+      otherwise.
+
+    * Fixed width strings(bytes or unicode) generate a
+      :class:`~campos.fields.StringField` whose ``max_length`` is the width of
+      the string.
+
+    Rows of an array can be edited in place using a :class:`RecordBinding`.
+    """
+
+    def get_members(self):
+        if isinstance(self.object, np.ndarray):
+            dtype = self.object.dtype
+        else:
+            dtype = np.dtype(self.object)
+
+        members = []
+        for name in dtype.names or ():
+            members.append((name, dtype.fields[name][0]))
+        return members
+
+    def create_fields(self, attributes):
+        fields = OrderedDict()
+        for attr, text_dtype in attributes.items():
+            text, dtype = text_dtype
+            kind = dtype.kind
+
+            field = None
+            if dtype.shape or dtype.names:
+                pass  # sub-arrays and nested records aren't supported
+
+            elif kind == 'b':
+                field = from_bool(attr, text, False)
+
+            elif kind in 'iu':
+                low, high = int_range(dtype)
+                field = from_int(attr, text, max(low, 0), min=low, max=high)
+
+            elif kind == 'f':
+                low, high = float_range(dtype)
+                field = from_float(attr, text, 0, min=low, max=high)
+
+            elif kind == 'M':
+                if is_date(dtype):
+                    field = from_date(attr, text, dt.date.min)
+                else:
+                    field = from_datetime(attr, text, dt.datetime.min)
+
+            elif kind == 'S':
+                field = from_str(attr, text, '', max_length=dtype.itemsize)
+
+            elif kind == 'U':
+                length = dtype.itemsize // np.dtype('U1').itemsize
+                field = from_str(attr, text, '', max_length=length)
+
+            if field is not None:
+                fields[field.name] = field
+        return fields
+
+
+class RecordBinding(RowBinding):
+    """Binds a row of a structured array to forms.
+
+    Values are read from and written to the array in place, so changes are
+    visible through the array and any view of it(memory mapped arrays
+    included). Moving to other row by changing :attr:`row` doesn't create new
+    objects::
+
+        source = NumPySource(array)
+        form = EditionForm(fields=source.fields.values())
+
+        binding = RecordBinding(array)
+        form.edit(binding)
+
+        form.button('save').clicked.connect(lambda: binding.store(form))
+
+    :param array: a structured array
+    :type array: :class:`numpy.ndarray`
+
+    :param row: index of the current row, defaults to 0
+    :type row: :class:`int`
+    """
+
+    #: Encoding used to convert bytes strings members.
+    ENCODING = 'utf-8'
+
+    def __init__(self, array, row=0):
+        self.array = array
+
+        # column views share memory with the array, no data is copied
+        self._columns = {name: array[name] for name in array.dtype.names}
+        super(RecordBinding, self).__init__(row=row)
+
+    def __len__(self):
+        return len(self.array)
+
+    def __contains__(self, name):
+        return name in self._columns
+
+    def get(self, name):
+        column = self._columns[name]
+        return to_python(column[self.row], column.dtype)
+
+    def set(self, name, value):
+        column = self._columns[name]
+        column[self.row] = from_python(value, column.dtype)
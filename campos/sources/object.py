@@ -2,7 +2,7 @@ import datetime as dt
 from collections import OrderedDict
 
 from . import (FieldSource, from_bool, from_int, from_float, from_str,
-               from_date, from_time, from_datetime)
+               from_date, from_time, from_datetime, from_bytes)
 
 __author__ = 'Juan Manuel Bermúdez Cabrera'
 
@@ -47,6 +47,9 @@ class ObjectSource(FieldSource):
             elif isinstance(value, dt.time):
                 field = from_time(attr, text, value)
 
+            elif isinstance(value, bytes):
+                field = from_bytes(attr, text, value)
+
             if field is not None:
                 fields[field.name] = field
         return fields
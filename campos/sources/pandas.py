@@ -0,0 +1,174 @@
+import re
+import datetime as dt
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from pandas.api import types
+
+from . import (FieldSource, from_bool, from_int, from_float, from_str,
+               from_date, from_time, from_datetime)
+from .numpy import int_range, float_range
+from ..bindings import RowBinding
+from ..core import Field
+from ..fields import SelectField
+
+__author__ = 'Juan Manuel Bermúdez Cabrera'
+
+
+def to_python(value):
+    """Converts a value read from a DataFrame to the python object used by
+    fields, missing values are converted to ``None``.
+
+    :param value: value to convert
+    """
+    if value is pd.NaT or value is pd.NA:
+        return None
+    if isinstance(value, float) and value != value:  # NaN
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    if isinstance(value, np.generic):
+        return None if pd.isna(value) else value.item()
+    return value
+
+
+class PandasSource(FieldSource):
+    """Field source for pandas DataFrames.
+
+    A field is created for every column whose name is a valid field name,
+    according to column's dtype:
+
+    * Integer and floating point columns generate
+      :class:`~campos.fields.IntField` or :class:`~campos.fields.FloatField`
+      admitting the range of the dtype, see
+      :class:`~campos.sources.numpy.NumPySource`.
+
+    * Boolean columns generate a :class:`~campos.fields.BoolField`.
+
+    * Categorical columns generate a :class:`~campos.fields.SelectField`
+      with column's categories as choices.
+
+    * Datetime columns generate a :class:`~campos.fields.DatetimeField`.
+
+    * String and object columns are inspected to find out the type of their
+      values, strings, dates, times and datetimes are supported.
+
+    Rows can be edited in place using a :class:`DataFrameRowBinding`.
+    """
+
+    def get_members(self):
+        members = []
+        for name in self.object.columns:
+            if isinstance(name, str) and \
+                    re.fullmatch(Field._ID_PATTERN, name, re.IGNORECASE):
+                members.append((name, self.object[name]))
+        return members
+
+    def create_fields(self, attributes):
+        fields = OrderedDict()
+        for attr, text_column in attributes.items():
+            text, column = text_column
+            dtype = column.dtype
+            numpy_dtype = getattr(dtype, 'numpy_dtype', dtype)
+
+            field = None
+            if isinstance(dtype, pd.CategoricalDtype):
+                choices = [(str(c), to_python(c)) for c in dtype.categories]
+                field = SelectField(name=attr, text=text, choices=choices,
+                                    blank=bool(column.hasnans))
+
+            elif types.is_bool_dtype(dtype):
+                field = from_bool(attr, text, False)
+
+            elif types.is_integer_dtype(dtype):
+                low, high = int_range(numpy_dtype)
+                field = from_int(attr, text, max(low, 0), min=low, max=high)
+
+            elif types.is_float_dtype(dtype):
+                low, high = float_range(numpy_dtype)
+                field = from_float(attr, text, 0, min=low, max=high)
+
+            elif types.is_datetime64_any_dtype(dtype):
+                field = from_datetime(attr, text, dt.datetime.min)
+
+            elif types.is_string_dtype(dtype) or types.is_object_dtype(dtype):
+                field = self._inspect_values(attr, text, column)
+
+            if field is not None:
+                fields[field.name] = field
+        return fields
+
+    @staticmethod
+    def _inspect_values(attr, text, column):
+        inferred = types.infer_dtype(column, skipna=True)
+
+        if inferred == 'string':
+            multiline = bool(column.str.contains('\n', regex=False).any())
+            lengths = column.str.len()
+            # positional, labels of the index may be repeated
+            longest = column.iloc[int(lengths.fillna(-1).values.argmax())] \
+                if lengths.notna().any() else ''
+            return from_str(attr, text, longest, istext=multiline)
+
+        if inferred == 'boolean':
+            return from_bool(attr, text, False)
+
+        if inferred == 'integer':
+            return from_int(attr, text, 0)
+
+        if inferred in ('floating', 'mixed-integer-float', 'decimal'):
+            return from_float(attr, text, 0)
+
+        if inferred == 'date':
+            return from_date(attr, text, dt.date.min)
+
+        if inferred in ('datetime', 'datetime64'):
+            return from_datetime(attr, text, dt.datetime.min)
+
+        if inferred == 'time':
+            return from_time(attr, text, dt.time.min)
+        return None
+
+
+class DataFrameRowBinding(RowBinding):
+    """Binds a row of a DataFrame to forms.
+
+    Values are read and written one at a time using positional scalar access
+    (``DataFrame.iat``), no Series or dicts are created for the current row,
+    so moving through thousands of rows by changing :attr:`row` is cheap::
+
+        binding = DataFrameRowBinding(frame)
+        form.edit(binding)
+
+        form.button('save').clicked.connect(lambda: binding.store(form))
+
+    Missing values(``NaN``, ``NaT``, ``NA``) are read as ``None``.
+
+    :param frame: the DataFrame to bind
+    :type frame: :class:`pandas.DataFrame`
+
+    :param row: position of the current row, defaults to 0
+    :type row: :class:`int`
+    """
+
+    def __init__(self, frame, row=0):
+        self.frame = frame
+
+        self._positions = {}
+        for position, name in enumerate(frame.columns):
+            if isinstance(name, str):
+                self._positions.setdefault(name, position)
+        super(DataFrameRowBinding, self).__init__(row=row)
+
+    def __len__(self):
+        return len(self.frame.index)
+
+    def __contains__(self, name):
+        return name in self._positions
+
+    def get(self, name):
+        return to_python(self.frame.iat[self.row, self._positions[name]])
+
+    def set(self, name, value):
+        self.frame.iat[self.row, self._positions[name]] = value
@@ -0,0 +1,206 @@
+import datetime as dt
+from collections import OrderedDict
+
+from qtpy.QtCore import Qt, QDate, QTime, QDateTime
+from qtpy.QtSql import QSqlField, QSqlTableModel
+
+from . import (FieldSource, from_bool, from_int, from_float, from_str,
+               from_date, from_time, from_datetime)
+from ..bindings import RowBinding
+
+__author__ = 'Juan Manuel Bermúdez Cabrera'
+
+# QMetaType type ids, these are the same in every Qt binding
+_BOOL, _INT, _UINT, _LONGLONG, _ULONGLONG, _DOUBLE = 1, 2, 3, 4, 5, 6
+_STRING, _DATE, _TIME, _DATETIME = 10, 14, 15, 16
+
+_INTEGERS = (_INT, _UINT, _LONGLONG, _ULONGLONG)
+
+
+def type_id(sql_field):
+    """Obtains the QMetaType id of a ``QSqlField``'s type.
+
+    :param sql_field: a field of a SQL record
+    :type sql_field: ``QSqlField``
+
+    :rtype: :class:`int`
+    """
+    if hasattr(sql_field, 'metaType'):  # Qt 6
+        return sql_field.metaType().id()
+    return int(sql_field.type())
+
+
+def to_python(value):
+    """Converts Qt date and time objects to their python equivalents, other
+    values are returned unchanged.
+
+    :param value: a value read from a Qt model
+    """
+    for method in ('toPyDateTime', 'toPyDate', 'toPyTime', 'toPython'):
+        converter = getattr(value, method, None)
+        if converter is not None:
+            return converter()
+    return value
+
+
+def to_qt(value):
+    """Converts python date and time objects to their Qt equivalents, other
+    values are returned unchanged.
+
+    :param value: a value to store in a Qt model
+    """
+    if isinstance(value, dt.datetime):
+        return QDateTime(QDate(value.year, value.month, value.day),
+                         QTime(value.hour, value.minute, value.second,
+                               value.microsecond // 1000))
+    if isinstance(value, dt.date):
+        return QDate(value.year, value.month, value.day)
+    if isinstance(value, dt.time):
+        return QTime(value.hour, value.minute, value.second,
+                     value.microsecond // 1000)
+    return value
+
+
+def _record(obj):
+    if isinstance(obj, QSqlTableModel) and obj.tableName():
+        # the database's record holds nullability and default values
+        record = obj.database().record(obj.tableName())
+        if not record.isEmpty():
+            return record
+    return obj.record() if hasattr(obj, 'record') else obj
+
+
+class QtSqlSource(FieldSource):
+    """Field source for Qt's SQL module.
+
+    The source object can be a ``QSqlRecord`` or a ``QSqlTableModel``, if a
+    table model is given the database is asked for the record describing the
+    table which provides more complete information. Fields are created
+    according to the type of each column, string's length and
+    floating point's precision are used if the driver reports them. Columns
+    that can't be null and have no default or auto generated value create
+    required fields.
+
+    Records of a table model can be edited using a :class:`QtSqlRowBinding`.
+
+    .. note:: some drivers, like SQLite's one, report dates and times as
+              strings, in such cases string fields are created for them.
+    """
+
+    def get_members(self):
+        record = _record(self.object)
+
+        members = []
+        for i in range(record.count()):
+            sql_field = record.field(i)
+            members.append((sql_field.name(), sql_field))
+        return members
+
+    def create_fields(self, attributes):
+        fields = OrderedDict()
+        for attr, text_field in attributes.items():
+            text, sql_field = text_field
+            tid = type_id(sql_field)
+
+            kwargs = {}
+            default = sql_field.defaultValue()
+            if sql_field.requiredStatus() == QSqlField.Required and \
+                    not sql_field.isAutoValue() and default in (None, ''):
+                kwargs['required'] = True
+
+            field = None
+            if tid == _BOOL:
+                field = from_bool(attr, text, False, **kwargs)
+
+            elif tid in _INTEGERS:
+                field = from_int(attr, text, 0, **kwargs)
+
+            elif tid == _DOUBLE:
+                if sql_field.precision() > 0:
+                    kwargs['precision'] = sql_field.precision()
+                field = from_float(attr, text, 0, **kwargs)
+
+            elif tid == _STRING:
+                if sql_field.length() > 0:
+                    kwargs['max_length'] = sql_field.length()
+                field = from_str(attr, text, '', **kwargs)
+
+            elif tid == _DATE:
+                field = from_date(attr, text, dt.date.today(), **kwargs)
+
+            elif tid == _TIME:
+                field = from_time(attr, text, dt.time.min, **kwargs)
+
+            elif tid == _DATETIME:
+                field = from_datetime(attr, text, dt.datetime.now(), **kwargs)
+
+            if field is not None:
+                fields[field.name] = field
+        return fields
+
+
+class QtSqlRowBinding(RowBinding):
+    """Binds a row of a ``QSqlTableModel`` to forms.
+
+    Values are read with ``model.data()`` and written with ``model.setData()``,
+    so data is kept in the model and changes are submitted according to
+    model's edit strategy. Call :func:`submit` when using
+    ``QSqlTableModel.OnManualSubmit``::
+
+        model = QSqlTableModel(db=db)
+        model.setTable('person')
+        model.setEditStrategy(QSqlTableModel.OnManualSubmit)
+        model.select()
+
+        form = EditionForm.from_source(model)
+
+        binding = QtSqlRowBinding(model, row=0)
+        form.edit(binding)
+
+        def save():
+            binding.store(form)
+            binding.submit()
+
+        form.button('save').clicked.connect(save)
+
+    :param model: a table model
+    :type model: ``QSqlTableModel``
+
+    :param row: index of the current row, defaults to 0
+    :type row: :class:`int`
+    """
+
+    def __init__(self, model, row=0):
+        self.model = model
+
+        record = model.record()
+        self._columns = {}
+        for i in range(record.count()):
+            self._columns[record.fieldName(i)] = i
+        super(QtSqlRowBinding, self).__init__(row=row)
+
+    def __len__(self):
+        return self.model.rowCount()
+
+    def __contains__(self, name):
+        return name in self._columns
+
+    def get(self, name):
+        index = self.model.index(self.row, self._columns[name])
+        return to_python(self.model.data(index, Qt.EditRole))
+
+    def set(self, name, value):
+        index = self.model.index(self.row, self._columns[name])
+        if not self.model.setData(index, to_qt(value)):
+            msg = "Can't set {} in row {}: {}"
+            error = self.model.lastError().text()
+            raise ValueError(msg.format(name, self.row, error))
+
+    def submit(self):
+        """Submits all pending changes of the model to the database.
+
+        :return: True if changes were submitted, otherwise see
+                 ``model.lastError()``
+        :rtype: :class:`bool`
+        """
+        return self.model.submitAll()
@@ -1,13 +1,1296 @@
+import os
+import re
+import pickle
+import hashlib
+import itertools
+import tempfile
+import threading
+import contextlib
 import datetime as dt
-from collections import OrderedDict
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from qtpy.QtCore import QObject, QTimer, Signal
 
 from . import (FieldSource, from_bool, from_int, from_float, from_str,
-               from_date, from_time, from_datetime)
-from ..fields import SelectField
+               from_date, from_time, from_datetime, from_bytes)
+from ..fields import SelectField, PagedSelectField
+from ..validators import Validator, Compare, AnyOf
 
 __author__ = 'Juan Manuel Bermúdez Cabrera'
 
 
+def _execute(bind, statement):
+    from sqlalchemy.engine import Engine
+
+    if isinstance(bind, Engine):
+        with bind.connect() as connection:
+            return connection.execute(statement).fetchall()
+    return bind.execute(statement).fetchall()
+
+
+#: Amount of bytes transferred at once by :func:`read_blob` and
+#: :func:`write_blob`.
+BLOB_CHUNK_SIZE = 1024 * 1024
+
+
+@contextlib.contextmanager
+def _connection(bind):
+    from sqlalchemy.engine import Engine
+    from sqlalchemy.orm import Session
+
+    if isinstance(bind, Engine):
+        with bind.begin() as connection:
+            yield connection
+    elif isinstance(bind, Session):
+        yield bind.connection()
+    else:
+        yield bind
+
+
+def _blob_connection(connection):
+    # incremental blob I/O is only available for SQLite since python 3.11
+    if connection.dialect.name != 'sqlite':
+        return None
+
+    fairy = connection.connection
+    raw = getattr(fairy, 'dbapi_connection', None) or fairy.connection
+    return raw if hasattr(raw, 'blobopen') else None
+
+
+def _blob_row(connection, column, key):
+    from sqlalchemy import select, literal_column
+    from sqlalchemy.exc import OperationalError
+
+    table = column.table
+    pk = table.primary_key.columns.values()[0]
+    query = select(literal_column('rowid'), column.is_(None))
+    try:
+        row = connection.execute(query.where(pk == key)).first()
+    except OperationalError:
+        return None  # a WITHOUT ROWID table, blobs can't be opened
+    if row is None:
+        raise ValueError('No {} with {} {}'.format(table.name, pk.name, key))
+    return row
+
+
+def write_blob(bind, column, key, data, chunk_size=BLOB_CHUNK_SIZE):
+    """Stores binary data in a column of an existing row.
+
+    With SQLite, the column is resized and data is written in chunks using
+    incremental blob I/O, so no intermediate copies are created. With other
+    dialects, and with SQLite tables created ``WITHOUT ROWID``, a single
+    UPDATE is executed passing a :class:`memoryview` of the data to the
+    driver. This works well with memory mapped files, see
+    :class:`~campos.fields.BinaryField`.
+
+    .. note:: forms don't call this function, edition forms read binary
+              columns as attributes and saving assigns the whole value, so
+              large values are held in memory. Store them with this function
+              from the save callback to avoid it::
+
+                  write_blob(engine, files.c.data, key, form.field('data').value)
+
+    :param bind: object used to execute queries, if it's an engine the data
+                 is committed
+    :type bind: :class:`~sqlalchemy.engine.Engine`,
+                :class:`~sqlalchemy.engine.Connection` or
+                :class:`~sqlalchemy.orm.Session`
+
+    :param column: a binary column of a table with a single column primary key
+    :type column: :class:`~sqlalchemy.schema.Column`
+
+    :param key: primary key of the row
+    :param data: a bytes-like object
+
+    :param chunk_size: amount of bytes to write at once
+    :type chunk_size: :class:`int`
+    """
+    from sqlalchemy import update, func
+
+    table = column.table
+    pk = table.primary_key.columns.values()[0]
+    view = memoryview(data)
+
+    with _connection(bind) as connection:
+        raw = _blob_connection(connection)
+        row = None if raw is None else _blob_row(connection, column, key)
+
+        query = update(table).where(pk == key)
+        if row is None:
+            connection.execute(query.values({column.name: view}))
+            return
+
+        connection.execute(query.values({column.name: func.zeroblob(len(view))}))
+        rowid, _ = row
+
+        with raw.blobopen(table.name, column.name, rowid) as blob:
+            for start in range(0, len(view), chunk_size):
+                blob.write(view[start:start + chunk_size])
+
+
+def read_blob(bind, column, key, file, chunk_size=BLOB_CHUNK_SIZE):
+    """Copies binary data stored in a column of a row to a file object.
+
+    With SQLite, data is read in chunks using incremental blob I/O, so the
+    whole value is never held in memory. With other dialects, and with SQLite
+    tables created ``WITHOUT ROWID``, the value is fetched at once and
+    written in chunks.
+
+    .. note:: forms don't call this function, see :func:`write_blob`.
+
+    :param bind: object used to execute queries
+    :type bind: :class:`~sqlalchemy.engine.Engine`,
+                :class:`~sqlalchemy.engine.Connection` or
+                :class:`~sqlalchemy.orm.Session`
+
+    :param column: a binary column of a table with a single column primary key
+    :type column: :class:`~sqlalchemy.schema.Column`
+
+    :param key: primary key of the row
+
+    :param file: a binary file object to write to
+
+    :param chunk_size: amount of bytes to read at once
+    :type chunk_size: :class:`int`
+
+    :return: amount of bytes written, ``None`` if the value is null
+    :rtype: :class:`int`
+    """
+    from sqlalchemy import select
+
+    table = column.table
+    pk = table.primary_key.columns.values()[0]
+
+    with _connection(bind) as connection:
+        raw = _blob_connection(connection)
+        row = None if raw is None else _blob_row(connection, column, key)
+        if row is None:
+            query = select(column).where(pk == key)
+            data = connection.execute(query).scalar()
+            if data is None:
+                return None
+
+            view = memoryview(data)
+            for start in range(0, len(view), chunk_size):
+                file.write(view[start:start + chunk_size])
+            return len(view)
+
+        rowid, null = row
+        if null:
+            return None
+
+        written = 0
+        with raw.blobopen(table.name, column.name, rowid,
+                          readonly=True) as blob:
+            chunk = blob.read(chunk_size)
+            while chunk:
+                written += file.write(chunk)
+                chunk = blob.read(chunk_size)
+        return written
+
+
+def update_row(bind, table, key, values):
+    """Updates only the given columns of a row using a single UPDATE
+    statement, nothing is executed if there are no values. Useful along with
+    :func:`~campos.bindings.changed_data`::
+
+        update_row(engine, users, user_id, changed_data(form))
+
+    :param bind: object used to execute the statement, if it's an engine the
+                 change is committed
+    :type bind: :class:`~sqlalchemy.engine.Engine`,
+                :class:`~sqlalchemy.engine.Connection` or
+                :class:`~sqlalchemy.orm.Session`
+
+    :param table: table of the row, it must have a single column primary key
+    :type table: :class:`~sqlalchemy.schema.Table`
+
+    :param key: primary key of the row
+
+    :param values: a dict like d[column_name] = value, names that aren't
+                   columns of the table are ignored
+    :type values: :class:`dict`
+
+    :return: amount of updated rows
+    :rtype: :class:`int`
+    """
+    from sqlalchemy import update
+
+    values = {n: v for n, v in values.items() if n in table.columns}
+    if not values:
+        return 0
+
+    pk = table.primary_key.columns.values()[0]
+    query = update(table).where(pk == key).values(values)
+    with _connection(bind) as connection:
+        return connection.execute(query).rowcount
+
+
+def insert_rows(bind, table, rows):
+    """Inserts several rows using a single statement executed with all of
+    them(executemany), nothing is executed if there are no rows.
+
+    :param bind: object used to execute the statement, if it's an engine the
+                 rows are committed
+    :type bind: :class:`~sqlalchemy.engine.Engine`,
+                :class:`~sqlalchemy.engine.Connection` or
+                :class:`~sqlalchemy.orm.Session`
+
+    :param table: table to insert into
+    :type table: :class:`~sqlalchemy.schema.Table`
+
+    Generated primary key columns, auto incremented or with a default
+    value, are left out of the rows where their value is empty(``None``,
+    ``0`` or ``''``) so the database generates them. Form snapshots hold such
+    values, see :func:`~campos.forms.Form.snapshot`.
+
+    :param rows: dicts like d[column_name] = value, names that aren't columns
+                 of the table are ignored
+    :type rows: iterable of :class:`dict`
+    """
+    from sqlalchemy import insert
+
+    autoincrement = getattr(table, 'autoincrement_column', None)
+    generated = [c.name for c in table.primary_key.columns
+                 if c is autoincrement or c.default is not None or
+                 c.server_default is not None]
+
+    rows = [{n: v for n, v in row.items() if n in table.columns and
+             not (n in generated and _is_empty(v))}
+            for row in rows]
+
+    # a statement is executed with many rows only if they give values for
+    # the same columns, consecutive rows are grouped to keep their order
+    groups = [list(g) for _, g in itertools.groupby(rows, key=sorted)]
+    if groups:
+        with _connection(bind) as connection:
+            for group in groups:
+                connection.execute(insert(table), group)
+
+
+def _is_empty(value):
+    return value is None or (isinstance(value, (int, str)) and
+                             not isinstance(value, bool) and not value)
+
+
+def table_writer(bind, table, **kwargs):
+    """Creates a :class:`~campos.entry.BatchWriter` inserting records into a
+    table, see :func:`~campos.forms.CreationForm.keep_open`. Each batch is
+    inserted using :func:`insert_rows` and committed in its own transaction.
+
+    :param bind: an engine, or a session or connection whose engine is used,
+                 since records are written in other thread
+    :type bind: :class:`~sqlalchemy.engine.Engine`,
+                :class:`~sqlalchemy.engine.Connection` or
+                :class:`~sqlalchemy.orm.Session`
+
+    :param table: table to insert into
+    :type table: :class:`~sqlalchemy.schema.Table`
+
+    :param kwargs: keyword arguments to pass to
+                   :class:`~campos.entry.BatchWriter`
+
+    :rtype: :class:`~campos.entry.BatchWriter`
+    """
+    from sqlalchemy.orm import Session
+    from ..entry import BatchWriter
+
+    engine = bind.get_bind() if isinstance(bind, Session) else bind.engine
+    return BatchWriter(lambda rows: insert_rows(engine, table, rows), **kwargs)
+
+
+def update_rows(bind, table, keys, values):
+    """Sets the same values to several rows using a single UPDATE statement,
+    only the given columns are updated. Nothing is executed if there are no
+    values or keys. Useful to save forms editing several rows at once, see
+    :func:`~campos.forms.EditionForm.edit_common`.
+
+    When using an ORM session, instances of the updated rows already loaded
+    keep their old values until they are expired or refreshed.
+
+    :param bind: object used to execute the statement, if it's an engine the
+                 change is committed
+    :type bind: :class:`~sqlalchemy.engine.Engine`,
+                :class:`~sqlalchemy.engine.Connection` or
+                :class:`~sqlalchemy.orm.Session`
+
+    :param table: table of the rows, it must have a single column primary key
+    :type table: :class:`~sqlalchemy.schema.Table`
+
+    :param keys: primary keys of the rows
+    :type keys: iterable
+
+    :param values: a dict like d[column_name] = value, names that aren't
+                   columns of the table are ignored
+    :type values: :class:`dict`
+
+    :return: amount of updated rows
+    :rtype: :class:`int`
+    """
+    from sqlalchemy import update
+
+    keys = list(keys)
+    values = {n: v for n, v in values.items() if n in table.columns}
+    if not values or not keys:
+        return 0
+
+    pk = table.primary_key.columns.values()[0]
+    query = update(table).where(pk.in_(keys)).values(values)
+    with _connection(bind) as connection:
+        return connection.execute(query).rowcount
+
+
+def common_values(bind, table, keys, names=None):
+    """Finds the values shared by several rows of a table using a single
+    aggregate query, rows aren't loaded. The result can be passed to
+    :func:`~campos.forms.EditionForm.edit_common`.
+
+    :param bind: object used to execute the query
+    :type bind: :class:`~sqlalchemy.engine.Engine`,
+                :class:`~sqlalchemy.engine.Connection` or
+                :class:`~sqlalchemy.orm.Session`
+
+    :param table: table of the rows, it must have a single column primary key
+    :type table: :class:`~sqlalchemy.schema.Table`
+
+    :param keys: primary keys of the rows
+    :type keys: iterable
+
+    :param names: names of the columns to compare, defaults to every column
+                  except binary ones
+    :type names: iterable of :class:`str`
+
+    :return: a dict like d[column_name] = value, where value is
+             :data:`~campos.bindings.MIXED` if rows have different values
+    :rtype: :class:`~collections.OrderedDict`
+    """
+    from sqlalchemy import select, func, LargeBinary
+    from ..bindings import MIXED
+
+    if names is None:
+        names = [c.name for c in table.columns
+                 if not isinstance(c.type, LargeBinary)]
+    columns = [table.columns[n] for n in names]
+
+    aggregates = [func.count()]
+    for column in columns:
+        aggregates.extend((func.count(column.distinct()), func.count(column),
+                           func.min(column)))
+
+    pk = table.primary_key.columns.values()[0]
+    query = select(*aggregates).where(pk.in_(list(keys)))
+    row = _execute(bind, query)[0]
+
+    values = OrderedDict()
+    total = row[0]
+    for i, name in enumerate(names):
+        distinct, not_null, value = row[1 + 3 * i:4 + 3 * i]
+        if distinct > 1 or 0 < not_null < total:
+            values[name] = MIXED
+        else:
+            values[name] = value
+    return values
+
+
+def load_attributes(obj, names):
+    """Loads the given column attributes of a mapped instance, those already
+    loaded are skipped and the rest are loaded using a single query. Deferred
+    columns are loaded too.
+
+    Nothing is done if the instance isn't attached to a session or if it isn't
+    persistent yet.
+
+    :param obj: a mapped instance
+    :type obj: any
+
+    :param names: names of the attributes to load, those which aren't column
+                  attributes are ignored
+    :type names: iterable of :class:`str`
+    """
+    from sqlalchemy import inspect
+
+    state = inspect(obj)
+    if state.session is None or not state.persistent:
+        return
+
+    unloaded = state.unloaded
+    columns = state.mapper.column_attrs
+    missing = [n for n in names if n in unloaded and n in columns]
+    if missing:
+        state.session.refresh(obj, attribute_names=missing)
+
+
+def display_column(table, exclude=()):
+    """Finds a column suitable to show rows of a table to users, this is the
+    first string column which isn't part of the primary key.
+
+    :param table: table to inspect
+    :type table: :class:`~sqlalchemy.schema.Table`
+
+    :param exclude: columns to ignore
+    :type exclude: iterable of :class:`~sqlalchemy.schema.Column`
+
+    :return: a column or ``None`` if no suitable column was found
+    :rtype: :class:`~sqlalchemy.schema.Column`
+    """
+    from sqlalchemy import String
+
+    for column in table.columns:
+        if column.primary_key or column in exclude:
+            continue
+        if isinstance(column.type, String):
+            return column
+    return None
+
+
+def foreign_key_options(column, bind, display=None):
+    """Creates the functions used by select fields to read the options of a
+    foreign key column, rows of the referenced table.
+
+    :param column: a column with a foreign key
+    :type column: :class:`~sqlalchemy.schema.Column`
+
+    :param bind: object used to execute queries
+    :type bind: :class:`~sqlalchemy.engine.Engine`,
+                :class:`~sqlalchemy.engine.Connection` or
+                :class:`~sqlalchemy.orm.Session`
+
+    :param display: name of the column of the referenced table used as
+                    option's text, see :func:`from_foreign_key`
+    :type display: :class:`str`
+
+    :return: a tuple like ``(fetch, lookup)``, see
+             :class:`~campos.fields.PagedSelectField`
+    :rtype: :class:`tuple`
+    """
+    from sqlalchemy import select
+
+    target = next(iter(column.foreign_keys)).column
+    table = target.table
+
+    if display is not None:
+        shown = table.columns[display]
+    else:
+        shown = display_column(table)
+        shown = target if shown is None else shown
+
+    def fetch(offset, limit):
+        query = select(shown, target).order_by(shown, target)
+        rows = _execute(bind, query.offset(offset).limit(limit))
+        return [(str(text), key) for text, key in rows]
+
+    def lookup(key):
+        rows = _execute(bind, select(shown).where(target == key))
+        if not rows:
+            raise ValueError('No {} with {} {}'.format(table.name, target.name,
+                                                       key))
+        return str(rows[0][0])
+
+    return fetch, lookup
+
+
+def from_foreign_key(name, text, column, bind, display=None, page_size=100,
+                     **kwargs):
+    """Creates a ``PagedSelectField`` from a foreign key column. Options are
+    rows of the referenced table, fetched in pages using `bind`, see
+    :func:`foreign_key_options`.
+
+    :param name: name for the field
+    :type name: :class:`str`
+
+    :param text: text for the field
+    :type text: :class:`str`
+
+    :param column: a column with a foreign key
+    :type column: :class:`~sqlalchemy.schema.Column`
+
+    :param bind: object used to execute queries
+    :type bind: :class:`~sqlalchemy.engine.Engine`,
+                :class:`~sqlalchemy.engine.Connection` or
+                :class:`~sqlalchemy.orm.Session`
+
+    :param display: name of the column of the referenced table used as
+                    option's text, if it isn't given the first string column
+                    which isn't part of the primary key is used and, if there
+                    is no such column, the referenced column itself.
+    :type display: :class:`str`
+
+    :param page_size: amount of rows to fetch at once, defaults to 100
+    :type page_size: :class:`int`
+
+    :param kwargs: keyword arguments to pass to field constructor
+
+    :return: a new ``PagedSelectField`` with the given name and text
+    :rtype: :class:`~campos.fields.PagedSelectField`
+    """
+    fetch, lookup = foreign_key_options(column, bind, display)
+
+    fkwargs = kwargs.copy()
+    fkwargs['name'] = name
+    fkwargs['text'] = text
+    fkwargs['fetch'] = fetch
+    fkwargs['lookup'] = lookup
+    fkwargs['page_size'] = page_size
+    fkwargs.setdefault('blank', bool(column.nullable))
+    return PagedSelectField(**fkwargs)
+
+
+# comparison operators of SQL and their python equivalents
+_SQL_OPERATORS = {'<': '<', '<=': '<=', '>': '>', '>=': '>=', '=': '==',
+                  '==': '==', '<>': '!=', '!=': '!='}
+_MIRRORED = {'<': '>', '<=': '>=', '>': '<', '>=': '<=', '==': '==',
+             '!=': '!='}
+
+_LITERAL = r"-?\d+(?:\.\d+)?|'(?:[^']|'')*'"
+_NAME = r'"?(\w+)"?'
+_OPERAND = r'(?:(?:length|char_length)\s*\(\s*{0}\s*\)|{0})'.format(_NAME)
+_BETWEEN = re.compile(r'({})\s+between\s+({})\s+and\s+({})'.format(
+    _OPERAND.replace('(\\w+)', '\\w+'), _LITERAL, _LITERAL), re.IGNORECASE)
+_COMPARISON = re.compile(r'({})\s*(<=|>=|<>|!=|==|=|<|>)\s*({})'.format(
+    _OPERAND.replace('(\\w+)', '\\w+'), _LITERAL), re.IGNORECASE)
+_IN = re.compile(r'{}\s+in\s*\(((?:\s*(?:{})\s*,?)+)\)'.format(
+    _NAME, _LITERAL), re.IGNORECASE)
+
+
+def _literal(text):
+    if text.startswith("'"):
+        return text[1:-1].replace("''", "'")
+    return float(text) if '.' in text else int(text)
+
+
+def _operand(text):
+    # returns (column_name, key) for "name" or "length(name)"
+    match = re.fullmatch(_OPERAND, text.strip(), re.IGNORECASE)
+    if match is None:
+        return None, None
+    if match.group(1) is not None:
+        return match.group(1), len
+    return match.group(2), None
+
+
+def _unwrap(text):
+    text = text.strip()
+    while text.startswith('(') and text.endswith(')'):
+        text = text[1:-1].strip()
+    return text
+
+
+def _text_conditions(text):
+    text = _unwrap(text)
+
+    # anything but a conjunction of simple conditions is ignored
+    if re.search(r'\b(?:or|not|case|select)\b', text, re.IGNORECASE):
+        return []
+
+    def between(match):
+        return '{0} >= {1} AND {0} <= {2}'.format(*match.groups())
+    text = _BETWEEN.sub(between, text)
+
+    conditions = []
+    for part in re.split(r'\s+and\s+', text, flags=re.IGNORECASE):
+        part = _unwrap(part)
+
+        match = _IN.fullmatch(part)
+        if match is not None:
+            values = re.findall(_LITERAL, match.group(2))
+            conditions.append((match.group(1), 'in', list(map(_literal, values)),
+                               None))
+            continue
+
+        match = _COMPARISON.fullmatch(part)
+        if match is not None:
+            name, key = _operand(match.group(1))
+            conditions.append((name, _SQL_OPERATORS[match.group(2)],
+                               _literal(match.group(3)), key))
+    return conditions
+
+
+def _clause_operand(element):
+    from sqlalchemy.sql.elements import ColumnClause
+    from sqlalchemy.sql.functions import Function
+
+    if isinstance(element, ColumnClause):
+        return element.name, None
+
+    if isinstance(element, Function) and \
+            element.name.lower() in ('length', 'char_length'):
+        arguments = list(element.clauses)
+        if len(arguments) == 1 and isinstance(arguments[0], ColumnClause):
+            return arguments[0].name, len
+    return None, None
+
+
+def _clause_conditions(clause):
+    from sqlalchemy.sql import operators
+    from sqlalchemy.sql.elements import (BooleanClauseList, BinaryExpression,
+                                         BindParameter, Grouping, TextClause)
+
+    comparisons = {operators.lt: '<', operators.le: '<=', operators.gt: '>',
+                   operators.ge: '>=', operators.eq: '==', operators.ne: '!='}
+
+    while isinstance(clause, Grouping):
+        clause = clause.element
+
+    if isinstance(clause, TextClause):
+        return _text_conditions(clause.text)
+
+    if isinstance(clause, BooleanClauseList):
+        conditions = []
+        if clause.operator is operators.and_:
+            for element in clause.clauses:
+                conditions.extend(_clause_conditions(element))
+        return conditions
+
+    if not isinstance(clause, BinaryExpression):
+        return []
+
+    op = clause.operator
+    left, right = clause.left, clause.right
+    name, key = _clause_operand(left)
+    if name is None and op in comparisons:
+        # literal at the left side
+        name, key = _clause_operand(right)
+        left, right = right, left
+        mirrored = _MIRRORED[comparisons[op]]
+        op = next(o for o, s in comparisons.items() if s == mirrored)
+
+    if name is None:
+        return []
+
+    if op in comparisons and isinstance(right, BindParameter):
+        return [(name, comparisons[op], right.effective_value, key)]
+
+    if op is operators.in_op and isinstance(right, BindParameter):
+        return [(name, 'in', list(right.effective_value), key)]
+
+    if op is operators.between_op:
+        bounds = list(getattr(right, 'clauses', ()))
+        if len(bounds) == 2 and \
+                all(isinstance(b, BindParameter) for b in bounds):
+            return [(name, '>=', bounds[0].effective_value, key),
+                    (name, '<=', bounds[1].effective_value, key)]
+    return []
+
+
+def check_conditions(constraint):
+    """Compiles a simple check constraint into conditions on single columns.
+
+    Conjunctions(AND) of comparisons between a column, or its length, and a
+    literal are understood, as well as ``IN`` lists and ``BETWEEN``. This
+    works with SQL expressions and with the text of reflected or textual
+    constraints. Parts of the constraint that can't be compiled are ignored,
+    the database still enforces them.
+
+    :param constraint: a check constraint
+    :type constraint: :class:`~sqlalchemy.schema.CheckConstraint`
+
+    :return: a list of tuples (column_name, op, value, key) where `op` is a
+             comparison operator of :class:`~campos.validators.Compare` or
+             ``'in'``, and `key` is ``None`` or :func:`len`
+    :rtype: :class:`list`
+    """
+    return _clause_conditions(constraint.sqltext)
+
+
+def _compatible(column, op, value, key):
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return False
+
+    if key is len:
+        return python_type is str and isinstance(value, int)
+
+    values = value if op == 'in' else [value]
+    for v in values:
+        if python_type in (int, float):
+            if not isinstance(v, (int, float)) or isinstance(v, bool):
+                return False
+        elif not isinstance(v, python_type):
+            return False
+    return True
+
+
+def column_conditions(column):
+    """Collects compiled conditions of the check constraints of a column's
+    table that refer only to that column, conditions whose value doesn't
+    match the column's type are discarded. See :func:`check_conditions`.
+
+    :param column: a column of a table
+    :type column: :class:`~sqlalchemy.schema.Column`
+
+    :return: a list of tuples (op, value, key)
+    :rtype: :class:`list`
+    """
+    from sqlalchemy import CheckConstraint
+
+    constraints = list(column.constraints)
+    constraints.extend(getattr(column.table, 'constraints', ()))
+
+    conditions = []
+    for constraint in constraints:
+        if isinstance(constraint, CheckConstraint):
+            for name, op, value, key in check_conditions(constraint):
+                if name == column.name and \
+                        _compatible(column, op, value, key):
+                    conditions.append((op, value, key))
+    return conditions
+
+
+def is_required(column):
+    """Checks if a value must be given for a column, this is when it can't be
+    null and it has no default value, neither at client nor server side.
+    Auto incremented primary keys aren't required.
+
+    :param column: a column of a table
+    :type column: :class:`~sqlalchemy.schema.Column`
+
+    :rtype: :class:`bool`
+    """
+    if column.nullable or column.default is not None or \
+            column.server_default is not None:
+        return False
+
+    # columns of subqueries belong to no table
+    table = column.table
+    if column is getattr(table, 'autoincrement_column', None):
+        return False
+    return True
+
+
+def unique_sets(table):
+    """Finds the sets of columns of a table whose values must be unique,
+    primary key excluded.
+
+    :param table: table to inspect
+    :type table: :class:`~sqlalchemy.schema.Table`
+
+    :return: a list of tuples of column names
+    :rtype: :class:`list`
+    """
+    from sqlalchemy import UniqueConstraint
+
+    sets = []
+    for constraint in table.constraints:
+        if isinstance(constraint, UniqueConstraint):
+            sets.append(tuple(c.name for c in constraint.columns))
+    for index in table.indexes:
+        if index.unique:
+            sets.append(tuple(c.name for c in index.columns))
+    for column in table.columns:
+        if column.unique:
+            sets.append((column.name,))
+
+    pk = tuple(c.name for c in table.primary_key.columns)
+    return [s for s in OrderedDict.fromkeys(sets) if s and s != pk]
+
+
+def unique_conflicts(bind, table, values, sets=None, exclude=None):
+    """Checks several unique constraints of a table at once using a single
+    query.
+
+    :param bind: object used to execute queries
+    :type bind: :class:`~sqlalchemy.engine.Engine`,
+                :class:`~sqlalchemy.engine.Connection` or
+                :class:`~sqlalchemy.orm.Session`
+
+    :param table: table to check
+    :type table: :class:`~sqlalchemy.schema.Table`
+
+    :param values: a dict like d[column_name] = value, sets with missing or
+                   null values are not checked
+    :type values: :class:`dict`
+
+    :param sets: tuples of column names whose values must be unique, defaults
+                 to :func:`unique_sets`
+    :type sets: :class:`list`
+
+    :param exclude: primary key of a row to ignore, usually the one being
+                    edited, only tables with a single column primary key are
+                    supported
+    :type exclude: any
+
+    :return: the sets whose values already exist in the table
+    :rtype: :class:`list`
+    """
+    from sqlalchemy import select, func, case, and_, or_
+
+    sets = unique_sets(table) if sets is None else sets
+
+    checked, conditions = [], []
+    for names in sets:
+        if all(values.get(n) is not None for n in names):
+            checked.append(names)
+            conditions.append(and_(*[table.c[n] == values[n] for n in names]))
+    if not checked:
+        return []
+
+    columns = [func.max(case((c, 1), else_=0)) for c in conditions]
+    query = select(*columns).select_from(table).where(or_(*conditions))
+    if exclude is not None:
+        pk = table.primary_key.columns.values()[0]
+        query = query.where(pk != exclude)
+
+    row = _execute(bind, query)[0]
+    return [names for names, found in zip(checked, row) if found]
+
+
+class UniqueCheck(object):
+    """Checks the unique constraints of a table against the values of a set
+    of fields.
+
+    Fields are registered using :func:`add`. Fields of single column unique
+    constraints receive a :class:`Unique` validator, which checks values
+    in background. Multiple column constraints are checked using a single
+    query for all of them when the fields are validated, results are reused
+    while values don't change so validating several fields costs one query,
+    see :class:`UniqueTogether`.
+
+    If the field of a single column primary key is registered too, the row
+    it identifies is excluded from the checks, so edited rows don't
+    conflict with themselves.
+
+    :param bind: object used to execute queries
+    :type bind: :class:`~sqlalchemy.engine.Engine`,
+                :class:`~sqlalchemy.engine.Connection` or
+                :class:`~sqlalchemy.orm.Session`
+
+    :param table: table to check
+    :type table: :class:`~sqlalchemy.schema.Table`
+    """
+
+    def __init__(self, bind, table):
+        self.bind = bind
+        self.table = table
+        self.sets = unique_sets(table)
+        self.fields = OrderedDict()
+        self._last = None
+
+    def add(self, field):
+        """Registers a field whose name is a column of the table, fields of
+        unique columns get a validator.
+
+        :param field: a field
+        :type field: :class:`~campos.core.Field`
+        """
+        self.fields[field.name] = field
+        for names in self.sets:
+            if field.name not in names:
+                continue
+            if len(names) == 1:
+                column = self.table.columns[field.name]
+                validator = Unique(column, self.bind, key=self.key)
+                field.destroyed.connect(validator.close)
+            else:
+                validator = UniqueTogether(self, names)
+            field.validators.append(validator)
+
+    def key(self):
+        """Obtains the primary key of the row being edited, this is the value
+        of the field of the primary key.
+
+        :return: the primary key or ``None`` if there is no field for it
+        """
+        from ..bindings import field_data
+
+        pk = self.table.primary_key.columns.values()
+        if len(pk) == 1 and pk[0].name in self.fields:
+            return field_data(self.fields[pk[0].name])
+        return None
+
+    def conflicts(self):
+        """Obtains the sets of columns whose current values already exist,
+        only multiple column sets are checked.
+
+        :rtype: :class:`list`
+        """
+        from ..bindings import field_data
+
+        values = {n: field_data(f) for n, f in self.fields.items()}
+        exclude = self.key()
+
+        state = sorted(values.items()), exclude
+        if self._last is None or self._last[0] != state:
+            sets = [names for names in self.sets if len(names) > 1]
+            found = unique_conflicts(self.bind, self.table, values, sets,
+                                     exclude)
+            self._last = state, found
+        return self._last[1]
+
+
+class UniqueTogether(Validator):
+    """Checks that the values of several fields don't exist in a set of
+    columns of a table with a unique constraint. See :class:`UniqueCheck`.
+
+    :param check: the check shared by the fields of the table
+    :type check: :class:`UniqueCheck`
+
+    :param names: names of the columns of a unique constraint
+    :type names: :class:`tuple`
+
+    :param message: message to show if the values already exist
+    :type message: :class:`str`
+    """
+
+    def __init__(self, check, names, message=None):
+        super(UniqueTogether, self).__init__(message=message)
+        self.check = check
+        self.names = tuple(names)
+
+    def __call__(self, field):
+        if self.names in self.check.conflicts():
+            message = self.message
+            if self.message is None:
+                message = 'Combination of {} already exists'
+                message = message.format(', '.join(self.names))
+            raise ValueError(message)
+
+
+# single thread running uniqueness queries, created when it's needed
+_LOOKUP_EXECUTOR = None
+
+
+def _lookup_executor():
+    global _LOOKUP_EXECUTOR
+
+    if _LOOKUP_EXECUTOR is None:
+        _LOOKUP_EXECUTOR = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix='campos-unique')
+    return _LOOKUP_EXECUTOR
+
+
+class _UniqueLookup(QObject):
+    # delivers query results to the GUI thread
+    answered = Signal(int, object)
+
+
+class Unique(Validator):
+    """Checks that the value of a field doesn't exist yet in a column.
+
+    Values aren't looked up while the user types, lookups are delayed until
+    the field stays unchanged for `delay` milliseconds and every value
+    pending at that moment is looked up using a single ``IN`` query, executed
+    in a worker thread. Meanwhile the value is considered valid, fields are
+    validated again when the answer arrives, along with their form if it
+    uses instant validation.
+
+    Answers are kept in a bounded cache of recently used values, so
+    returning to a previous value doesn't query the database again. If
+    `bind` is a session, the cache is cleared whenever it commits changes
+    to column's table, made by flushing objects or by statements executed
+    with the session. Statements executed directly on connections aren't
+    noticed, use :func:`clear` after them. The session keeps the validator alive until
+    :func:`close` is called, do it when the field is no longer used::
+
+        username = campos.StringField(name='username', text='Username')
+        unique = Unique(User.__table__.c.username, session)
+        username.validators.append(unique)
+        username.destroyed.connect(unique.close)
+
+    :param column: a column with unique values
+    :type column: :class:`~sqlalchemy.schema.Column`
+
+    :param bind: object used to execute queries, queries are executed by the
+                 engine of connections and sessions, using new connections
+    :type bind: :class:`~sqlalchemy.engine.Engine`,
+                :class:`~sqlalchemy.engine.Connection` or
+                :class:`~sqlalchemy.orm.Session`
+
+    :param key: callable returning the primary key of the row being edited,
+                this row is ignored when checking its values. Only tables
+                with a single column primary key are supported
+    :type key: callable
+
+    :param delay: milliseconds to wait for more values before querying,
+                  defaults to 300
+    :type delay: :class:`int`
+
+    :param cache_size: maximum amount of values kept in the cache, defaults
+                       to 1000
+    :type cache_size: :class:`int`
+
+    :param message: message to show if the value already exists
+    :type message: :class:`str`
+    """
+
+    def __init__(self, column, bind, key=None, delay=300, cache_size=1000,
+                 message='Value already exists'):
+        super(Unique, self).__init__(message=message)
+        from sqlalchemy import event
+        from sqlalchemy.orm import Session
+
+        self.column = column
+        self.key = key
+        self.cache_size = cache_size
+
+        self.session = bind if isinstance(bind, Session) else None
+        if self.session is not None:
+            bind = self.session.get_bind()
+        self.engine = bind.engine
+
+        self._cache = OrderedDict()  # value --> keys of rows having it
+        self._pending = OrderedDict()  # value --> fields waiting for it
+        self._running = set()
+        self._generation = 0  # increased when the cache is cleared
+        self._dirty = False
+
+        # the timer belongs to the lookup object, both are owned here
+        self._lookup = _UniqueLookup()
+        self._lookup.answered.connect(self._answered)
+
+        self._timer = QTimer(self._lookup)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay)
+        self._timer.timeout.connect(self.flush)
+
+        if self.session is not None:
+            for name, listener in self._listeners():
+                event.listen(self.session, name, listener)
+
+    def __call__(self, field):
+        from ..bindings import field_data
+
+        value = field_data(field)
+        if value is None:
+            return
+
+        # the field doesn't wait for its previous values anymore
+        for pending, fields in tuple(self._pending.items()):
+            if field in fields and pending != value:
+                fields.remove(field)
+                if not fields and pending not in self._running:
+                    del self._pending[pending]
+
+        keys = self.lookup(value)
+        if keys is None:
+            # not known yet, validated again when the answer arrives
+            fields = self._pending.setdefault(value, [])
+            if field not in fields:
+                fields.append(field)
+            self._timer.start()
+            return
+
+        exclude = self.key() if self.key is not None else None
+        if any(k != exclude for k in keys):
+            raise ValueError(self.message)
+
+    def lookup(self, value):
+        """Obtains the cached answer for a value.
+
+        :param value: a value of the column
+
+        :return: primary keys of the rows having the value, ``None`` if the
+                 value isn't cached
+        :rtype: :class:`tuple`
+        """
+        keys = self._cache.get(value)
+        if keys is not None:
+            self._cache.move_to_end(value)
+        return keys
+
+    def clear(self):
+        """Clears the cache, answers of running queries are discarded."""
+        self._cache.clear()
+        self._generation += 1
+
+    def close(self):
+        """Stops listening to session's events and discards cached answers
+        and pending values, the validator is released by the session. Calling
+        it several times has no effect.
+        """
+        from sqlalchemy import event
+
+        try:
+            self._timer.stop()
+        except RuntimeError:
+            pass  # already deleted by Qt, at application exit
+        self._pending.clear()
+        self.clear()
+
+        if self.session is not None:
+            for name, listener in self._listeners():
+                if event.contains(self.session, name, listener):
+                    event.remove(self.session, name, listener)
+
+    def flush(self):
+        """Looks up pending values right away, using a single query."""
+        self._timer.stop()
+        values = [v for v in self._pending if v not in self._running]
+        if not values:
+            return
+
+        self._running.update(values)
+        generation = self._generation
+        future = _lookup_executor().submit(self._query, values)
+
+        def done(f):
+            # runs in the worker thread, the answer is queued to GUI thread
+            error = f.exception()
+            answer = error if error is not None else f.result()
+            self._lookup.answered.emit(generation, (values, answer))
+        future.add_done_callback(done)
+
+    def _query(self, values):
+        from sqlalchemy import select
+
+        pk = self.column.table.primary_key.columns.values()[0]
+        query = select(self.column, pk).where(self.column.in_(values))
+
+        keys = {v: [] for v in values}
+        with self.engine.connect() as connection:
+            for value, key in connection.execute(query):
+                keys.setdefault(value, []).append(key)
+        return keys
+
+    def _answered(self, generation, result):
+        values, answer = result
+        self._running.difference_update(values)
+
+        if isinstance(answer, Exception):
+            # leave values unchecked, the database still rejects duplicates
+            for value in values:
+                self._pending.pop(value, None)
+            return
+
+        if generation != self._generation:
+            self._timer.start()  # the answer may be stale, ask again
+            return
+
+        for value in values:
+            self._cache[value] = tuple(answer.get(value, ()))
+            self._cache.move_to_end(value)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+        for value in values:
+            for field in self._pending.pop(value, ()):
+                self._revalidate(field)
+
+    @staticmethod
+    def _revalidate(field):
+        from ..enums import Validation
+        from ..forms import Form
+
+        field.validate()
+
+        # validators also run on stand-ins without widget, like field states
+        window = getattr(field, 'window', None)
+        form = window() if callable(window) else None
+        if isinstance(form, Form) and form.validation == Validation.INSTANT:
+            form.validate()
+
+    def _listeners(self):
+        return (('after_flush', self._flushed),
+                ('do_orm_execute', self._executed),
+                ('after_commit', self._committed),
+                ('after_rollback', self._rolled_back))
+
+    def _executed(self, state):
+        # statements executed by the session, not only flushed objects,
+        # may change the table: INSERT, UPDATE and DELETE statements
+        # targeting it and textual statements, which can't be inspected
+        from sqlalchemy.sql import TextClause
+
+        statement = state.statement
+        if state.is_insert or state.is_update or state.is_delete:
+            target = getattr(statement, 'table', None)
+            if target is not None and target.compare(self.column.table):
+                self._dirty = True
+        elif isinstance(statement, TextClause):
+            self._dirty = True
+
+    def _flushed(self, session, context):
+        table = self.column.table
+        for obj in list(session.new) + list(session.dirty) + \
+                list(session.deleted):
+            mapper = getattr(type(obj), '__mapper__', None)
+            if mapper is not None and table in mapper.tables:
+                self._dirty = True
+                return
+
+    def _committed(self, session):
+        if self._dirty:
+            self._dirty = False
+            self.clear()
+
+    def _rolled_back(self, session):
+        self._dirty = False
+
+
+def _bounds(conditions, integer):
+    # spin box limits from comparisons of a numeric column
+    bounds = {}
+    for op, value, key in conditions:
+        if key is not None or op not in ('<', '<=', '>', '>='):
+            continue
+        if integer and op in ('<', '>'):
+            if not isinstance(value, int):
+                continue
+            value += 1 if op == '>' else -1
+        elif op in ('<', '>'):
+            continue  # exclusive float bounds are left to validators
+
+        bound = 'min' if op.startswith('>') else 'max'
+        if bound not in bounds or \
+                (bound == 'min') == (value > bounds[bound]):
+            bounds[bound] = value
+    return bounds
+
+
+class _Current(object):
+    # stands for the current date or datetime in a plan, it's resolved when
+    # the field is created instead of when the plan is
+    def __init__(self, factory):
+        self.factory = factory
+
+    def __call__(self):
+        return self.factory()
+
+    def __reduce__(self):
+        return _Current, (self.factory,)
+
+
+TODAY = _Current(dt.date.today)
+NOW = _Current(dt.datetime.now)
+
+
+class FieldPlan(namedtuple('FieldPlan', 'factory args kwargs')):
+    """Describes how to create a field: the callable creating it and the
+    arguments to pass. Plans don't hold widgets so they can be created
+    without a ``QApplication`` and stored, see :class:`SchemaCache`.
+
+    :param factory: callable creating the field, usually one of the from_*
+                    functions or a field class
+    :type factory: callable
+
+    :param args: positional arguments for `factory`
+    :type args: :class:`tuple`
+
+    :param kwargs: keyword arguments for `factory`
+    :type kwargs: :class:`dict`
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, factory, args, kwargs=None):
+        kwargs = {} if kwargs is None else kwargs
+        return super(FieldPlan, cls).__new__(cls, factory, args, kwargs)
+
+    def create(self, **kwargs):
+        """Creates the planned field.
+
+        :param kwargs: extra keyword arguments for the factory
+
+        :return: a new field
+        :rtype: :class:`~campos.core.Field`
+        """
+        args = [a() if isinstance(a, _Current) else a for a in self.args]
+        fkwargs = self.kwargs.copy()
+        fkwargs.update(kwargs)
+        return self.factory(*args, **fkwargs)
+
+
 class SQLAlchemySource(FieldSource):
     """Field source for SQLAlchemy objects.
 
@@ -50,11 +1333,89 @@ class SQLAlchemySource(FieldSource):
         # using a Table object
         source = campos.get_fields_source(User.__table__)
         fields3 = source.fields
+
+    Foreign key columns generate a :class:`~campos.fields.PagedSelectField`
+    whose options are rows of the referenced table, fetched in pages as they
+    are needed, this requires a `bind` to execute queries. When the source
+    object is an instance attached to a session that session is used by
+    default.
+
+    Tables of reflected schemas are supported too, use a :class:`SchemaCache`
+    to avoid reflecting large databases every time the application starts.
+
+    Constraints are enforced by fields when possible, so invalid values are
+    rejected before reaching the database: columns which can't be null and
+    have no default generate required fields, and simple check constraints
+    generate validators, see :func:`field_plans`. Uniqueness is checked too
+    if ``unique=True``.
+
+    :param bind: object used to execute queries
+    :type bind: :class:`~sqlalchemy.engine.Engine`,
+                :class:`~sqlalchemy.engine.Connection` or
+                :class:`~sqlalchemy.orm.Session`
+
+    :param display: dict like d[column_name] = referenced_column_name, used to
+                    choose the column shown in foreign key fields, see
+                    :func:`from_foreign_key`
+    :type display: :class:`dict`
+
+    :param page_size: amount of rows fetched at once by foreign key fields,
+                      defaults to 100
+    :type page_size: :class:`int`
+
+    :param lazy: if True, fields created for large columns(``Text`` and
+                 ``LargeBinary``) are lazy, edition forms load their values
+                 only when they are viewed, see
+                 :func:`~campos.forms.EditionForm.edit`. Map those columns
+                 using :func:`~sqlalchemy.orm.deferred` so they aren't fetched
+                 along with the rest of the row. Defaults to False
+    :type lazy: :class:`bool`
+
+    :param plans: field plans to use instead of inspecting columns' types,
+                  see :func:`field_plans`. Fields are always created from
+                  plans, those used are kept in :attr:`plans`
+    :type plans: :class:`dict` of :class:`FieldPlan`
+
+    :param unique: if True and there is a `bind`, fields of unique columns
+                   check that their values don't exist yet, in background
+                   for single columns, see :class:`UniqueCheck` and
+                   :class:`Unique`. Defaults to False
+    :type unique: :class:`bool`
     """
 
+    def __init__(self, obj, bind=None, display=None, page_size=100,
+                 lazy=False, plans=None, unique=False, **kwargs):
+        if bind is None:
+            from sqlalchemy.orm import object_session
+            from sqlalchemy.orm.exc import UnmappedInstanceError
+
+            try:
+                bind = object_session(obj)
+            except UnmappedInstanceError:
+                pass  # a class or a table
+
+        self.bind = bind
+        self.display = {} if display is None else display
+        self.page_size = page_size
+        self.lazy = lazy
+        self.plans = plans
+        self.unique = unique
+        super(SQLAlchemySource, self).__init__(obj, **kwargs)
+
+        # plans don't need widgets, fields are created when they are accessed
+        if self.plans is None:
+            self.plans = self.field_plans(self.attributes)
+
+    @property
+    def table(self):
+        """Table whose columns generate the fields.
+
+        :type: :class:`~sqlalchemy.schema.Table`
+        """
+        return getattr(self.object, '__table__', self.object)
+
     def get_members(self):
-        table = getattr(self.object, '__table__', self.object)
-        columns = table.columns
+        columns = self.table.columns
 
         members = []
         for column in columns:
@@ -62,59 +1423,535 @@ class SQLAlchemySource(FieldSource):
         return members
 
     def create_fields(self, attributes):
+        fields = OrderedDict()
+        for name, plan in self.plans.items():
+            if plan.factory is from_foreign_key:
+                fields[name] = plan.create(bind=self.bind)
+            else:
+                fields[name] = plan.create()
+
+        if self.unique and self.bind is not None:
+            check = UniqueCheck(self.bind, self.table)
+            for field in fields.values():
+                check.add(field)
+        return fields
+
+    def field_plans(self, attributes):
+        """Decides which fields are created for the given attributes without
+        creating any widget, plans can be stored and used later to create
+        the fields, see :class:`SchemaCache`.
+
+        Columns which can't be null and have no default value generate
+        required fields, scalar default values are used as field defaults
+        and simple check constraints are compiled into validators, see
+        :func:`is_required` and :func:`column_conditions`.
+
+        :param attributes: a dict like d[attr_name] = (attr_text, column)
+        :type attributes: :class:`dict`
+
+        :return: a dict like d[field_name] = plan
+        :rtype: :class:`dict` of :class:`FieldPlan`
+        """
         from sqlalchemy import (Boolean, Integer, Float, String, Text, Date,
-                                Enum, Time, DateTime)
+                                Enum, Time, DateTime, LargeBinary)
 
-        # exclude attributes with unsupported values
-        filtered = OrderedDict()
+        plans = OrderedDict()
         for attr, text_column in attributes.items():
-            text, column = text_column
-            if column.type.python_type in self.SUPPORTED_TYPES:
-                filtered[attr] = text, column
-
-        fields = OrderedDict()
-        for attr, text_column in filtered.items():
             text, column = text_column
             ctype = column.type
-            ctype_class = type(ctype)
 
-            field = None
-            if ctype_class == Boolean:
-                field = from_bool(attr, text, False)
+            try:
+                supported = ctype.python_type in self.SUPPORTED_TYPES
+            except NotImplementedError:  # types like NullType
+                supported = False
+            if not supported:
+                continue
+
+            kwargs = {}
+            if is_required(column):
+                kwargs['required'] = True
+
+            # choices already restrict values of select fields
+            foreign = column.foreign_keys and self.bind is not None
+            conditions = column_conditions(column)
+            if not (foreign or isinstance(ctype, Enum)):
+                kwargs.update(self._constraint_kwargs(column, conditions))
 
-            elif ctype_class == Integer:
-                field = from_int(attr, text, 0)
+            # reflected types are subclasses of the generic ones, subclasses
+            # must be checked before their bases (Text and Enum are Strings)
+            plan = None
+            if foreign:
+                kwargs['display'] = self.display.get(attr)
+                kwargs['page_size'] = self.page_size
+                plan = FieldPlan(from_foreign_key, (attr, text, column),
+                                 kwargs)
 
-            elif ctype_class == Float:
-                kwargs = {}
+            elif isinstance(ctype, Enum):
+                kwargs.update(name=attr, text=text, choices=list(ctype.enums))
+                plan = FieldPlan(SelectField, (), kwargs)
+
+            elif isinstance(ctype, Boolean):
+                plan = FieldPlan(from_bool, (attr, text, False), kwargs)
+
+            elif isinstance(ctype, Integer):
+                kwargs.update(_bounds(conditions, integer=True))
+                plan = FieldPlan(from_int, (attr, text, 0), kwargs)
+
+            elif isinstance(ctype, Float):
                 if ctype.precision is not None:
                     kwargs['precision'] = ctype.precision
-                field = from_float(attr, text, 0, **kwargs)
+                kwargs.update(_bounds(conditions, integer=False))
+                plan = FieldPlan(from_float, (attr, text, 0), kwargs)
 
-            elif ctype_class == String:
-                kwargs = {}
+            elif isinstance(ctype, Text):
+                kwargs.update(istext=True, lazy=self.lazy)
                 if ctype.length is not None:
                     kwargs['max_length'] = ctype.length
-                field = from_str(attr, text, '', **kwargs)
+                plan = FieldPlan(from_str, (attr, text, ''), kwargs)
 
-            elif ctype_class == Text:
-                kwargs = {}
+            elif isinstance(ctype, String):
                 if ctype.length is not None:
                     kwargs['max_length'] = ctype.length
-                field = from_str(attr, text, '', istext=True, **kwargs)
+                plan = FieldPlan(from_str, (attr, text, ''), kwargs)
 
-            elif ctype_class == Date:
-                field = from_date(attr, text, dt.date.today())
+            elif isinstance(ctype, DateTime):
+                plan = FieldPlan(from_datetime, (attr, text, NOW), kwargs)
 
-            elif ctype_class == Time:
-                field = from_time(attr, text, dt.time.min)
+            elif isinstance(ctype, Date):
+                plan = FieldPlan(from_date, (attr, text, TODAY), kwargs)
 
-            elif ctype_class == DateTime:
-                field = from_datetime(attr, text, dt.datetime.now())
+            elif isinstance(ctype, Time):
+                plan = FieldPlan(from_time, (attr, text, dt.time.min), kwargs)
 
-            elif ctype_class == Enum:
-                field = SelectField(name=attr, text=text, choices=ctype.enums)
+            elif isinstance(ctype, LargeBinary):
+                kwargs['lazy'] = self.lazy
+                plan = FieldPlan(from_bytes, (attr, text, b''), kwargs)
 
-            if field is not None:
-                fields[field.name] = field
-        return fields
+            if plan is not None:
+                plans[attr] = plan
+        return plans
+
+    @staticmethod
+    def _constraint_kwargs(column, conditions):
+        kwargs = {}
+
+        default = column.default
+        if default is not None and default.is_scalar:
+            kwargs['default'] = default.arg
+
+        validators = []
+        for op, value, key in conditions:
+            if op == 'in':
+                validators.append(AnyOf(value))
+            else:
+                validators.append(Compare(op, value, key=key))
+        if validators:
+            kwargs['validators'] = validators
+        return kwargs
+
+
+def database_identity(bind):
+    """Obtains a value identifying the database a bind is connected to.
+
+    SQLite databases are identified by their file, so a moved database is
+    still recognized and a new file created with the same name isn't.
+    Other databases are identified by their URL, without password.
+
+    :param bind: an engine, a connection or a session
+    :type bind: :class:`~sqlalchemy.engine.Engine`,
+                :class:`~sqlalchemy.engine.Connection` or
+                :class:`~sqlalchemy.orm.Session`
+
+    ``file:`` URIs are supported, the file is taken from the URI's path.
+
+    :return: a tuple, ``None`` for in-memory databases and files which can't
+             be found, they must not be cached
+    :rtype: :class:`tuple`
+    """
+    from urllib.parse import urlsplit, unquote
+    from sqlalchemy.orm import Session
+
+    if isinstance(bind, Session):
+        bind = bind.get_bind()
+    url = bind.engine.url
+
+    if url.get_backend_name() == 'sqlite':
+        database = url.database
+        if database and database.startswith('file:'):
+            parts = urlsplit(database)
+            if url.query.get('mode') == 'memory' or \
+                    'mode=memory' in parts.query.split('&'):
+                return None
+            database = unquote(parts.path)
+        if database in (None, '', ':memory:'):
+            return None
+        try:
+            stat = os.stat(database)
+        except OSError:
+            return None
+        return 'sqlite', stat.st_dev, stat.st_ino
+    return url.get_backend_name(), url.render_as_string(hide_password=True)
+
+
+def schema_fingerprint(connection):
+    """Obtains a value that changes whenever the schema of a database changes.
+
+    With SQLite this is the schema version kept by the database itself. For
+    other dialects the columns listed by ``information_schema`` are hashed,
+    which takes a single query instead of one per table.
+
+    :param connection: connection to the database
+    :type connection: :class:`~sqlalchemy.engine.Connection`
+
+    :return: the fingerprint, ``None`` if it can't be obtained
+    """
+    from sqlalchemy import text
+    from sqlalchemy.exc import DBAPIError
+
+    if connection.dialect.name == 'sqlite':
+        query = text('PRAGMA schema_version')
+        return connection.execute(query).scalar()
+
+    query = text('SELECT table_schema, table_name, column_name, data_type, '
+                 'is_nullable, column_default '
+                 'FROM information_schema.columns '
+                 'ORDER BY table_schema, table_name, ordinal_position')
+    digest = hashlib.sha1()
+    try:
+        for row in connection.execute(query):
+            digest.update(repr(tuple(row)).encode('utf-8'))
+    except DBAPIError:
+        return None
+    return digest.hexdigest()
+
+
+class SchemaCache(object):
+    """Keeps reflected database schemas and the field plans derived from
+    them in a file, so they can be reused between application runs.
+
+    A schema is reflected only when the database isn't in the cache or when
+    its fingerprint has changed, otherwise the stored
+    :class:`~sqlalchemy.schema.MetaData` is used and no reflection queries
+    are executed::
+
+        cache = SchemaCache('~/.cache/myapp/schema.pickle')
+
+        metadata = cache.metadata(engine)
+        source = cache.source(engine, 'person', exclude=['id'])
+        form = CreationForm(fields=source.fields.values())
+
+    Fields of :func:`source` are created from cached plans when the same
+    source options were used before. Databases are identified using
+    :func:`database_identity` and fingerprints are obtained using
+    :func:`schema_fingerprint` unless a custom function is given. In-memory
+    databases and databases without fingerprint are never cached.
+
+    The file is replaced atomically on every update, so it's never left
+    corrupted and several processes can share it. An unreadable file is
+    ignored and overwritten.
+
+    .. warning:: the file is loaded with :mod:`pickle`, which can execute
+                 arbitrary code, so it must be kept where only the user
+                 running the application can write, never in a shared or
+                 world-writable directory.
+
+    :param path: path of the cache file
+    :type path: :class:`str`
+
+    :param fingerprint: callable receiving a connection and returning the
+                        schema's fingerprint, see :func:`schema_fingerprint`
+    :type fingerprint: callable
+    """
+
+    #: Version of the cache format, files with other versions are ignored.
+    VERSION = 2
+
+    def __init__(self, path, fingerprint=schema_fingerprint):
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self.fingerprint = fingerprint
+        self._entries = None
+
+    def metadata(self, bind, schema=None):
+        """Obtains the reflected schema of a database, from the cache if it's
+        up to date.
+
+        :param bind: an engine, a connection or a session
+        :type bind: :class:`~sqlalchemy.engine.Engine`,
+                    :class:`~sqlalchemy.engine.Connection` or
+                    :class:`~sqlalchemy.orm.Session`
+
+        :param schema: database schema to reflect, defaults to the default one
+        :type schema: :class:`str`
+
+        :rtype: :class:`~sqlalchemy.schema.MetaData`
+        """
+        return self._entry(bind, schema)['metadata']
+
+    def source(self, bind, table, schema=None, **kwargs):
+        """Creates a :class:`SQLAlchemySource` for a table of a database,
+        using the cached schema and the cached field plans when possible.
+
+        :param bind: an engine, a connection or a session, it's also used
+                     by foreign key fields
+        :type bind: :class:`~sqlalchemy.engine.Engine`,
+                    :class:`~sqlalchemy.engine.Connection` or
+                    :class:`~sqlalchemy.orm.Session`
+
+        :param table: name of the table
+        :type table: :class:`str`
+
+        :param schema: database schema of the table
+        :type schema: :class:`str`
+
+        :param kwargs: keyword arguments to pass to :class:`SQLAlchemySource`
+
+        :rtype: :class:`SQLAlchemySource`
+        """
+        entry = self._entry(bind, schema)
+        key = table if schema is None else '{}.{}'.format(schema, table)
+        obj = entry['metadata'].tables[key]
+
+        # options are compared by their representation, sources created with
+        # different options have different plans
+        options = repr(sorted(kwargs.items()))
+        options_plans = entry['plans'].get(key)
+        plans = None
+        if options_plans is not None and options_plans[0] == options:
+            plans = options_plans[1]
+
+        source = SQLAlchemySource(obj, bind=bind, plans=plans, **kwargs)
+        if plans is None and entry['identity'] is not None:
+            entry['plans'][key] = options, source.plans
+            self._save()
+        return source
+
+    def clear(self):
+        """Removes all cached schemas."""
+        self._entries = {}
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def _entry(self, bind, schema):
+        from sqlalchemy import MetaData
+
+        identity = database_identity(bind)
+        key = identity, schema
+
+        with _connection(bind) as connection:
+            fingerprint = None
+            if identity is not None:
+                fingerprint = self.fingerprint(connection)
+
+            entries = self._load()
+            entry = entries.get(key)
+            if entry is not None and fingerprint is not None and \
+                    entry['fingerprint'] == fingerprint:
+                return entry
+
+            metadata = MetaData()
+            metadata.reflect(connection, schema=schema)
+
+        entry = {'identity': identity, 'fingerprint': fingerprint,
+                 'metadata': metadata, 'plans': {}}
+        if identity is not None and fingerprint is not None:
+            entries[key] = entry
+            self._save()
+        else:
+            entry['identity'] = None  # don't keep plans either
+        return entry
+
+    def _load(self):
+        if self._entries is None:
+            self._entries = {}
+            try:
+                with open(self.path, 'rb') as file:
+                    version, entries = pickle.load(file)
+            except (OSError, EOFError, ValueError, TypeError,
+                    pickle.UnpicklingError, AttributeError, ImportError):
+                pass  # missing or unreadable, it will be overwritten
+            else:
+                if version == self.VERSION:
+                    self._entries = entries
+        return self._entries
+
+    def _save(self):
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                # plans and schemas must be pickled together, plans of foreign
+                # keys reference columns of the schema
+                pickle.dump((self.VERSION, self._entries), file,
+                            pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self.path)
+        except BaseException:
+            os.remove(tmp)
+            raise
+
+
+class MetaDataForms(QObject):
+    """Creates a :class:`~campos.forms.CreationForm` and an
+    :class:`~campos.forms.EditionForm` for every table of a
+    :class:`~sqlalchemy.schema.MetaData`.
+
+    Deciding which fields each table needs doesn't involve widgets, so
+    field plans of all tables are computed in a worker thread, see
+    :func:`SQLAlchemySource.field_plans`. Widgets must be created in the GUI
+    thread, this is done only when the forms of a table are requested, so
+    building forms for hundreds of tables costs about the same as building
+    them for one::
+
+        metadata = MetaData()
+        metadata.reflect(engine)
+
+        forms = MetaDataForms(metadata, bind=engine)
+
+        def show_table(name):
+            creation, edition = forms.forms(name)
+            creation.exec_()
+
+    Forms are created once and reused. If forms of a table are requested
+    before its plans are ready, they are computed right away.
+
+    :param metadata: schema whose tables need forms, it can be obtained
+                     from a :class:`SchemaCache`
+    :type metadata: :class:`~sqlalchemy.schema.MetaData`
+
+    :param bind: object used by foreign key fields to execute queries
+    :type bind: :class:`~sqlalchemy.engine.Engine`,
+                :class:`~sqlalchemy.engine.Connection` or
+                :class:`~sqlalchemy.orm.Session`
+
+    :param source_kw: keyword arguments to pass to every
+                      :class:`SQLAlchemySource`
+    :type source_kw: :class:`dict`
+
+    :param form_kw: keyword arguments to pass to every form constructor
+    :type form_kw: :class:`dict`
+
+    :param start: whether to start computing plans immediately, defaults to
+                  True, see :func:`start`
+    :type start: :class:`bool`
+    """
+
+    #: Emitted in the GUI thread with a table name when its plans are ready.
+    planned = Signal(str)
+
+    #: Emitted in the GUI thread when plans of every table are ready.
+    ready = Signal()
+
+    def __init__(self, metadata, bind=None, source_kw=None, form_kw=None,
+                 start=True):
+        super(MetaDataForms, self).__init__()
+        self.metadata = metadata
+        self.bind = bind
+        self.source_kw = {} if source_kw is None else source_kw
+        self.form_kw = {} if form_kw is None else form_kw
+
+        self._sources = {}
+        self._forms = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._worker = None
+
+        if start:
+            self.start()
+
+    def __iter__(self):
+        return iter(self.metadata.tables)
+
+    def __contains__(self, name):
+        return name in self.metadata.tables
+
+    def start(self):
+        """Starts computing field plans of every table in a worker thread,
+        nothing is done if it was started already.
+        """
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._plan_all,
+                                            name='campos-plans', daemon=True)
+            self._worker.start()
+
+    def stop(self):
+        """Stops the worker thread after the table being planned, plans of
+        remaining tables are computed when their forms are requested.
+        """
+        self._stop.set()
+        if self._worker is not None:
+            self._worker.join()
+
+    def wait(self, timeout=None):
+        """Blocks until plans of every table are ready.
+
+        :param timeout: maximum amount of seconds to wait
+        :type timeout: :class:`float`
+
+        :return: True if all plans are ready
+        :rtype: :class:`bool`
+        """
+        if self._worker is None:
+            return False
+        self._worker.join(timeout)
+        return not self._worker.is_alive()
+
+    def source(self, name):
+        """Obtains the field source of a table, planning it if needed. Fields
+        of the source aren't created until they are accessed.
+
+        :param name: name of the table
+        :type name: :class:`str`
+
+        :rtype: :class:`SQLAlchemySource`
+        """
+        with self._lock:
+            source = self._sources.get(name)
+        if source is None:
+            source = self._plan(name)
+        return source
+
+    def forms(self, name):
+        """Obtains the forms of a table, they are created in the first call
+        so this must be done in the GUI thread.
+
+        :param name: name of the table
+        :type name: :class:`str`
+
+        :return: a tuple (creation_form, edition_form)
+        :rtype: :class:`tuple`
+        """
+        from ..forms import CreationForm, EditionForm
+
+        forms = self._forms.get(name)
+        if forms is None:
+            source = self.source(name)
+            text = self.metadata.tables[name].name.replace('_', ' ')
+
+            creation = CreationForm(fields=source.fields.values(),
+                                    **self.form_kw)
+            creation.setWindowTitle('Create {}'.format(text.capitalize()))
+
+            fields = source.create_fields(source.attributes)
+            edition = EditionForm(fields=fields.values(), **self.form_kw)
+            edition.setWindowTitle('Edit {}'.format(text.capitalize()))
+
+            forms = self._forms[name] = creation, edition
+        return forms
+
+    def _plan(self, name):
+        table = self.metadata.tables[name]
+        source = SQLAlchemySource(table, bind=self.bind, **self.source_kw)
+        with self._lock:
+            return self._sources.setdefault(name, source)
+
+    def _plan_all(self):
+        for name in tuple(self.metadata.tables):
+            if self._stop.is_set():
+                return
+            with self._lock:
+                planned = name in self._sources
+            if not planned:
+                self._plan(name)
+                self.planned.emit(name)
+        self.ready.emit()
@@ -1,6 +1,7 @@
 import re
 import abc
 import math
+import operator
 from datetime import date, time, datetime
 
 __author__ = 'Juan Manuel Bermúdez Cabrera'
@@ -35,6 +36,8 @@ class DataRequired(Validator):
     * Numbers when :func:`math.isfinite` is `False`.
     * Empty collections.
     * Time objects if its evaluation in a boolean context is False
+    * Nothing or the blank option selected in a
+      :class:`~campos.fields.SelectField`.
 
     :param message: message to show when no data is found
     :type message: :class:`str`
@@ -44,10 +47,15 @@ class DataRequired(Validator):
         super(DataRequired, self).__init__(message=message)
 
     def __call__(self, field):
+        from .fields import SelectField
+
         value = field.value
         valid = True
 
-        if value is None:
+        if isinstance(field, SelectField):
+            # value is a (text, value) tuple, never empty
+            valid = field.has_data()
+        elif value is None:
             valid = False
         elif isinstance(value, str):
             valid = len(value.strip()) > 0
@@ -230,3 +238,69 @@ class DatetimeRange(Validator):
                 message = 'Date and time must be between {} and {}'
                 message = message.format(self.min, self.max)
             raise ValueError(message)
+
+
+class Compare(Validator):
+    """Compares field's value against another value.
+
+    :param op: comparison operator, one of ``<``, ``<=``, ``>``, ``>=``,
+               ``==`` or ``!=``
+    :type op: :class:`str`
+
+    :param other: value to compare with
+    :type other: any
+
+    :param key: function applied to field's value before comparing, for
+                instance :func:`len` to compare lengths
+    :type key: callable
+
+    :param message: message to show if ``not value <op> other``
+    :type message: :class:`str`
+    """
+
+    OPERATORS = {'<': operator.lt, '<=': operator.le, '>': operator.gt,
+                 '>=': operator.ge, '==': operator.eq, '!=': operator.ne}
+
+    def __init__(self, op, other, key=None, message=None):
+        super(Compare, self).__init__(message=message)
+        if op not in self.OPERATORS:
+            raise ValueError('Unknown operator {}'.format(op))
+        self.op = op
+        self.other = other
+        self.key = key
+
+    def __call__(self, field):
+        value = field.value
+        if self.key is not None:
+            value = self.key(value)
+
+        if not self.OPERATORS[self.op](value, self.other):
+            message = self.message
+            if self.message is None:
+                message = 'Length must be {} {}' if self.key is len \
+                    else 'Value must be {} {}'
+                message = message.format(self.op, self.other)
+            raise ValueError(message)
+
+
+class AnyOf(Validator):
+    """Checks that field's value is one of several valid values.
+
+    :param values: valid values
+    :type values: iterable
+
+    :param message: message to show if value is not in `values`
+    :type message: :class:`str`
+    """
+
+    def __init__(self, values, message=None):
+        super(AnyOf, self).__init__(message=message)
+        self.values = tuple(values)
+
+    def __call__(self, field):
+        if field.value not in self.values:
+            message = self.message
+            if self.message is None:
+                message = 'Value must be one of: {}'
+                message = message.format(', '.join(map(str, self.values)))
+            raise ValueError(message)
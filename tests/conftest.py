@@ -0,0 +1,14 @@
+import os
+
+import pytest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+__author__ = 'Juan Manuel Bermúdez Cabrera'
+
+
+@pytest.fixture(scope='session')
+def app():
+    from qtpy.QtWidgets import QApplication
+
+    return QApplication.instance() or QApplication([])
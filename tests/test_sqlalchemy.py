@@ -0,0 +1,62 @@
+import pytest
+
+sqlalchemy = pytest.importorskip('sqlalchemy')
+
+from sqlalchemy import (create_engine, MetaData, Table, Column, Integer,
+                        String, ForeignKey)
+
+__author__ = 'Juan Manuel Bermúdez Cabrera'
+
+
+@pytest.fixture
+def engine():
+    return create_engine('sqlite://')
+
+
+@pytest.fixture
+def metadata(engine):
+    metadata = MetaData()
+    Table('country', metadata,
+          Column('id', Integer, primary_key=True),
+          Column('name', String(50), nullable=False))
+    Table('person', metadata,
+          Column('id', Integer, primary_key=True),
+          Column('name', String(50)),
+          Column('country_id', Integer, ForeignKey('country.id'),
+                 nullable=False),
+          Column('visited_id', Integer, ForeignKey('country.id')))
+    metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(metadata.tables['country'].insert(),
+                           [{'name': 'Cuba'}, {'name': 'Spain'}])
+    return metadata
+
+
+def test_required_foreign_key_rejects_no_selection(app, engine, metadata):
+    from campos.sources import get_fields_source
+
+    source = get_fields_source(metadata.tables['person'], bind=engine)
+    field = source.fields['country_id']
+
+    assert field.required
+    assert not field.has_data()
+
+    field.validate()
+    assert not field.valid
+
+    field.value = 2
+    field.validate()
+    assert field.valid
+
+
+def test_optional_foreign_key_accepts_blank(app, engine, metadata):
+    from campos.sources import get_fields_source
+
+    source = get_fields_source(metadata.tables['person'], bind=engine)
+    field = source.fields['visited_id']
+
+    assert not field.required
+    assert not field.has_data()
+
+    field.validate()
+    assert field.valid